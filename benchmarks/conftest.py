@@ -0,0 +1,146 @@
+import json
+from pathlib import Path
+from typing import Union
+
+import pytest
+
+from scim2_models import Context
+from scim2_models import EnterpriseUser
+from scim2_models import Group
+from scim2_models import ListResponse
+from scim2_models import Resource
+from scim2_models import Schema
+from scim2_models import User
+
+SAMPLES_DIR = Path(__file__).parent.parent / "samples"
+
+CONTEXTS = list(Context)
+
+
+def load_sample(filename):
+    with open(SAMPLES_DIR / filename) as fd:
+        return json.load(fd)
+
+
+def make_user_payload(index=0, emails=2):
+    """Build an enterprise user payload from the RFC sample.
+
+    The write-only password is removed so the payload is valid in every
+    context.
+    """
+    payload = load_sample("rfc7643-8.3-enterprise_user.json")
+    del payload["password"]
+    payload["id"] = f"user-{index}"
+    payload["userName"] = f"user-{index}@example.com"
+    payload["emails"] = [
+        {"value": f"user-{index}-{i}@example.com", "type": "work", "primary": i == 0}
+        for i in range(emails)
+    ]
+    return payload
+
+
+def make_group_payload(index=0, members=2):
+    """Build a group payload from the RFC sample."""
+    payload = load_sample("rfc7643-8.4-group.json")
+    payload["id"] = f"group-{index}"
+    payload["members"] = [
+        {
+            "value": f"user-{i}",
+            "$ref": f"https://example.com/v2/Users/user-{i}",
+            "display": f"User {i}",
+        }
+        for i in range(members)
+    ]
+    return payload
+
+
+def make_list_response_payload(size):
+    """Build a page of users and groups, with 9 users for 1 group."""
+    resources = [
+        make_group_payload(index, members=10)
+        if index % 10 == 9
+        else make_user_payload(index)
+        for index in range(size)
+    ]
+    return {
+        "schemas": ["urn:ietf:params:scim:api:messages:2.0:ListResponse"],
+        "totalResults": size,
+        "itemsPerPage": size,
+        "startIndex": 1,
+        "Resources": resources,
+    }
+
+
+def pytest_sessionstart(session):
+    """Fail early when ``--benchmark-compare`` finds no stored baseline.
+
+    pytest-benchmark only logs a warning in that case, so the regression
+    checks would silently pass.
+    """
+    benchmark_session = getattr(session.config, "_benchmarksession", None)
+    if (
+        benchmark_session
+        and benchmark_session.compare
+        and not benchmark_session.compared_mapping
+    ):
+        raise pytest.UsageError(
+            f"No benchmark baseline found in '{benchmark_session.storage}'. "
+            "Run 'tox -e bench' on the main branch first to store one."
+        )
+
+
+@pytest.fixture(scope="session")
+def dynamic_user_model():
+    """Build a User model with an enterprise extension from the RFC schemas."""
+    user_schema = Schema.model_validate(load_sample("rfc7643-8.7.1-schema-user.json"))
+    enterprise_user_schema = Schema.model_validate(
+        load_sample("rfc7643-8.7.1-schema-enterprise_user.json")
+    )
+    DynamicUser = Resource.from_schema(user_schema)
+    DynamicEnterpriseUser = EnterpriseUser.from_schema(enterprise_user_schema)
+    return DynamicUser[DynamicEnterpriseUser]
+
+
+# mypy does not know that pydantic makes resources generic over their extensions
+ENTERPRISE_USER = User[EnterpriseUser]  # type: ignore[type-arg]
+
+PAYLOADS = {
+    "user-100-emails": (ENTERPRISE_USER, lambda: make_user_payload(emails=100)),
+    "group-100k-members": (Group, lambda: make_group_payload(members=100_000)),
+    "list-response-1k": (
+        ListResponse[Union[ENTERPRISE_USER, Group]],
+        lambda: make_list_response_payload(1_000),
+    ),
+    "list-response-10k": (
+        ListResponse[Union[ENTERPRISE_USER, Group]],
+        lambda: make_list_response_payload(10_000),
+    ),
+}
+
+
+@pytest.fixture(scope="session")
+def payloads():
+    """Lazily build and cache the scaled payloads, as some are expensive to build."""
+    cache = {}
+
+    def get(name):
+        if name not in cache:
+            model, factory = PAYLOADS[name]
+            cache[name] = (model, factory())
+        return cache[name]
+
+    return get
+
+
+@pytest.fixture(scope="session")
+def instances(payloads):
+    """Lazily build and cache the validated models matching the scaled payloads."""
+    cache = {}
+
+    def get(name):
+        if name not in cache:
+            model, payload = payloads(name)
+            cache[name] = model.model_validate(payload)
+        return cache[name]
+
+    return get
@@ -0,0 +1,230 @@
+"""Cold start benchmarks.
+
+Each scenario is run several times in a fresh Python interpreter, so
+import costs and pydantic schema building are measured as they happen
+when a process starts, for instance in serverless deployments.
+
+Usage::
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 20 import user-enterprise
+    python -m benchmarks.startup --json startup.json
+    python -m benchmarks.startup --compare startup.json
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+
+CHILD_TEMPLATE = """
+import json
+import sys
+import time
+
+{setup}
+
+start = time.perf_counter()
+{statement}
+duration = time.perf_counter() - start
+
+try:
+    import resource
+
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is expressed in bytes on macOS and in kilobytes elsewhere
+    maxrss = maxrss if sys.platform == "darwin" else maxrss * 1024
+except ImportError:
+    maxrss = None
+
+print(json.dumps({{"duration": duration, "maxrss": maxrss}}))
+"""
+
+LOAD_SCHEMA = """
+from scim2_models import Schema
+
+with open("samples/rfc7643-8.7.1-schema-{name}.json") as fd:
+    schema = Schema.model_validate(json.load(fd))
+"""
+
+SYNTHETIC_SCHEMA = """
+from scim2_models import Attribute
+from scim2_models import Schema
+
+attributes = [
+    Attribute(name=f"attribute{i}", type=Attribute.Type.string, multi_valued=False)
+    for i in range(450)
+] + [
+    Attribute(
+        name=f"complex{i}",
+        type=Attribute.Type.complex,
+        multi_valued=bool(i % 2),
+        sub_attributes=[
+            Attribute(name=f"sub{j}", type=Attribute.Type.string, multi_valued=False)
+            for j in range(5)
+        ],
+    )
+    for i in range(50)
+]
+schema = Schema(
+    id="urn:example:schemas:Synthetic",
+    name="Synthetic",
+    attributes=attributes,
+)
+"""
+
+SCENARIOS = {
+    "import": ("", "import scim2_models"),
+    "user-enterprise": (
+        "from scim2_models import EnterpriseUser, User",
+        "User[EnterpriseUser]",
+    ),
+    "user-enterprise-first-use": (
+        "from scim2_models import Context, EnterpriseUser, User",
+        "\n".join(
+            [
+                "user = User[EnterpriseUser].model_validate(",
+                "    {'userName': 'bjensen'}, scim_ctx=Context.RESOURCE_CREATION_REQUEST",
+                ")",
+                "user.model_dump_json(scim_ctx=Context.RESOURCE_CREATION_RESPONSE)",
+            ]
+        ),
+    ),
+    "list-response-union": (
+        "from typing import Union\nfrom scim2_models import Group, ListResponse, User",
+        "ListResponse[Union[User, Group]]",
+    ),
+    "schema-user": (
+        LOAD_SCHEMA.format(name="user") + "from scim2_models import Resource",
+        "Resource.from_schema(schema)",
+    ),
+    "schema-group": (
+        LOAD_SCHEMA.format(name="group") + "from scim2_models import Resource",
+        "Resource.from_schema(schema)",
+    ),
+    "schema-enterprise-user": (
+        LOAD_SCHEMA.format(name="enterprise_user")
+        + "from scim2_models import Extension",
+        "Extension.from_schema(schema)",
+    ),
+    "schema-synthetic-500": (
+        SYNTHETIC_SCHEMA + "from scim2_models import Resource",
+        "Resource.from_schema(schema)",
+    ),
+}
+
+
+def run_scenario(setup: str, statement: str) -> dict:
+    """Run a scenario in a new interpreter and return its measures."""
+    code = CHILD_TEMPLATE.format(setup=setup, statement=statement)
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    process_duration = time.perf_counter() - start
+    measures = json.loads(result.stdout.splitlines()[-1])
+    measures["process_duration"] = process_duration
+    return measures
+
+
+def benchmark(name: str, runs: int, warmup: int) -> dict:
+    """Run a scenario several times and compute the median of its measures."""
+    setup, statement = SCENARIOS[name]
+    for _ in range(warmup):
+        run_scenario(setup, statement)
+
+    measures = [run_scenario(setup, statement) for _ in range(runs)]
+    durations = [measure["duration"] for measure in measures]
+    maxrss = [measure["maxrss"] for measure in measures if measure["maxrss"]]
+    return {
+        "name": name,
+        "runs": runs,
+        "median": statistics.median(durations),
+        "min": min(durations),
+        "max": max(durations),
+        "process_median": statistics.median(
+            measure["process_duration"] for measure in measures
+        ),
+        "maxrss_median": statistics.median(maxrss) if maxrss else None,
+    }
+
+
+def format_results(results: list[dict], baseline: dict) -> str:
+    lines = [
+        f"{'scenario':<28}{'median':>12}{'min':>12}{'max':>12}{'process':>12}{'max rss':>12}"
+        + (f"{'vs baseline':>14}" if baseline else "")
+    ]
+    for result in results:
+        maxrss = (
+            f"{result['maxrss_median'] / 2**20:.1f} MiB"
+            if result["maxrss_median"]
+            else "-"
+        )
+        lines.append(
+            f"{result['name']:<28}"
+            f"{result['median'] * 1000:>9.2f} ms"
+            f"{result['min'] * 1000:>9.2f} ms"
+            f"{result['max'] * 1000:>9.2f} ms"
+            f"{result['process_median'] * 1000:>9.2f} ms"
+            f"{maxrss:>12}"
+        )
+        if result["name"] in baseline:
+            ratio = result["median"] / baseline[result["name"]]["median"]
+            lines[-1] += f"{ratio:>13.2f}x"
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "scenarios",
+        nargs="*",
+        help=f"The scenarios to run among {', '.join(SCENARIOS)}. Defaults to all of them.",
+    )
+    parser.add_argument(
+        "--runs", type=int, default=10, help="Number of measured runs per scenario."
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=1,
+        help="Number of unmeasured runs per scenario, to populate the bytecode cache.",
+    )
+    parser.add_argument(
+        "--json", type=Path, help="Write the results in a JSON file at this path."
+    )
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        help="Compare the medians with the results stored in a JSON file by --json.",
+    )
+    args = parser.parse_args(argv)
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario '{name}'")
+
+    results = [
+        benchmark(name, args.runs, args.warmup) for name in args.scenarios or SCENARIOS
+    ]
+    baseline = (
+        {result["name"]: result for result in json.loads(args.compare.read_text())}
+        if args.compare
+        else {}
+    )
+    print(format_results(results, baseline))
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import pytest
+
+from scim2_models import Email
+from scim2_models import InMemoryBackend
+from scim2_models import SearchRequest
+from scim2_models import User
+
+
+@pytest.fixture(scope="module")
+def backends():
+    """Build backends storing 10k users, with and without an index on emails."""
+    result = {}
+    for name, indexed_attributes in (
+        ("scan", None),
+        ("index", {User: ["emails.value"]}),
+    ):
+        backend = InMemoryBackend([User], indexed_attributes=indexed_attributes)
+        for index in range(10_000):
+            backend.create(
+                User(
+                    user_name=f"user-{index}",
+                    emails=[Email(value=f"user-{index}@example.com")],
+                )
+            )
+        result[name] = backend
+    return result
+
+
+@pytest.mark.parametrize("name", ["scan", "index"])
+def test_search_by_email(benchmark, backends, name):
+    """Equality search on an email among 10k users."""
+    search_request = SearchRequest(filter='emails.value eq "user-5000@example.com"')
+    response = benchmark(backends[name].search, search_request, [User])
+    assert response.total_results == 1
@@ -0,0 +1,140 @@
+import pytest
+
+from scim2_models import Context
+from scim2_models import EnterpriseUser
+from scim2_models import Group
+from scim2_models import SchemaCodec
+from scim2_models import User
+from scim2_models import get_json_backend
+from scim2_models import json_dumps
+from scim2_models import json_loads
+from scim2_models import set_json_backend
+from scim2_models.json_backend import JSON_BACKENDS
+from scim2_models.json_backend import is_json_backend_installed
+
+from .conftest import CONTEXTS
+from .conftest import PAYLOADS
+from .conftest import make_user_payload
+
+
+@pytest.mark.parametrize("scim_ctx", CONTEXTS, ids=lambda ctx: ctx.name)
+@pytest.mark.parametrize("name", PAYLOADS)
+def test_model_dump(benchmark, instances, name, scim_ctx):
+    benchmark(instances(name).model_dump, scim_ctx=scim_ctx)
+
+
+@pytest.mark.parametrize("scim_ctx", CONTEXTS, ids=lambda ctx: ctx.name)
+@pytest.mark.parametrize("name", PAYLOADS)
+def test_model_dump_json(benchmark, instances, name, scim_ctx):
+    benchmark(instances(name).model_dump_json, scim_ctx=scim_ctx)
+
+
+@pytest.mark.parametrize("scim_ctx", CONTEXTS, ids=lambda ctx: ctx.name)
+def test_dynamic_model_dump_json(benchmark, dynamic_user_model, scim_ctx):
+    user = dynamic_user_model.model_validate(make_user_payload(emails=100))
+    benchmark(user.model_dump_json, scim_ctx=scim_ctx)
+
+
+PROJECTIONS = [
+    (["userName", "emails.value"], None),
+    (None, ["emails", "addresses"]),
+]
+
+
+@pytest.mark.parametrize(
+    "attributes,excluded_attributes",
+    PROJECTIONS,
+    ids=["attributes", "excluded_attributes"],
+)
+def test_model_dump_json_projection(
+    benchmark, instances, attributes, excluded_attributes
+):
+    """Attribute inclusions and exclusions, as requested by SCIM clients with the 'attributes' and 'excludedAttributes' parameters."""
+    benchmark(
+        instances("user-100-emails").model_dump_json,
+        scim_ctx=Context.SEARCH_RESPONSE,
+        attributes=attributes,
+        excluded_attributes=excluded_attributes,
+    )
+
+
+@pytest.mark.parametrize(
+    "attributes,excluded_attributes",
+    PROJECTIONS,
+    ids=["attributes", "excluded_attributes"],
+)
+def test_page_dump_json_projection(
+    benchmark, instances, attributes, excluded_attributes
+):
+    """Attribute projection of each user of a 1k resources page, as servers do when building search responses."""
+    users = [
+        resource
+        for resource in instances("list-response-1k").resources
+        if isinstance(resource, User)
+    ]
+
+    def dump_page():
+        return [
+            user.model_dump_json(
+                scim_ctx=Context.SEARCH_RESPONSE,
+                attributes=attributes,
+                excluded_attributes=excluded_attributes,
+            )
+            for user in users
+        ]
+
+    benchmark(dump_page)
+
+
+@pytest.fixture(params=JSON_BACKENDS)
+def json_backend(request):
+    if not is_json_backend_installed(request.param):
+        pytest.skip(f"{request.param} is not installed")
+
+    previous = get_json_backend()
+    set_json_backend(request.param)
+    yield request.param
+    set_json_backend(previous)
+
+
+def test_json_dumps(benchmark, instances, json_backend):
+    """Encoding of a 1k resources page dump, as done by web frameworks responses."""
+    payload = instances("list-response-1k").model_dump(scim_ctx=Context.SEARCH_RESPONSE)
+    benchmark(json_dumps, payload)
+
+
+def test_json_loads(benchmark, instances, json_backend):
+    """Parsing of a 1k resources page."""
+    payload = instances("list-response-1k").model_dump_json(
+        scim_ctx=Context.SEARCH_RESPONSE
+    )
+    benchmark(json_loads, payload.encode())
+
+
+@pytest.mark.parametrize("wire_format", ["json", "msgpack"])
+def test_model_dump_wire_format(benchmark, instances, wire_format):
+    """Dumps of a 1k resources page, as exchanged between internal services."""
+    if wire_format == "msgpack":
+        pytest.importorskip("msgspec")
+
+    page = instances("list-response-1k")
+    dump = getattr(page, f"model_dump_{wire_format}")
+    benchmark.extra_info["size"] = len(dump())
+    benchmark(dump)
+
+
+@pytest.mark.parametrize(
+    "codec", [False, True], ids=["model_dump_json", "schema_codec"]
+)
+def test_page_persistence(benchmark, instances, codec):
+    """Encoding of each resource of a 1k resources page, as done to store them in database rows."""
+    resources = instances("list-response-1k").resources
+    if codec:
+        dump = SchemaCodec([User[EnterpriseUser], Group]).dumps
+    else:
+
+        def dump(resource):
+            return resource.model_dump_json().encode()
+
+    benchmark.extra_info["size"] = sum(len(dump(resource)) for resource in resources)
+    benchmark(lambda: [dump(resource) for resource in resources])
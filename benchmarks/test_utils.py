@@ -0,0 +1,34 @@
+import pytest
+
+from scim2_models.utils import normalize_attribute_name
+from scim2_models.utils import to_camel
+
+from .conftest import make_user_payload
+
+
+def collect_attribute_names(payload):
+    """List the attribute names of a payload and of its sub-attributes."""
+    names = []
+    for key, value in payload.items():
+        names.append(key)
+        if isinstance(value, dict):
+            names.extend(collect_attribute_names(value))
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, dict):
+                    names.extend(collect_attribute_names(item))
+    return names
+
+
+ATTRIBUTE_NAMES = collect_attribute_names(make_user_payload(emails=10))
+
+
+@pytest.mark.parametrize("cached", [True, False], ids=["cached", "uncached"])
+@pytest.mark.parametrize(
+    "function", [normalize_attribute_name, to_camel], ids=lambda f: f.__name__
+)
+def test_attribute_names(benchmark, function, cached):
+    """Attribute names transformations, as done for every key of every payload."""
+    if not cached:
+        function = function.__wrapped__
+    benchmark(lambda: [function(name) for name in ATTRIBUTE_NAMES])
@@ -0,0 +1,62 @@
+import pytest
+
+from scim2_models import Context
+from scim2_models import EnterpriseUser
+from scim2_models import User
+
+from .conftest import CONTEXTS
+from .conftest import PAYLOADS
+from .conftest import make_user_payload
+
+
+@pytest.mark.parametrize("scim_ctx", CONTEXTS, ids=lambda ctx: ctx.name)
+@pytest.mark.parametrize("name", PAYLOADS)
+def test_model_validate(benchmark, payloads, instances, name, scim_ctx):
+    if scim_ctx == Context.RESOURCE_REPLACEMENT_REQUEST and name.startswith(
+        "list-response"
+    ):
+        pytest.skip("Replacement requests are made on single resources")
+
+    model, payload = payloads(name)
+    original = (
+        instances(name) if scim_ctx == Context.RESOURCE_REPLACEMENT_REQUEST else None
+    )
+    benchmark(model.model_validate, payload, scim_ctx=scim_ctx, original=original)
+
+
+@pytest.mark.parametrize("scim_ctx", CONTEXTS, ids=lambda ctx: ctx.name)
+def test_dynamic_model_validate(benchmark, dynamic_user_model, scim_ctx):
+    payload = make_user_payload(emails=100)
+    original = (
+        dynamic_user_model.model_validate(payload)
+        if scim_ctx == Context.RESOURCE_REPLACEMENT_REQUEST
+        else None
+    )
+    benchmark(
+        dynamic_user_model.model_validate,
+        payload,
+        scim_ctx=scim_ctx,
+        original=original,
+    )
+
+
+@pytest.mark.parametrize("batch", [False, True], ids=["loop", "model_validate_many"])
+def test_users_page_validate(benchmark, batch):
+    """Validation of a 1k users page, as done during bulk imports."""
+    model = User[EnterpriseUser]
+    payloads = [make_user_payload(index) for index in range(1_000)]
+    if batch:
+        benchmark(model.model_validate_many, payloads)
+    else:
+        benchmark(lambda: [model.model_validate(payload) for payload in payloads])
+
+
+@pytest.mark.parametrize("wire_format", ["json", "msgpack"])
+def test_model_validate_wire_format(benchmark, instances, wire_format):
+    """Validations of a 1k resources page, as exchanged between internal services."""
+    if wire_format == "msgpack":
+        pytest.importorskip("msgspec")
+
+    page = instances("list-response-1k")
+    data = getattr(page, f"model_dump_{wire_format}")()
+    benchmark(getattr(type(page), f"model_validate_{wire_format}"), data)
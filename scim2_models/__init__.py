@@ -1,3 +1,7 @@
+import importlib
+from typing import TYPE_CHECKING
+from typing import Any
+
 from .base import BaseModel
 from .base import CaseExact
 from .base import ComplexAttribute
@@ -10,6 +14,15 @@ from .base import Required
 from .base import Returned
 from .base import Uniqueness
 from .base import URIReference
+from .codec import SchemaCodec
+from .columnar import ResourceTable
+from .compact import CompactModel
+from .json_backend import get_json_backend
+from .json_backend import json_dumps
+from .json_backend import json_loads
+from .json_backend import set_json_backend
+from .ndjson import NDJSONReader
+from .ndjson import NDJSONWriter
 from .rfc7643.enterprise_user import EnterpriseUser
 from .rfc7643.enterprise_user import Manager
 from .rfc7643.group import Group
@@ -51,13 +64,59 @@ from .rfc7644.message import Message
 from .rfc7644.patch_op import PatchOp
 from .rfc7644.patch_op import PatchOperation
 from .rfc7644.search_request import SearchRequest
+from .uniqueness import UniquenessIndex
+
+if TYPE_CHECKING:
+    from .backend import BackendError
+    from .backend import InMemoryBackend
+    from .client import ASGITransport
+    from .client import AsyncSCIMClient
+    from .client import HTTPXTransport
+    from .client import MockTransport
+    from .client import ResourceCache
+    from .client import SCIMResponseError
+    from .client import Transport
+    from .client import TransportResponse
+    from .fingerprint import FingerprintStore
+    from .pool import ModelRegistry
+    from .pool import ValidationPool
+
+LAZY_ATTRIBUTES = {
+    "BackendError": ".backend",
+    "InMemoryBackend": ".backend",
+    "ASGITransport": ".client",
+    "AsyncSCIMClient": ".client",
+    "HTTPXTransport": ".client",
+    "MockTransport": ".client",
+    "ResourceCache": ".client",
+    "SCIMResponseError": ".client",
+    "Transport": ".client",
+    "TransportResponse": ".client",
+    "FingerprintStore": ".fingerprint",
+    "ModelRegistry": ".pool",
+    "ValidationPool": ".pool",
+}
+"""The attributes of the modules that are imported on first use, because they are slow to import and not needed by most applications."""
+
+
+def __getattr__(name: str) -> Any:
+    if name not in LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
+    "ASGITransport",
     "Address",
     "AnyResource",
     "AnyExtension",
+    "AsyncSCIMClient",
     "Attribute",
     "AuthenticationScheme",
+    "BackendError",
     "BaseModel",
     "Bulk",
     "BulkOperation",
@@ -65,6 +124,7 @@ __all__ = [
     "BulkResponse",
     "CaseExact",
     "ChangePassword",
+    "CompactModel",
     "ComplexAttribute",
     "Context",
     "ETag",
@@ -75,16 +135,23 @@ __all__ = [
     "ExternalReference",
     "Extension",
     "Filter",
+    "FingerprintStore",
     "Group",
     "GroupMember",
     "GroupMembership",
+    "HTTPXTransport",
     "Im",
+    "InMemoryBackend",
     "ListResponse",
     "Manager",
     "Message",
     "Meta",
+    "MockTransport",
+    "ModelRegistry",
     "Mutability",
     "MultiValuedComplexAttribute",
+    "NDJSONReader",
+    "NDJSONWriter",
     "Name",
     "Patch",
     "PatchOp",
@@ -94,16 +161,28 @@ __all__ = [
     "Reference",
     "Required",
     "Resource",
+    "ResourceCache",
+    "ResourceTable",
     "ResourceType",
     "Returned",
     "Role",
+    "SCIMResponseError",
     "Schema",
+    "SchemaCodec",
     "SchemaExtension",
     "SearchRequest",
     "ServiceProviderConfig",
     "Sort",
+    "Transport",
+    "TransportResponse",
     "Uniqueness",
+    "UniquenessIndex",
     "URIReference",
     "User",
+    "ValidationPool",
     "X509Certificate",
+    "get_json_backend",
+    "json_dumps",
+    "json_loads",
+    "set_json_backend",
 ]
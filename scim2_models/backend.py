@@ -0,0 +1,692 @@
+import re
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from datetime import timezone
+from typing import Any
+from typing import Optional
+
+from pydantic import ValidationError
+from pydantic_core import PydanticCustomError
+
+from .base import Context
+from .base import validate_attribute_urn
+from .client import TransportResponse
+from .filter import Filter
+from .filter import get_payload_values
+from .filter import is_case_exact
+from .filter import match_filter
+from .filter import parse_filter
+from .json_backend import json_dumps
+from .json_backend import json_loads
+from .rfc7643.resource import Meta
+from .rfc7643.resource import Resource
+from .rfc7643.resource_type import ResourceType
+from .rfc7644.bulk import BulkOperation
+from .rfc7644.bulk import BulkRequest
+from .rfc7644.bulk import BulkResponse
+from .rfc7644.error import Error
+from .rfc7644.list_response import ListResponse
+from .rfc7644.list_response import get_list_response_type
+from .rfc7644.patch_op import PatchOp
+from .rfc7644.search_request import SearchRequest
+from .uniqueness import UniquenessIndex
+
+BULK_ID_PATTERN = re.compile(r"bulkId:([^/\s]+)")
+
+
+class BackendError(Exception):
+    """Raised by :class:`~scim2_models.InMemoryBackend` operations.
+
+    :param error: The :class:`~scim2_models.Error` to send to the client.
+    """
+
+    def __init__(self, error: Error):
+        self.error = error
+        super().__init__(error.detail)
+
+
+def make_not_found_error(resource_id: Optional[str]) -> Error:
+    return Error(status=404, detail=f"Resource '{resource_id}' not found")
+
+
+def get_stored_id(resource: Resource) -> str:
+    """Return the id of a stored resource, that is set by :meth:`InMemoryBackend.set_meta <scim2_models.InMemoryBackend.set_meta>`.
+
+    :raises ValueError: If the resource has no id.
+    """
+    if resource.id is None:
+        raise ValueError(f"Resource {resource!r} has no id")
+    return resource.id
+
+
+def get_index_key(value: Any, case_exact: bool = False) -> Any:
+    """Return the key of a value in the indexes, case-folded unless the attribute is case exact, as filters do."""
+    return value.casefold() if isinstance(value, str) and not case_exact else value
+
+
+class AttributeIndex:
+    """Hash index of the values of an attribute, used by equality filters.
+
+    :param attribute: The attribute URN, as returned by :func:`~scim2_models.base.validate_attribute_urn`.
+    :param case_exact: Whether the attribute is annotated with :attr:`CaseExact.true <scim2_models.CaseExact.true>`.
+    """
+
+    def __init__(self, attribute: str, case_exact: bool = False):
+        self.attribute = attribute
+        self.case_exact = case_exact
+        self.ids: dict[Any, set[str]] = defaultdict(set)
+
+    def get_keys(self, payload: dict) -> set[Any]:
+        return {
+            get_index_key(value, self.case_exact)
+            for value in get_payload_values(payload, self.attribute)
+            if not isinstance(value, (dict, list))
+        }
+
+    def add(self, resource_id: str, payload: dict) -> None:
+        for key in self.get_keys(payload):
+            self.ids[key].add(resource_id)
+
+    def remove(self, resource_id: str, payload: dict) -> None:
+        for key in self.get_keys(payload):
+            self.ids[key].discard(resource_id)
+            if not self.ids[key]:
+                del self.ids[key]
+
+    def lookup(self, value: Any) -> set[str]:
+        return set(self.ids.get(get_index_key(value, self.case_exact), ()))
+
+
+class InMemoryBackend:
+    """In-process SCIM service provider storing resources in memory.
+
+    The backend implements the resource creation, retrieval, replacement,
+    modification and deletion, the searches and the bulk requests of
+    :rfc:`RFC7644 <7644>`, for any resource class. Values of attributes
+    annotated with :attr:`Uniqueness.server <scim2_models.Uniqueness.server>` or
+    :attr:`Uniqueness.global_ <scim2_models.Uniqueness.global_>` are kept in a
+    :class:`~scim2_models.UniquenessIndex`, so uniqueness is checked without
+    scanning the resources.
+    Equality comparisons of filters use the indexes of
+    :paramref:`indexed_attributes` instead of evaluating the filter on
+    every resource.
+
+    :meth:`~scim2_models.InMemoryBackend.handle` answers HTTP requests,
+    so the backend can stand for a SCIM server in tests with a
+    :class:`~scim2_models.MockTransport`:
+
+    .. code-block:: python
+
+        backend = InMemoryBackend(
+            [User, Group], indexed_attributes={User: ["emails.value"]}
+        )
+        client = AsyncSCIMClient(MockTransport(backend.handle), [User, Group])
+
+    The stored resources are returned as is, and must not be modified.
+
+    :param resource_types: The resource classes of the backend.
+    :param indexed_attributes: The attributes to index, for each resource class.
+    :param base_url: The base URL of the resources :attr:`Meta.location <scim2_models.Meta.location>`.
+    """
+
+    def __init__(
+        self,
+        resource_types: list[type[Resource]],
+        indexed_attributes: Optional[dict[type[Resource], list[str]]] = None,
+        base_url: str = "",
+    ):
+        self.resource_types = list(resource_types)
+        self.base_url = base_url
+        self.resource_type_definitions = {
+            resource_type: ResourceType.from_resource(resource_type)
+            for resource_type in self.resource_types
+        }
+        self.endpoints = {
+            str(definition.endpoint).lower(): resource_type
+            for resource_type, definition in self.resource_type_definitions.items()
+        }
+        self.resources: dict[type[Resource], dict[str, Resource]] = {
+            resource_type: {} for resource_type in self.resource_types
+        }
+        self.payloads: dict[type[Resource], dict[str, dict]] = {
+            resource_type: {} for resource_type in self.resource_types
+        }
+        self.uniqueness_index = UniquenessIndex()
+        self.indexes: dict[type[Resource], dict[str, AttributeIndex]] = {
+            resource_type: {} for resource_type in self.resource_types
+        }
+        for resource_type, attributes in (indexed_attributes or {}).items():
+            for attribute in attributes:
+                urn = validate_attribute_urn(attribute, resource_type)
+                self.indexes[resource_type][urn.lower()] = AttributeIndex(
+                    urn, is_case_exact(resource_type, urn)
+                )
+
+    def check_resource_type(self, resource_type: type[Resource]) -> None:
+        if resource_type not in self.resources:
+            raise ValueError(f"Unknown resource type '{resource_type.__name__}'")
+
+    def store(self, resource: Resource, original: Optional[Resource] = None) -> None:
+        """Store a resource and update the indexes.
+
+        :param original: The stored resource replaced by *resource*.
+        :raises BackendError: If a unique value is already used by another resource.
+        """
+        if error := self.uniqueness_index.register(resource):
+            raise BackendError(error)
+
+        if original is not None:
+            self.unindex(original)
+
+        resource_type = type(resource)
+        resource_id = get_stored_id(resource)
+        payload = resource.model_dump(mode="json")
+        for index in self.indexes[resource_type].values():
+            index.add(resource_id, payload)
+        self.resources[resource_type][resource_id] = resource
+        self.payloads[resource_type][resource_id] = payload
+
+    def unstore(self, resource: Resource) -> None:
+        """Remove a stored resource and its index entries."""
+        self.uniqueness_index.unregister(resource)
+        self.unindex(resource)
+
+    def unindex(self, resource: Resource) -> None:
+        resource_type = type(resource)
+        resource_id = get_stored_id(resource)
+        payload = self.payloads[resource_type].pop(resource_id)
+        del self.resources[resource_type][resource_id]
+        for index in self.indexes[resource_type].values():
+            index.remove(resource_id, payload)
+
+    def set_meta(self, resource: Resource, original: Optional[Resource] = None) -> None:
+        """Set the :attr:`~scim2_models.Resource.id` and the :attr:`~scim2_models.Resource.meta` of a resource to store."""
+        now = datetime.now(timezone.utc)
+        resource.id = original.id if original else str(uuid.uuid4())
+        resource.meta = None
+        version = resource.get_etag(weak=True)
+        definition = self.resource_type_definitions[type(resource)]
+        resource.meta = Meta(
+            resource_type=definition.name,
+            created=original.meta.created if original and original.meta else now,
+            last_modified=now,
+            location=f"{self.base_url}{definition.endpoint}/{resource.id}",
+            version=version,
+        )
+
+    def create(self, resource: Resource) -> Resource:
+        """Store a new resource.
+
+        :return: The stored resource, with its id and meta attributes.
+        :raises BackendError: If a unique value is already used.
+        """
+        self.check_resource_type(type(resource))
+        resource = resource.model_copy(deep=True)
+        self.set_meta(resource)
+        self.store(resource)
+        return resource
+
+    def get(self, resource_type: type[Resource], resource_id: str) -> Resource:
+        """Return a stored resource.
+
+        :raises BackendError: If there is no such resource.
+        """
+        self.check_resource_type(resource_type)
+        resource = self.resources[resource_type].get(resource_id)
+        if resource is None:
+            raise BackendError(make_not_found_error(resource_id))
+        return resource
+
+    def replace(
+        self, resource: Resource, resource_id: Optional[str] = None
+    ) -> Resource:
+        """Replace a stored resource.
+
+        :param resource_id: The id of the resource to replace, by default the *resource* id.
+        :raises BackendError: If there is no such resource, if an immutable
+            attribute is modified, or if a unique value is already used.
+        """
+        resource_id = resource_id or resource.id
+        if resource_id is None:
+            raise BackendError(make_not_found_error(resource_id))
+
+        original = self.get(type(resource), resource_id)
+        try:
+            resource.check_mutability_issues(original, resource)
+        except PydanticCustomError:
+            raise BackendError(Error.make_mutability_error()) from None
+
+        resource = resource.model_copy(deep=True)
+        self.set_meta(resource, original)
+        self.store(resource, original)
+        return resource
+
+    def modify(
+        self, resource_type: type[Resource], resource_id: str, patch_op: PatchOp
+    ) -> Resource:
+        """Apply Patch operations to a stored resource.
+
+        :raises BackendError: If there is no such resource, if the
+            operations are invalid, or if a unique value is already used.
+        """
+        original = self.get(resource_type, resource_id)
+        try:
+            resource = patch_op.apply(original)
+        except LookupError as exc:
+            raise BackendError(
+                Error(status=400, scim_type="noTarget", detail=str(exc))
+            ) from None
+        except ValidationError as exc:
+            raise BackendError(
+                Error(status=400, scim_type="invalidValue", detail=str(exc))
+            ) from None
+        except ValueError as exc:
+            raise BackendError(
+                Error(status=400, scim_type="invalidPath", detail=str(exc))
+            ) from None
+
+        self.set_meta(resource, original)
+        self.store(resource, original)
+        return resource
+
+    def delete(self, resource_type: type[Resource], resource_id: str) -> None:
+        """Delete a stored resource.
+
+        :raises BackendError: If there is no such resource.
+        """
+        self.unstore(self.get(resource_type, resource_id))
+
+    def search(
+        self,
+        search_request: Optional[SearchRequest] = None,
+        resource_types: Optional[list[type[Resource]]] = None,
+    ) -> ListResponse:
+        """Filter, sort and paginate the stored resources.
+
+        :param resource_types: The resource classes to search, by default all of them.
+        :raises BackendError: If the filter is invalid.
+        """
+        search_request = search_request or SearchRequest()
+        resource_types = resource_types or self.resource_types
+        expression = None
+        if search_request.filter:
+            try:
+                expression = parse_filter(search_request.filter)
+            except ValueError as exc:
+                error = Error.make_invalid_filter_error()
+                error.detail = str(exc)
+                raise BackendError(error) from None
+
+        matches = [
+            (resource_type, resource_id)
+            for resource_type in resource_types
+            for resource_id in (
+                self.evaluate(resource_type, expression)
+                if expression
+                else self.resources[resource_type]
+            )
+        ]
+        if sort_by := search_request.sort_by:
+            matches.sort(
+                key=lambda match: self.get_sort_key(match, sort_by),
+                reverse=search_request.sort_order == SearchRequest.SortOrder.descending,
+            )
+
+        # start indexes less than 1 are interpreted as 1
+        start = max((search_request.start_index or 1) - 1, 0)
+        stop = start + search_request.count if search_request.count else None
+        resources = [
+            self.resources[resource_type][resource_id]
+            for resource_type, resource_id in matches[start:stop]
+        ]
+        return get_list_response_type(resource_types)(
+            total_results=len(matches),
+            start_index=start + 1,
+            items_per_page=len(resources),
+            resources=resources,
+        )
+
+    def evaluate(self, resource_type: type[Resource], expression: Filter) -> list[str]:
+        """Return the ids of the resources of a type matching a filter, in storage order."""
+        ids = self.evaluate_ids(resource_type, expression)
+        if ids is None:
+            payloads = self.payloads[resource_type]
+            return [
+                resource_id
+                for resource_id, payload in payloads.items()
+                if match_filter(expression, payload, resource_type)
+            ]
+
+        return [
+            resource_id
+            for resource_id in self.resources[resource_type]
+            if resource_id in ids
+        ]
+
+    def evaluate_ids(
+        self, resource_type: type[Resource], expression: Filter
+    ) -> Optional[set[str]]:
+        """Evaluate a filter with the indexes.
+
+        Return :data:`None` if the filter cannot be evaluated with the
+        indexes only. Filters combining indexed equality comparisons with
+        ``and`` are restricted to the resources matching the indexed comparisons.
+        """
+        kind = expression[0]
+        if kind == "eq":
+            index = self.get_index(resource_type, expression[1])
+            return index.lookup(expression[2]) if index else None
+
+        if kind == "or":
+            left = self.evaluate_ids(resource_type, expression[1])
+            right = self.evaluate_ids(resource_type, expression[2])
+            return None if left is None or right is None else left | right
+
+        if kind == "and":
+            left = self.evaluate_ids(resource_type, expression[1])
+            right = self.evaluate_ids(resource_type, expression[2])
+            if left is None or right is None:
+                candidates = right if left is None else left
+                if candidates is None:
+                    return None
+                payloads = self.payloads[resource_type]
+                return {
+                    resource_id
+                    for resource_id in candidates
+                    if match_filter(expression, payloads[resource_id], resource_type)
+                }
+            return left & right
+
+        return None
+
+    def get_index(
+        self, resource_type: type[Resource], attribute: str
+    ) -> Optional[AttributeIndex]:
+        try:
+            urn = validate_attribute_urn(attribute, resource_type)
+        except ValueError:
+            return None
+        return self.indexes[resource_type].get(urn.lower())
+
+    def get_sort_key(self, match: tuple[type[Resource], str], sort_by: str) -> tuple:
+        resource_type, resource_id = match
+        values = get_payload_values(
+            self.payloads[resource_type][resource_id], sort_by, resource_type
+        )
+        value = get_index_key(values[0]) if values else None
+        # resources without value are sorted last, as strings and numbers cannot be compared
+        return (
+            value is None,
+            isinstance(value, str),
+            value if value is not None else 0,
+        )
+
+    def bulk(self, bulk_request: BulkRequest) -> BulkResponse:
+        """Execute the operations of a bulk request.
+
+        Operations can reference the resources created by the previous
+        operations with ``bulkId:`` references, as described in
+        :rfc:`RFC7644 §3.7.2 <7644#section-3.7.2>`.
+        """
+        bulk_ids: dict[str, str] = {}
+        errors = 0
+        operations = []
+        for operation in bulk_request.operations or []:
+            if bulk_request.fail_on_errors and errors >= bulk_request.fail_on_errors:
+                break
+
+            method = operation.method.value if operation.method else "POST"
+            path = resolve_bulk_ids(operation.path or "", bulk_ids)
+            data = resolve_bulk_ids(operation.data, bulk_ids)
+            status, payload, headers = self.dispatch(method, path, {}, data, {})
+            result = BulkOperation(
+                method=operation.method,
+                bulk_id=operation.bulk_id,
+                version=headers.get("etag"),
+                location=headers.get("location"),
+                status=status,
+            )
+            if status >= 400:
+                errors += 1
+                result.response = payload
+            elif operation.bulk_id and payload and "id" in payload:
+                bulk_ids[operation.bulk_id] = payload["id"]
+            operations.append(result)
+
+        return BulkResponse(operations=operations)
+
+    def handle(
+        self,
+        method: str,
+        url: str,
+        params: Optional[dict[str, str]] = None,
+        content: Optional[bytes] = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> TransportResponse:
+        """Answer an HTTP request, with the signature of :class:`~scim2_models.MockTransport` handlers."""
+        headers = {key.lower(): value for key, value in (headers or {}).items()}
+        try:
+            payload = json_loads(content) if content else None
+        except ValueError:
+            error = Error.make_invalid_syntax_error()
+            response_headers: dict[str, str] = {}
+            status, response_payload = 400, error.model_dump()
+        else:
+            status, response_payload, response_headers = self.dispatch(
+                method, url, params or {}, payload, headers
+            )
+
+        content = json_dumps(response_payload) if response_payload is not None else b""
+        if response_payload is not None:
+            response_headers["content-type"] = "application/scim+json"
+        return TransportResponse(status, content, response_headers)
+
+    def dispatch(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, str],
+        payload: Any,
+        headers: dict[str, str],
+    ) -> tuple[int, Optional[dict], dict[str, str]]:
+        """Route a request to the backend operations.
+
+        :return: The response status, payload and headers.
+        """
+        try:
+            return self.route(method.upper(), path, params, payload, headers)
+        except BackendError as exc:
+            return exc.error.status or 400, exc.error.model_dump(), {}
+        except ValidationError as exc:
+            error = Error.make_invalid_value_error()
+            error.detail = str(exc)
+            return 400, error.model_dump(), {}
+
+    def route(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, str],
+        payload: Any,
+        headers: dict[str, str],
+    ) -> tuple[int, Optional[dict], dict[str, str]]:
+        segments = path.strip("/").split("/") if path.strip("/") else []
+        if segments == ["ResourceTypes"] and method == "GET":
+            definitions = list(self.resource_type_definitions.values())
+            list_response = ListResponse[ResourceType](
+                total_results=len(definitions),
+                resources=definitions,
+            )
+            return 200, list_response.model_dump(), {}
+
+        if segments == ["Bulk"] and method == "POST":
+            bulk_request = BulkRequest.model_validate(payload)
+            return 200, self.bulk(bulk_request).model_dump(), {}
+
+        if segments in ([], [".search"]):
+            return self.route_search(None, method, segments, params, payload)
+
+        resource_type = self.endpoints.get(f"/{segments[0]}".lower())
+        if resource_type is None or len(segments) > 2:
+            return (
+                404,
+                Error(status=404, detail=f"Unknown path '{path}'").model_dump(),
+                {},
+            )
+
+        if len(segments) == 1 or segments[1] == ".search":
+            if method == "POST" and len(segments) == 1:
+                resource = resource_type.model_validate(
+                    payload, scim_ctx=Context.RESOURCE_CREATION_REQUEST
+                )
+                resource = self.create(resource)
+                return 201, *self.dump_resource(
+                    resource, Context.RESOURCE_CREATION_RESPONSE
+                )
+            return self.route_search(resource_type, method, segments, params, payload)
+
+        resource_id = segments[1]
+        if method == "GET":
+            resource = self.get(resource_type, resource_id)
+            version = resource.meta.version if resource.meta else None
+            if version and headers.get("if-none-match") == version:
+                return 304, None, {"etag": version}
+            return 200, *self.dump_resource(
+                resource, Context.RESOURCE_QUERY_RESPONSE, params
+            )
+
+        if method == "PUT":
+            original = self.get(resource_type, resource_id)
+            resource = resource_type.model_validate(
+                payload,
+                scim_ctx=Context.RESOURCE_REPLACEMENT_REQUEST,
+                original=original,
+            )
+            resource = self.replace(resource, resource_id)
+            return 200, *self.dump_resource(
+                resource, Context.RESOURCE_REPLACEMENT_RESPONSE
+            )
+
+        if method == "PATCH":
+            patch_op = PatchOp.model_validate(payload)
+            resource = self.modify(resource_type, resource_id, patch_op)
+            return 200, *self.dump_resource(resource, Context.RESOURCE_QUERY_RESPONSE)
+
+        if method == "DELETE":
+            self.delete(resource_type, resource_id)
+            return 204, None, {}
+
+        return (
+            405,
+            Error(status=405, detail=f"Method {method} not allowed").model_dump(),
+            {},
+        )
+
+    def route_search(
+        self,
+        resource_type: Optional[type[Resource]],
+        method: str,
+        segments: list[str],
+        params: dict[str, str],
+        payload: Any,
+    ) -> tuple[int, Optional[dict], dict[str, str]]:
+        if segments[-1:] == [".search"] and method == "POST":
+            search_request = SearchRequest.model_validate(
+                payload, scim_ctx=Context.SEARCH_REQUEST
+            )
+            scim_ctx = Context.SEARCH_RESPONSE
+        elif segments[-1:] != [".search"] and method == "GET":
+            search_request = SearchRequest.model_validate(
+                {
+                    key: value.split(",")
+                    if key in ("attributes", "excludedAttributes")
+                    else value
+                    for key, value in params.items()
+                }
+            )
+            scim_ctx = Context.RESOURCE_QUERY_RESPONSE
+        else:
+            return (
+                405,
+                Error(status=405, detail=f"Method {method} not allowed").model_dump(),
+                {},
+            )
+
+        list_response = self.search(
+            search_request, [resource_type] if resource_type else None
+        )
+        payload = {
+            "schemas": list_response.schemas,
+            "totalResults": list_response.total_results,
+            "startIndex": list_response.start_index,
+            "itemsPerPage": list_response.items_per_page,
+            "Resources": [
+                self.dump_attributes(
+                    resource,
+                    scim_ctx,
+                    search_request.attributes,
+                    search_request.excluded_attributes,
+                )
+                for resource in list_response.resources or []
+            ],
+        }
+        return 200, payload, {}
+
+    def dump_resource(
+        self,
+        resource: Resource,
+        scim_ctx: Context,
+        params: Optional[dict[str, str]] = None,
+    ) -> tuple[dict, dict[str, str]]:
+        """Dump a resource for a response, with its ``ETag`` and ``Location`` headers."""
+        params = params or {}
+        attributes = params.get("attributes")
+        excluded_attributes = params.get("excludedAttributes")
+        payload = self.dump_attributes(
+            resource,
+            scim_ctx,
+            attributes.split(",") if attributes else None,
+            excluded_attributes.split(",") if excluded_attributes else None,
+        )
+        meta = resource.meta or Meta()
+        headers = {"etag": meta.version, "location": meta.location}
+        return payload, {key: value for key, value in headers.items() if value}
+
+    def dump_attributes(
+        self,
+        resource: Resource,
+        scim_ctx: Context,
+        attributes: Optional[list[str]] = None,
+        excluded_attributes: Optional[list[str]] = None,
+    ) -> dict:
+        """Dump a resource with the ``attributes`` and ``excludedAttributes`` request parameters.
+
+        :raises BackendError: If an attribute is unknown.
+        """
+        try:
+            return resource.model_dump(
+                scim_ctx=scim_ctx,
+                attributes=attributes,
+                excluded_attributes=excluded_attributes,
+            )
+        except ValueError as exc:
+            error = Error.make_invalid_value_error()
+            error.detail = str(exc)
+            raise BackendError(error) from None
+
+
+def resolve_bulk_ids(value: Any, bulk_ids: dict[str, str]) -> Any:
+    """Replace the ``bulkId:`` references of a bulk operation by the created resources ids."""
+    if isinstance(value, str):
+        return BULK_ID_PATTERN.sub(
+            lambda match: bulk_ids.get(match[1], match[0]), value
+        )
+
+    if isinstance(value, list):
+        return [resolve_bulk_ids(item, bulk_ids) for item in value]
+
+    if isinstance(value, dict):
+        return {key: resolve_bulk_ids(item, bulk_ids) for key, item in value.items()}
+
+    return value
@@ -1,12 +1,17 @@
 from collections import UserString
+from datetime import datetime
 from enum import Enum
 from enum import auto
+from hashlib import blake2b
 from inspect import isclass
+from operator import itemgetter
+from typing import TYPE_CHECKING
 from typing import Annotated
 from typing import Any
 from typing import Generic
 from typing import Optional
 from typing import TypeVar
+from typing import Union
 from typing import get_args
 from typing import get_origin
 
@@ -17,22 +22,35 @@ from pydantic import Field
 from pydantic import GetCoreSchemaHandler
 from pydantic import SerializationInfo
 from pydantic import SerializerFunctionWrapHandler
+from pydantic import ValidationError
 from pydantic import ValidationInfo
 from pydantic import ValidatorFunctionWrapHandler
 from pydantic import field_serializer
 from pydantic import field_validator
 from pydantic import model_serializer
 from pydantic import model_validator
+from pydantic_core import ErrorDetails
 from pydantic_core import PydanticCustomError
+from pydantic_core import SchemaSerializer
+from pydantic_core import SchemaValidator
 from pydantic_core import core_schema
 from typing_extensions import NewType
 from typing_extensions import Self
+from typing_extensions import TypeGuard
 
 from scim2_models.utils import normalize_attribute_name
 from scim2_models.utils import to_camel
 
 from .utils import UNION_TYPES
 
+if TYPE_CHECKING:
+    from .compact import CompactModel
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
 ReferenceTypes = TypeVar("ReferenceTypes")
 URIReference = NewType("URIReference", str)
 ExternalReference = NewType("ExternalReference", str)
@@ -512,17 +530,55 @@ class BaseModel(PydanticBaseModel):
         names should be case-insensitive. Any attribute name is
         transformed in lowercase so any case is handled the same way.
         """
+        return handler(normalize_keys(value))
+
+    @classmethod
+    def get_attribute_names(cls) -> tuple[frozenset[str], dict[str, str]]:
+        """Return the attribute names accepted by the context specialized validators.
+
+        The first item holds the names that are directly accepted: the
+        camelCase names, as in the SCIM schemas, the normalized names
+        and the field names. The second item maps the case-folded names
+        to the normalized names. The names are computed once per class.
+        """
+        names = cls.__dict__.get("_attribute_names")
+        if names is None:
+            exact_names = set()
+            folded_names = {}
+            for field_name, field in cls.model_fields.items():
+                normalized_name = str(field.validation_alias)
+                for name in (field_name, field.serialization_alias, normalized_name):
+                    exact_names.add(name)
+                    folded_names[str(name).casefold()] = normalized_name
+            names = (frozenset(exact_names), folded_names)
+            cls._attribute_names = names
+        return names
+
+    @classmethod
+    def resolve_attribute_names(cls, value: Any) -> Any:
+        """Resolve payload attribute names case-insensitively.
+
+        This has the same effect than :meth:`~scim2_models.BaseModel.normalize_attribute_names`,
+        and is used by the context specialized validators, whose fields
+        accept the camelCase and the normalized attribute names.
+        Payloads that only use those names, once per attribute, are left
+        untouched, and the other attribute names are looked up in lowercase
+        in the names returned by :meth:`~scim2_models.BaseModel.get_attribute_names`.
+        When several keys name the same attribute, the last one wins.
+        """
+        if not isinstance(value, dict):
+            return value
 
-        def normalize_value(value: Any) -> Any:
-            if isinstance(value, dict):
-                return {
-                    normalize_attribute_name(k): normalize_value(v)
-                    for k, v in value.items()
-                }
+        exact_names, folded_names = cls.get_attribute_names()
+        if value.keys() <= exact_names and len(
+            set(map(folded_names.__getitem__, map(str.casefold, value)))
+        ) == len(value):
             return value
 
-        normalized_value = normalize_value(value)
-        return handler(normalized_value)
+        return {
+            folded_names.get(key.casefold()) or normalize_attribute_name(key): item
+            for key, item in value.items()
+        }
 
     @model_validator(mode="wrap")
     @classmethod
@@ -539,10 +595,16 @@ class BaseModel(PydanticBaseModel):
         ):
             return value
 
+        cls.check_attributes_returnability(value.__dict__)
+        return value
+
+    @classmethod
+    def check_attributes_returnability(cls, values: dict[str, Any]) -> dict[str, Any]:
+        """Check that the :class:`~scim2_models.Returned` annotations are respected by a mapping of field values."""
         for field_name in cls.model_fields:
             returnability = cls.get_field_annotation(field_name, Returned)
 
-            if returnability == Returned.always and getattr(value, field_name) is None:
+            if returnability == Returned.always and values.get(field_name) is None:
                 raise PydanticCustomError(
                     "returned_error",
                     "Field '{field_name}' has returnability 'always' but value is missing or null",
@@ -551,10 +613,7 @@ class BaseModel(PydanticBaseModel):
                     },
                 )
 
-            if (
-                returnability == Returned.never
-                and getattr(value, field_name) is not None
-            ):
+            if returnability == Returned.never and values.get(field_name) is not None:
                 raise PydanticCustomError(
                     "returned_error",
                     "Field '{field_name}' has returnability 'never' but value is set",
@@ -563,7 +622,7 @@ class BaseModel(PydanticBaseModel):
                     },
                 )
 
-        return value
+        return values
 
     @model_validator(mode="wrap")
     @classmethod
@@ -584,10 +643,16 @@ class BaseModel(PydanticBaseModel):
         ):
             return value
 
+        cls.check_attributes_necessity(value.__dict__)
+        return value
+
+    @classmethod
+    def check_attributes_necessity(cls, values: dict[str, Any]) -> dict[str, Any]:
+        """Check that the :class:`~scim2_models.Required` annotations are respected by a mapping of field values."""
         for field_name in cls.model_fields:
             necessity = cls.get_field_annotation(field_name, Required)
 
-            if necessity == Required.true and getattr(value, field_name) is None:
+            if necessity == Required.true and values.get(field_name) is None:
                 raise PydanticCustomError(
                     "required_error",
                     "Field '{field_name}' is required but value is missing or null",
@@ -596,7 +661,7 @@ class BaseModel(PydanticBaseModel):
                     },
                 )
 
-        return value
+        return values
 
     @model_validator(mode="wrap")
     @classmethod
@@ -621,26 +686,166 @@ class BaseModel(PydanticBaseModel):
     @classmethod
     def check_mutability_issues(cls, original: "BaseModel", replacement: "BaseModel"):
         """Compare two instances, and check for differences of values on the fields marked as immutable."""
-        model = replacement.__class__
-        for field_name in model.model_fields:
-            mutability = model.get_field_annotation(field_name, Mutability)
-            if mutability == Mutability.immutable and getattr(
-                original, field_name
-            ) != getattr(replacement, field_name):
+        model = type(replacement)
+        for path in model.get_immutable_paths():
+            values = get_path_values(original, replacement, path)
+            if values is not None and values[0] != values[1]:
                 raise PydanticCustomError(
                     "mutability_error",
                     "Field '{field_name}' is immutable but the request value is different than the original value.",
-                    {"field_name": field_name},
+                    {"field_name": path[-1]},
                 )
 
-            attr_type = model.get_field_root_type(field_name)
-            if is_complex_attribute(attr_type) and not model.get_field_multiplicity(
-                field_name
-            ):
-                original_val = getattr(original, field_name)
-                replacement_value = getattr(replacement, field_name)
-                if original_val is not None and replacement_value is not None:
-                    cls.check_mutability_issues(original_val, replacement_value)
+        for path in model._recursive_paths:
+            values = get_path_values(original, replacement, path)
+            if values is not None and values[0] is not None and values[1] is not None:
+                type(values[1]).check_mutability_issues(*values)
+
+    @classmethod
+    def get_immutable_paths(cls) -> tuple[tuple[str, ...], ...]:
+        """Return the paths of the fields marked as :attr:`~scim2_models.Mutability.immutable`.
+
+        The paths are tuples of field names, and go through the
+        single-valued complex attributes. They are computed once per
+        class, so :meth:`~scim2_models.BaseModel.check_mutability_issues`
+        only visits the immutable fields and their parents.
+        Complex attributes holding one of their parent types are not
+        followed, and are checked with the :meth:`~scim2_models.BaseModel.check_mutability_issues`
+        of their own type instead.
+        """
+        paths = cls.__dict__.get("_immutable_paths")
+        if paths is None:
+            found = list(find_immutable_paths(cls))
+            paths = tuple(path for path, recursive in found if not recursive)
+            cls._immutable_paths = paths
+            cls._recursive_paths = tuple(path for path, recursive in found if recursive)
+        return paths
+
+    @classmethod
+    def get_scim_validator(cls, scim_ctx: Optional[Context]) -> SchemaValidator:
+        """Return a validator specialized for a SCIM context.
+
+        The SCIM validators that have no effect in :paramref:`scim_ctx` are
+        removed from the validation schema, so for instance
+        :attr:`~scim2_models.Context.DEFAULT` validation does not call
+        :meth:`~scim2_models.BaseModel.check_request_attributes_mutability`
+        on every field. The attribute names are resolved with
+        :meth:`~scim2_models.BaseModel.resolve_attribute_names`.
+        The validators are built once per class and per context.
+        """
+        validators = cls.__dict__.get("_scim_validators")
+        if validators is None:
+            validators = {}
+            cls._scim_validators = validators
+
+        if scim_ctx not in validators:
+            schema = scim_validation_schema(cls.__pydantic_core_schema__, scim_ctx)
+            validators[scim_ctx] = SchemaValidator(
+                schema, get_model_config(schema, cls)
+            )
+
+        return validators[scim_ctx]
+
+    @classmethod
+    def get_scim_payload_validator(
+        cls, scim_ctx: Optional[Context]
+    ) -> Optional[SchemaValidator]:
+        """Return a validator specialized for a SCIM context, that checks payloads without building models.
+
+        The model schemas of :meth:`~scim2_models.BaseModel.get_scim_validator`
+        are replaced by their field schemas, so the validation produces
+        dictionaries instead of model instances, and the model-level SCIM
+        validators are applied on those dictionaries.
+        :data:`None` is returned if the model has other model-level
+        validators, that need model instances.
+        The validators are built once per class and per context.
+        """
+        validators = cls.__dict__.get("_scim_payload_validators")
+        if validators is None:
+            validators = {}
+            cls._scim_payload_validators = validators
+
+        if scim_ctx not in validators:
+            schema = scim_validation_schema(cls.__pydantic_core_schema__, scim_ctx)
+            validators[scim_ctx] = (
+                SchemaValidator(
+                    payload_validation_schema(schema), get_model_config(schema, cls)
+                )
+                if is_payload_validation_supported(schema)
+                else None
+            )
+
+        return validators[scim_ctx]
+
+    @classmethod
+    def get_scim_json_validator(
+        cls, scim_ctx: Optional[Context]
+    ) -> Optional[SchemaValidator]:
+        """Return a validator specialized for a SCIM context, that validates JSON payloads without normalizing their attribute names.
+
+        The attribute names are directly looked up by pydantic-core, in
+        camelCase, as in the SCIM schemas, or in lowercase, instead of
+        being normalized by :meth:`~scim2_models.BaseModel.normalize_attribute_names`.
+        :data:`None` is returned if the model cannot be validated this
+        way, because some models do not forbid extra attributes.
+        The validators are built once per class and per context.
+        """
+        validators = cls.__dict__.get("_scim_json_validators")
+        if validators is None:
+            validators = {}
+            cls._scim_json_validators = validators
+
+        if scim_ctx not in validators:
+            schema = specialize_validation_schema(
+                cls.__pydantic_core_schema__, scim_ctx
+            )
+            validators[scim_ctx] = (
+                SchemaValidator(
+                    case_insensitive_validation_schema(schema, resolve_names=False),
+                    get_model_config(schema, cls),
+                )
+                if is_json_validation_supported(schema)
+                else None
+            )
+
+        return validators[scim_ctx]
+
+    @classmethod
+    def check_payload(
+        cls,
+        payload: Union[dict[str, Any], str, bytes],
+        scim_ctx: Optional[Context] = Context.DEFAULT,
+    ) -> list[ErrorDetails]:
+        """Check that a payload is valid in a SCIM context, without building the models.
+
+        The payload goes through the same checks than with
+        :meth:`~scim2_models.BaseModel.model_validate`, including the
+        :class:`~scim2_models.Required`, :class:`~scim2_models.Mutability`
+        and :class:`~scim2_models.Returned` checks and the extensions
+        validation, but no model instance is built, which makes it
+        much faster for applications that only need to know if a payload
+        is valid.
+
+        Immutable attributes are not compared with an original value in
+        :attr:`~scim2_models.Context.RESOURCE_REPLACEMENT_REQUEST` context.
+
+        :param payload: The payload, as a dictionary or as JSON.
+        :param scim_ctx: The SCIM :class:`~scim2_models.Context` in which the validation happens.
+        :return: The validation errors, in the format of :meth:`pydantic_core.ValidationError.errors`.
+            The list is empty if the payload is valid.
+        """
+        validator = cls.get_scim_payload_validator(scim_ctx) or cls.get_scim_validator(
+            scim_ctx
+        )
+        context = {"scim": scim_ctx, "original": None}
+        try:
+            if isinstance(payload, (str, bytes)):
+                validator.validate_json(payload, context=context)
+            else:
+                validator.validate_python(payload, context=context)
+        except ValidationError as exc:
+            return exc.errors()
+        return []
 
     def mark_with_schema(self):
         """Navigate through attributes and sub-attributes of type ComplexAttribute, and mark them with a '_schema' attribute.
@@ -688,6 +893,58 @@ class BaseModel(PydanticBaseModel):
 
         return value
 
+    @classmethod
+    def is_field_dumped(cls, field_name: str, scim_ctx: Context) -> bool:
+        """Indicate whether a field is dumped in a SCIM context when no attribute inclusion or exclusion is requested.
+
+        This is the static counterpart of :meth:`~scim2_models.BaseModel.scim_request_serializer`
+        and :meth:`~scim2_models.BaseModel.scim_response_serializer`.
+        """
+        if scim_ctx in (
+            Context.RESOURCE_CREATION_REQUEST,
+            Context.RESOURCE_REPLACEMENT_REQUEST,
+        ):
+            return (
+                cls.get_field_annotation(field_name, Mutability) != Mutability.read_only
+            )
+
+        if scim_ctx in (Context.RESOURCE_QUERY_REQUEST, Context.SEARCH_REQUEST):
+            return (
+                cls.get_field_annotation(field_name, Mutability)
+                != Mutability.write_only
+            )
+
+        if Context.is_response(scim_ctx):
+            return cls.get_field_annotation(field_name, Returned) not in (
+                Returned.never,
+                Returned.request,
+            )
+
+        return True
+
+    @classmethod
+    def get_scim_serializer(cls, scim_ctx: Context) -> SchemaSerializer:
+        """Return a serializer specialized for a SCIM context.
+
+        The :meth:`~scim2_models.BaseModel.scim_serializer` callbacks are
+        replaced by static field exclusions computed with
+        :meth:`~scim2_models.BaseModel.is_field_dumped`, so the serialization
+        mostly happens in pydantic-core. The serializers are built once per
+        class and per context.
+        """
+        serializers = cls.__dict__.get("_scim_serializers")
+        if serializers is None:
+            serializers = {}
+            cls._scim_serializers = serializers
+
+        if scim_ctx not in serializers:
+            schema = specialize_serialization_schema(
+                cls.__pydantic_core_schema__, scim_ctx
+            )
+            serializers[scim_ctx] = SchemaSerializer(schema)
+
+        return serializers[scim_ctx]
+
     def scim_request_serializer(self, value: Any, info: SerializationInfo) -> Any:
         """Serialize the fields according to mutability indications passed in the serialization context."""
         mutability = self.get_field_annotation(info.field_name, Mutability)
@@ -753,6 +1010,28 @@ class BaseModel(PydanticBaseModel):
         result = handler(self)
         return {key: value for key, value in result.items() if value is not None}
 
+    @classmethod
+    def _prepare_model_validate(
+        cls,
+        kwargs: dict[str, Any],
+        scim_ctx: Optional[Context],
+        original: Optional["BaseModel"],
+    ) -> Optional[Context]:
+        """Fill the validation context, and return the SCIM context in which the validation happens."""
+        context = kwargs.get("context")
+        context = kwargs["context"] = {} if context is None else context
+        context.setdefault("scim", scim_ctx)
+        context.setdefault("original", original)
+
+        if context["scim"] == Context.RESOURCE_REPLACEMENT_REQUEST and (
+            context["original"] is None
+        ):
+            raise ValueError(
+                "Resource queries replacement validation must compare to an original resource"
+            )
+
+        return context["scim"]
+
     @classmethod
     def model_validate(
         cls,
@@ -768,17 +1047,87 @@ class BaseModel(PydanticBaseModel):
             :attr:`~scim2_models.Mutability.immutable` parameters will be compared against the *original* model value.
             An exception is raised if values are different.
         """
-        context = kwargs.setdefault("context", {})
-        context.setdefault("scim", scim_ctx)
-        context.setdefault("original", original)
+        scim_ctx = cls._prepare_model_validate(kwargs, scim_ctx, original)
 
-        if scim_ctx == Context.RESOURCE_REPLACEMENT_REQUEST and original is None:
-            raise ValueError(
-                "Resource queries replacement validation must compare to an original resource"
-            )
+        if (
+            len(args) == 1
+            and set(kwargs) <= {"strict", "from_attributes", "context"}
+            and cls.__pydantic_complete__
+        ):
+            return cls.get_scim_validator(scim_ctx).validate_python(*args, **kwargs)
 
         return super().model_validate(*args, **kwargs)
 
+    @classmethod
+    def model_validate_json(
+        cls,
+        *args,
+        scim_ctx: Optional[Context] = Context.DEFAULT,
+        original: Optional["BaseModel"] = None,
+        **kwargs,
+    ) -> Self:
+        """Validate SCIM JSON payloads and generate model representation by using Pydantic :code:`BaseModel.model_validate_json`.
+
+        The JSON data is directly validated by pydantic-core, without
+        building intermediate Python dictionaries. Attribute names that
+        are neither in camelCase, as in the SCIM schemas, nor in
+        lowercase, are reported as extra attributes by pydantic-core, and
+        are handled by validating the payload again with the
+        :meth:`~scim2_models.BaseModel.normalize_attribute_names` validator.
+        Other validation errors are raised directly, and their locations
+        are the same as with :meth:`~scim2_models.BaseModel.model_validate`.
+
+        :param scim_ctx: The SCIM :class:`~scim2_models.Context` in which the validation happens.
+        :param original: If this parameter is set during :attr:`~Context.RESOURCE_REPLACEMENT_REQUEST`,
+            :attr:`~scim2_models.Mutability.immutable` parameters will be compared against the *original* model value.
+            An exception is raised if values are different.
+        """
+        scim_ctx = cls._prepare_model_validate(kwargs, scim_ctx, original)
+
+        if (
+            len(args) != 1
+            or not set(kwargs) <= {"strict", "context"}
+            or not cls.__pydantic_complete__
+        ):
+            return super().model_validate_json(*args, **kwargs)
+
+        if validator := cls.get_scim_json_validator(scim_ctx):
+            try:
+                return validator.validate_json(*args, **kwargs)
+            except ValidationError as exc:
+                if not any(
+                    error["type"] == "extra_forbidden" for error in exc.errors()
+                ):
+                    raise
+
+        return cls.get_scim_validator(scim_ctx).validate_json(*args, **kwargs)
+
+    @classmethod
+    def model_validate_strings(
+        cls,
+        *args,
+        scim_ctx: Optional[Context] = Context.DEFAULT,
+        original: Optional["BaseModel"] = None,
+        **kwargs,
+    ) -> Self:
+        """Validate SCIM payloads containing string data and generate model representation by using Pydantic :code:`BaseModel.model_validate_strings`.
+
+        :param scim_ctx: The SCIM :class:`~scim2_models.Context` in which the validation happens.
+        :param original: If this parameter is set during :attr:`~Context.RESOURCE_REPLACEMENT_REQUEST`,
+            :attr:`~scim2_models.Mutability.immutable` parameters will be compared against the *original* model value.
+            An exception is raised if values are different.
+        """
+        scim_ctx = cls._prepare_model_validate(kwargs, scim_ctx, original)
+
+        if (
+            len(args) == 1
+            and set(kwargs) <= {"strict", "context"}
+            and cls.__pydantic_complete__
+        ):
+            return cls.get_scim_validator(scim_ctx).validate_strings(*args, **kwargs)
+
+        return super().model_validate_strings(*args, **kwargs)
+
     def _prepare_model_dump(
         self,
         scim_ctx: Optional[Context] = Context.DEFAULT,
@@ -802,6 +1151,26 @@ class BaseModel(PydanticBaseModel):
 
         return kwargs
 
+    def _get_specialized_serializer(
+        self,
+        args: tuple,
+        scim_ctx: Optional[Context],
+        attributes: Optional[list[str]],
+        excluded_attributes: Optional[list[str]],
+        dump_kwargs: dict,
+    ) -> Optional[SchemaSerializer]:
+        """Return the context specialized serializer if it produces the same result than the regular one."""
+        if (
+            args
+            or not scim_ctx
+            or not dump_kwargs.get("exclude_none")
+            or not self.__pydantic_complete__
+            or (Context.is_response(scim_ctx) and (attributes or excluded_attributes))
+        ):
+            return None
+
+        return self.get_scim_serializer(scim_ctx)
+
     def model_dump(
         self,
         *args,
@@ -821,6 +1190,12 @@ class BaseModel(PydanticBaseModel):
         )
         if scim_ctx:
             dump_kwargs.setdefault("mode", "json")
+
+        if serializer := self._get_specialized_serializer(
+            args, scim_ctx, attributes, excluded_attributes, dump_kwargs
+        ):
+            return serializer.to_python(self, **dump_kwargs)
+
         return super().model_dump(*args, **dump_kwargs)
 
     def model_dump_json(
@@ -830,7 +1205,7 @@ class BaseModel(PydanticBaseModel):
         attributes: Optional[list[str]] = None,
         excluded_attributes: Optional[list[str]] = None,
         **kwargs,
-    ) -> dict:
+    ) -> str:
         """Create a JSON model representation that can be included in SCIM messages by using Pydantic :code:`BaseModel.model_dump_json`.
 
         :param scim_ctx: If a SCIM context is passed, some default values of
@@ -840,8 +1215,69 @@ class BaseModel(PydanticBaseModel):
         dump_kwargs = self._prepare_model_dump(
             scim_ctx, attributes, excluded_attributes, **kwargs
         )
+
+        if serializer := self._get_specialized_serializer(
+            args, scim_ctx, attributes, excluded_attributes, dump_kwargs
+        ):
+            return serializer.to_json(self, **dump_kwargs).decode()
+
         return super().model_dump_json(*args, **dump_kwargs)
 
+    def model_dump_msgpack(
+        self,
+        scim_ctx: Optional[Context] = Context.DEFAULT,
+        attributes: Optional[list[str]] = None,
+        excluded_attributes: Optional[list[str]] = None,
+    ) -> bytes:
+        """Create a MessagePack model representation, for internal exchanges between services.
+
+        The payload has the same content than :meth:`~scim2_models.BaseModel.model_dump_json`,
+        with the same attribute projections and extensions keyed by
+        their schema URN, but is smaller and faster to parse. It can be
+        validated back with :meth:`~scim2_models.BaseModel.model_validate_msgpack`.
+
+        This needs `msgspec <https://jcristharif.com/msgspec/>`_ to be installed.
+
+        :param scim_ctx: The SCIM :class:`~scim2_models.Context` of the dump.
+        """
+        if msgspec is None:
+            raise ImportError("MessagePack serialization needs msgspec to be installed")
+
+        return msgspec.msgpack.encode(
+            self.model_dump(
+                scim_ctx=scim_ctx,
+                attributes=attributes,
+                excluded_attributes=excluded_attributes,
+            )
+        )
+
+    @classmethod
+    def model_validate_msgpack(
+        cls,
+        data: bytes,
+        scim_ctx: Optional[Context] = Context.DEFAULT,
+        original: Optional["BaseModel"] = None,
+    ) -> Self:
+        """Validate a MessagePack payload built by :meth:`~scim2_models.BaseModel.model_dump_msgpack`.
+
+        This needs `msgspec <https://jcristharif.com/msgspec/>`_ to be installed.
+
+        :param scim_ctx: The SCIM :class:`~scim2_models.Context` in which the validation happens.
+        :param original: If this parameter is set during :attr:`~Context.RESOURCE_REPLACEMENT_REQUEST`,
+            :attr:`~scim2_models.Mutability.immutable` parameters will be compared against the *original* model value.
+            An exception is raised if values are different.
+        :raises ValueError: If the data is not valid MessagePack.
+        """
+        if msgspec is None:
+            raise ImportError("MessagePack validation needs msgspec to be installed")
+
+        try:
+            payload = msgspec.msgpack.decode(data)
+        except msgspec.DecodeError as exc:
+            raise ValueError(str(exc)) from exc
+
+        return cls.model_validate(payload, scim_ctx=scim_ctx, original=original)
+
     def get_attribute_urn(self, field_name: str) -> str:
         """Build the full URN of the attribute.
 
@@ -854,6 +1290,102 @@ class BaseModel(PydanticBaseModel):
         full_urn = alias if ":" in alias else f"{main_schema}:{alias}"
         return full_urn
 
+    @classmethod
+    def is_field_hashed(cls, field_name: str, strict: bool = False) -> bool:
+        """Indicate whether a field is part of the content hash.
+
+        Fields annotated with :attr:`~scim2_models.Returned.never` are
+        never sent to clients, so they are only part of the *strict* content hash.
+        """
+        return (
+            strict or cls.get_field_annotation(field_name, Returned) != Returned.never
+        )
+
+    @classmethod
+    def get_hashed_fields(cls, strict: bool = False) -> tuple[tuple[str, bool], ...]:
+        """Return the names of the fields that are part of the content hash, with their :class:`~scim2_models.CaseExact` value.
+
+        The fields are sorted by name, and computed once per class.
+        """
+        attribute_name = "_strict_hashed_fields" if strict else "_hashed_fields"
+        fields = cls.__dict__.get(attribute_name)
+        if fields is None:
+            fields = tuple(
+                (field_name, bool(cls.get_field_annotation(field_name, CaseExact)))
+                for field_name in sorted(cls.model_fields)
+                if cls.is_field_hashed(field_name, strict)
+            )
+            setattr(cls, attribute_name, fields)
+        return fields
+
+    def get_field_hash(
+        self, field_name: str, case_exact: bool, strict: bool = False
+    ) -> Optional[bytes]:
+        """Return the hash of a field value, or :data:`None` if the field has no value.
+
+        :param case_exact: Whether the strings of the field are case-sensitive.
+        :param strict: Whether all the strings, including the ones of the
+            complex attributes, are case-sensitive.
+
+        The hashes are computed on each call, so they follow the values
+        assigned or modified in place.
+        """
+        value = self.__dict__[field_name]
+        if value is None:
+            return None
+
+        return hash_value(value, case_exact or strict, strict)
+
+    @classmethod
+    def get_compact_model(cls) -> type["CompactModel"]:
+        """Return the :class:`~scim2_models.CompactModel` class representing this model.
+
+        The class is built once per model class.
+        """
+        from .compact import make_compact_model
+
+        compact_model = cls.__dict__.get("_compact_model")
+        if compact_model is None:
+            compact_model = make_compact_model(cls)
+            cls._compact_model = compact_model
+        return compact_model
+
+    def to_compact(self) -> "CompactModel":
+        """Build a compact, read-only representation of the model.
+
+        This is useful to keep large amounts of models in memory, for
+        instance in caches. The model can be built back with
+        :meth:`CompactModel.to_model <scim2_models.CompactModel.to_model>`.
+        """
+        from .compact import compact_value
+
+        values = self.__dict__
+        return tuple.__new__(
+            self.get_compact_model(),
+            [compact_value(values[field_name]) for field_name in self.model_fields],
+        )
+
+    def get_content_hash(self, strict: bool = False) -> bytes:
+        """Return a canonical hash of the model content.
+
+        The hash does not depend on the field declaration order nor on
+        the order of multi-valued attributes items. Strings of fields
+        annotated with :attr:`CaseExact.false <scim2_models.CaseExact.false>`
+        are compared case-insensitively, and fields annotated with
+        :attr:`~scim2_models.Returned.never` are ignored.
+
+        :param strict: Whether to compare all the strings case-sensitively,
+            and to hash the fields annotated with :attr:`~scim2_models.Returned.never`,
+            so any modification of the model changes its hash.
+        """
+        content_hash = blake2b(digest_size=16)
+        for field_name, case_exact in self.get_hashed_fields(strict):
+            field_hash = self.get_field_hash(field_name, case_exact, strict)
+            if field_hash is not None:
+                content_hash.update(field_name.encode())
+                content_hash.update(field_hash)
+        return content_hash.digest()
+
 
 class ComplexAttribute(BaseModel):
     """A complex attribute as defined in :rfc:`RFC7643 §2.3.8 <7643#section-2.3.8>`."""
@@ -888,7 +1420,452 @@ class MultiValuedComplexAttribute(ComplexAttribute):
     reference."""
 
 
-def is_complex_attribute(type) -> bool:
+def has_python_wrap_serializer(schema: Any) -> bool:
+    """Indicate whether a field schema holds a python wrap serializer, without looking into nested models."""
+    if isinstance(schema, list):
+        return any(has_python_wrap_serializer(item) for item in schema)
+
+    if not isinstance(schema, dict) or schema.get("type") in (
+        "model",
+        "definition-ref",
+    ):
+        return False
+
+    if schema.get("serialization", {}).get("type") == "function-wrap":
+        return True
+
+    return any(has_python_wrap_serializer(value) for value in schema.values())
+
+
+def specialize_serialization_schema(schema: Any, scim_ctx: Context) -> Any:
+    """Copy a pydantic core schema, and replace the SCIM field serializers by static exclusions for a given context.
+
+    The :meth:`~scim2_models.BaseModel.model_serializer_exclude_none` serializer
+    is removed too when no remaining field serializer can produce :data:`None`
+    values. Those are then handled by pydantic ``exclude_none`` parameter.
+    """
+    if isinstance(schema, list):
+        return [specialize_serialization_schema(item, scim_ctx) for item in schema]
+
+    if not isinstance(schema, dict):
+        return schema
+
+    schema = {
+        key: specialize_serialization_schema(value, scim_ctx)
+        for key, value in schema.items()
+    }
+
+    if (
+        schema.get("type") != "model"
+        or not issubclass(schema["cls"], BaseModel)
+        or schema["schema"].get("type") != "model-fields"
+    ):
+        return schema
+
+    model = schema["cls"]
+    wrapped_fields = False
+    for field_name, field in schema["schema"]["fields"].items():
+        field_schema = field["schema"]
+        if field_schema.get("serialization", {}).get("function") is (
+            BaseModel.scim_serializer
+        ):
+            field["schema"] = {
+                key: value
+                for key, value in field_schema.items()
+                if key != "serialization"
+            }
+            if not model.is_field_dumped(field_name, scim_ctx):
+                field["serialization_exclude"] = True
+
+        wrapped_fields = wrapped_fields or has_python_wrap_serializer(field["schema"])
+
+    if (
+        schema.get("serialization", {}).get("function")
+        is BaseModel.model_serializer_exclude_none
+        and not wrapped_fields
+    ):
+        del schema["serialization"]
+
+    return schema
+
+
+def is_validator_needed(
+    function: Any, field_name: Optional[str], scim_ctx: Optional[Context]
+) -> bool:
+    """Indicate whether a validator has an effect in a given SCIM context.
+
+    Validators that are not provided by :class:`~scim2_models.BaseModel` are always considered as needed.
+    """
+    model = getattr(function, "__self__", None)
+    function = getattr(function, "__func__", None)
+    if model is None:
+        return True
+
+    if function is BaseModel.check_request_attributes_mutability.__func__:
+        mutability = model.get_field_annotation(field_name, Mutability)
+        return (
+            scim_ctx
+            in (Context.RESOURCE_CREATION_REQUEST, Context.RESOURCE_REPLACEMENT_REQUEST)
+            and mutability == Mutability.read_only
+        ) or (
+            scim_ctx in (Context.RESOURCE_QUERY_REQUEST, Context.SEARCH_REQUEST)
+            and mutability == Mutability.write_only
+        )
+
+    if function is BaseModel.check_response_attributes_returnability.__func__:
+        return (
+            scim_ctx is not None
+            and Context.is_response(scim_ctx)
+            and any(
+                model.get_field_annotation(field_name, Returned)
+                in (Returned.always, Returned.never)
+                for field_name in model.model_fields
+            )
+        )
+
+    if function is BaseModel.check_response_attributes_necessity.__func__:
+        return scim_ctx in (
+            Context.RESOURCE_CREATION_REQUEST,
+            Context.RESOURCE_REPLACEMENT_REQUEST,
+        ) and any(
+            model.get_field_annotation(field_name, Required) == Required.true
+            for field_name in model.model_fields
+        )
+
+    if function is BaseModel.check_replacement_request_mutability.__func__:
+        return scim_ctx == Context.RESOURCE_REPLACEMENT_REQUEST
+
+    return True
+
+
+def specialize_validation_schema(schema: Any, scim_ctx: Optional[Context]) -> Any:
+    """Copy a pydantic core schema, and remove the SCIM validators that have no effect in a given context."""
+    if isinstance(schema, list):
+        return [specialize_validation_schema(item, scim_ctx) for item in schema]
+
+    if not isinstance(schema, dict):
+        return schema
+
+    schema = {
+        key: specialize_validation_schema(value, scim_ctx)
+        for key, value in schema.items()
+    }
+
+    if (
+        schema.get("type") not in ("function-after", "function-wrap")
+        or not isinstance(schema.get("function"), dict)
+        or is_validator_needed(
+            schema["function"]["function"],
+            schema["function"].get("field_name"),
+            scim_ctx,
+        )
+    ):
+        return schema
+
+    inner_schema = dict(schema["schema"])
+    for key in ("ref", "serialization"):
+        if key in schema:
+            inner_schema[key] = schema[key]
+    return inner_schema
+
+
+def scim_validation_schema(schema: Any, scim_ctx: Optional[Context]) -> Any:
+    """Build the schema of the context specialized validators from a model core schema."""
+    return case_insensitive_validation_schema(
+        specialize_validation_schema(schema, scim_ctx)
+    )
+
+
+def normalize_keys(value: Any) -> Any:
+    """Normalize the keys of a dictionary and of its nested dictionaries with :func:`~scim2_models.utils.normalize_attribute_name`."""
+    if isinstance(value, dict):
+        return {
+            normalize_attribute_name(k): normalize_keys(v) for k, v in value.items()
+        }
+    return value
+
+
+def is_json_validation_supported(schema: Any) -> bool:
+    """Indicate whether JSON payloads can be validated without normalizing their attribute names.
+
+    Models that do not forbid extra attributes would silently ignore
+    attributes with an unexpected case.
+    """
+    if isinstance(schema, list):
+        return all(is_json_validation_supported(item) for item in schema)
+
+    if not isinstance(schema, dict):
+        return True
+
+    if (
+        schema.get("type") == "model"
+        and schema.get("config", {}).get("extra_fields_behavior") != "forbid"
+    ):
+        return False
+
+    return all(is_json_validation_supported(value) for value in schema.values())
+
+
+def case_insensitive_validation_schema(schema: Any, resolve_names: bool = True) -> Any:
+    """Copy a pydantic core schema, and make fields accept their camelCase and lowercase names.
+
+    The :meth:`~scim2_models.BaseModel.normalize_attribute_names`
+    validators are replaced by :meth:`~scim2_models.BaseModel.resolve_attribute_names`,
+    or removed if :paramref:`resolve_names` is :data:`False`.
+    As the attribute names are not normalized recursively anymore, the
+    keys of values accepted by fields of any type are normalized by a
+    dedicated validator.
+    """
+    if isinstance(schema, list):
+        return [
+            case_insensitive_validation_schema(item, resolve_names) for item in schema
+        ]
+
+    if not isinstance(schema, dict):
+        return schema
+
+    if schema.get("type") == "any":
+        return core_schema.no_info_before_validator_function(normalize_keys, schema)
+
+    converted = {
+        key: value
+        if key == "serialization"
+        else case_insensitive_validation_schema(value, resolve_names)
+        for key, value in schema.items()
+    }
+
+    if (
+        schema.get("type") == "model-field"
+        and isinstance(schema.get("validation_alias"), str)
+        and isinstance(schema.get("serialization_alias"), str)
+        and schema["validation_alias"] != schema["serialization_alias"]
+    ):
+        converted["validation_alias"] = [
+            [schema["serialization_alias"]],
+            [schema["validation_alias"]],
+        ]
+
+    if (
+        isinstance(schema.get("function"), dict)
+        and getattr(schema["function"]["function"], "__func__", None)
+        is BaseModel.normalize_attribute_names.__func__
+    ):
+        if resolve_names:
+            model = schema["function"]["function"].__self__
+            result = core_schema.no_info_before_validator_function(
+                model.resolve_attribute_names, converted["schema"]
+            )
+        else:
+            result = dict(converted["schema"])
+        for key in ("ref", "serialization"):
+            if key in schema:
+                result[key] = schema[key]
+        return result
+
+    return converted
+
+
+def get_model_validator_model(schema: Any) -> Optional[type["BaseModel"]]:
+    """Return the model of a model-level validator schema, or :data:`None` if the schema is not a model-level validator."""
+    if schema.get("type") not in (
+        "function-after",
+        "function-before",
+        "function-plain",
+        "function-wrap",
+    ):
+        return None
+
+    inner_schema = schema.get("schema")
+    while isinstance(inner_schema, dict) and inner_schema.get("type", "").startswith(
+        "function-"
+    ):
+        inner_schema = inner_schema.get("schema")
+
+    if not isinstance(inner_schema, dict) or inner_schema.get("type") != "model":
+        return None
+    return inner_schema["cls"]
+
+
+PAYLOAD_MODEL_VALIDATORS = (
+    BaseModel.normalize_attribute_names.__func__,
+    # not decorated by pydantic, so mypy only sees the bound method
+    BaseModel.__dict__["resolve_attribute_names"].__func__,
+    BaseModel.check_response_attributes_returnability.__func__,
+    BaseModel.check_response_attributes_necessity.__func__,
+    BaseModel.check_replacement_request_mutability.__func__,
+)
+
+
+def is_payload_validation_supported(schema: Any) -> bool:
+    """Indicate whether all the model-level validators of a core schema can be applied on dictionaries."""
+    if isinstance(schema, list):
+        return all(is_payload_validation_supported(item) for item in schema)
+
+    if not isinstance(schema, dict):
+        return True
+
+    if get_model_validator_model(schema) is not None and (
+        not isinstance(schema.get("function"), dict)
+        or getattr(schema["function"]["function"], "__func__", None)
+        not in PAYLOAD_MODEL_VALIDATORS
+    ):
+        return False
+
+    return all(is_payload_validation_supported(value) for value in schema.values())
+
+
+def payload_validation_schema(schema: Any) -> Any:
+    """Copy a pydantic core schema, and replace the models by their fields, so validation produces dictionaries.
+
+    The schema must only contain the model-level validators of :data:`PAYLOAD_MODEL_VALIDATORS`.
+    """
+    if isinstance(schema, list):
+        return [payload_validation_schema(item) for item in schema]
+
+    if not isinstance(schema, dict):
+        return schema
+
+    model = get_model_validator_model(schema)
+    converted = {key: payload_validation_schema(value) for key, value in schema.items()}
+
+    if schema.get("type") == "model":
+        fields_schema = {
+            **converted["schema"],
+            "extra_behavior": schema.get("config", {}).get(
+                "extra_fields_behavior", "ignore"
+            ),
+        }
+        result = core_schema.no_info_after_validator_function(
+            itemgetter(0), fields_schema
+        )
+
+    elif model is None:
+        return converted
+
+    else:
+        function = schema["function"]["function"].__func__
+        if function is BaseModel.check_response_attributes_returnability.__func__:
+            result = core_schema.no_info_after_validator_function(
+                model.check_attributes_returnability, converted["schema"]
+            )
+        elif function is BaseModel.check_response_attributes_necessity.__func__:
+            result = core_schema.no_info_after_validator_function(
+                model.check_attributes_necessity, converted["schema"]
+            )
+        elif function is BaseModel.check_replacement_request_mutability.__func__:
+            result = dict(converted["schema"])
+        else:
+            return converted
+
+    if "ref" in schema:
+        result["ref"] = schema["ref"]
+    return result
+
+
+def get_model_config(schema: Any, model: type) -> Optional[core_schema.CoreConfig]:
+    """Find the configuration of a model in a core schema."""
+    if isinstance(schema, dict) and schema.get("cls") is model:
+        return schema.get("config")
+
+    children = (
+        schema.values()
+        if isinstance(schema, dict)
+        else schema
+        if isinstance(schema, list)
+        else []
+    )
+    for child in children:
+        if config := get_model_config(child, model):
+            return config
+
+    return None
+
+
+def find_immutable_paths(model: type[BaseModel], parents: tuple[type, ...] = ()):
+    """Yield the paths of the immutable fields of a model and its single-valued complex attributes.
+
+    The paths are yielded with a boolean indicating whether they lead to
+    a complex attribute holding one of its parent types, whose fields are
+    not followed.
+    """
+    parents = (*parents, model)
+    for field_name in model.model_fields:
+        if model.get_field_annotation(field_name, Mutability) == Mutability.immutable:
+            yield (field_name,), False
+
+        attr_type = model.get_field_root_type(field_name)
+        if is_complex_attribute(attr_type) and not model.get_field_multiplicity(
+            field_name
+        ):
+            if attr_type in parents:
+                yield (field_name,), True
+            else:
+                for path, recursive in find_immutable_paths(attr_type, parents):
+                    yield (field_name, *path), recursive
+
+
+def get_path_values(
+    original: "BaseModel", replacement: "BaseModel", path: tuple[str, ...]
+) -> Optional[tuple[Any, Any]]:
+    """Return the values of a path of field names in two models, or :data:`None` if one of the parents is missing."""
+    original_value: Any = original
+    replacement_value: Any = replacement
+    for field_name in path:
+        if original_value is None or replacement_value is None:
+            return None
+        original_value = getattr(original_value, field_name)
+        replacement_value = getattr(replacement_value, field_name)
+    return original_value, replacement_value
+
+
+def find_unique_paths(model: type[BaseModel], parents: tuple[type, ...] = ()):
+    """Yield the paths, attribute names and :class:`~scim2_models.CaseExact` values of the unique fields of a model and its complex attributes."""
+    parents = (*parents, model)
+    for field_name, field in model.model_fields.items():
+        name = field.serialization_alias or field_name
+        if model.get_field_annotation(field_name, Uniqueness) in (
+            Uniqueness.server,
+            Uniqueness.global_,
+        ):
+            case_exact = bool(model.get_field_annotation(field_name, CaseExact))
+            yield (field_name,), (name,), case_exact
+
+        attr_type = model.get_field_root_type(field_name)
+        if is_complex_attribute(attr_type) and attr_type not in parents:
+            for path, names, case_exact in find_unique_paths(attr_type, parents):
+                yield (field_name, *path), (name, *names), case_exact
+
+
+def hash_value(value: Any, case_exact: bool, strict: bool = False) -> bytes:
+    """Compute the canonical hash of an attribute value.
+
+    :param strict: Whether the strings of complex attributes are compared case-sensitively.
+    """
+    if isinstance(value, list):
+        items_hash = blake2b(b"list", digest_size=16)
+        for digest in sorted(hash_value(item, case_exact, strict) for item in value):
+            items_hash.update(digest)
+        return items_hash.digest()
+
+    if isinstance(value, Enum):
+        value = value.value
+
+    if isinstance(value, BaseModel):
+        return value.get_content_hash(strict)
+
+    if isinstance(value, (str, UserString)):
+        value = str(value)
+        data = b"str:" + (value if case_exact else value.casefold()).encode()
+    elif isinstance(value, bytes):
+        data = b"bytes:" + value
+    elif isinstance(value, datetime):
+        data = b"datetime:" + value.isoformat().encode()
+    else:
+        data = f"{type(value).__name__}:{value!r}".encode()
+    return blake2b(data, digest_size=16).digest()
+
+
+def is_complex_attribute(type) -> TypeGuard[type[BaseModel]]:
     # issubclass raise a TypeError with 'Reference' on python < 3.11
     return (
         get_origin(type) != Reference
@@ -0,0 +1,736 @@
+import asyncio
+import inspect
+import time
+from abc import ABC
+from abc import abstractmethod
+from collections import OrderedDict
+from collections import deque
+from collections.abc import AsyncIterator
+from collections.abc import Awaitable
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Optional
+from typing import Union
+from urllib.parse import urlencode
+
+from .base import BaseModel
+from .base import Context
+from .compact import CompactModel
+from .json_backend import json_loads
+from .ndjson import get_resource_type
+from .ndjson import get_schema_index
+from .rfc7643.resource import Resource
+from .rfc7643.resource_type import ResourceType
+from .rfc7644.bulk import BulkRequest
+from .rfc7644.bulk import BulkResponse
+from .rfc7644.error import Error
+from .rfc7644.list_response import ListResponse
+from .rfc7644.list_response import get_list_response_type
+from .rfc7644.patch_op import PatchOp
+from .rfc7644.search_request import SearchRequest
+
+if TYPE_CHECKING:
+    import httpx
+
+SCIM_CONTENT_TYPE = "application/scim+json"
+ERROR_SCHEMA = Error.model_fields["schemas"].default[0]
+
+
+class TransportResponse:
+    """The status, headers and body of an HTTP response received by a :class:`Transport`.
+
+    :param status_code: The HTTP status code.
+    :param content: The response body.
+    :param headers: The response headers, with lowercased names.
+    """
+
+    def __init__(
+        self,
+        status_code: int,
+        content: bytes = b"",
+        headers: Optional[dict[str, str]] = None,
+    ):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {key.lower(): value for key, value in (headers or {}).items()}
+
+
+class Transport(ABC):
+    """Send the HTTP requests of :class:`~scim2_models.AsyncSCIMClient`.
+
+    Transports only move bytes: the requests are built and the responses
+    are validated by the client, so any HTTP library can be plugged in
+    by implementing :meth:`~scim2_models.Transport.request`.
+    """
+
+    @abstractmethod
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[dict[str, str]] = None,
+        content: Optional[bytes] = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> TransportResponse:
+        """Send a request and return its response.
+
+        :param url: The path of the request, relative to the SCIM server base URL.
+        """
+
+    async def aclose(self) -> None:  # noqa: B027
+        """Release the resources of the transport, like its connections."""
+
+
+class HTTPXTransport(Transport):
+    """Send requests with an :class:`httpx.AsyncClient`.
+
+    The client holds the base URL, the authentication and the connection
+    pool limits, so the connections are reused between the requests.
+
+    .. code-block:: python
+
+        transport = HTTPXTransport(
+            httpx.AsyncClient(
+                base_url="https://scim.example.com/v2",
+                limits=httpx.Limits(max_connections=20),
+            )
+        )
+
+    :param client: The httpx client, or :data:`None` to build one with :paramref:`base_url`.
+    :param base_url: The SCIM server base URL, if :paramref:`client` is not given.
+    """
+
+    def __init__(
+        self, client: Optional["httpx.AsyncClient"] = None, base_url: str = ""
+    ):
+        try:
+            import httpx
+        except ImportError as exc:
+            raise ImportError("HTTPXTransport needs 'httpx' to be installed") from exc
+
+        self.client = client or httpx.AsyncClient(base_url=base_url)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[dict[str, str]] = None,
+        content: Optional[bytes] = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> TransportResponse:
+        # httpx joins paths starting with '/' to the base URL path
+        response = await self.client.request(
+            method, url, params=params, content=content, headers=headers
+        )
+        return TransportResponse(
+            response.status_code, response.content, dict(response.headers)
+        )
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+Handler = Callable[
+    [str, str, dict[str, str], Optional[bytes], dict[str, str]],
+    Union[TransportResponse, Awaitable[TransportResponse]],
+]
+
+
+class MockTransport(Transport):
+    """Answer requests with a function, without any network access.
+
+    The handler takes the method, the URL, the query parameters, the
+    body and the headers of the requests, and returns a
+    :class:`~scim2_models.TransportResponse`. It can be a coroutine function.
+    The received requests are kept in :attr:`requests`.
+
+    :param handler: The function answering the requests.
+    """
+
+    def __init__(self, handler: Handler):
+        self.handler = handler
+        self.requests: list[tuple[str, str, dict[str, str], Optional[bytes]]] = []
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[dict[str, str]] = None,
+        content: Optional[bytes] = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> TransportResponse:
+        params = params or {}
+        self.requests.append((method, url, params, content))
+        response = self.handler(method, url, params, content, headers or {})
+        if inspect.isawaitable(response):
+            response = await response
+        return response
+
+
+class ASGITransport(Transport):
+    """Send requests to an ASGI application in the same process.
+
+    This allows testing clients against SCIM servers built with ASGI
+    frameworks, without running an HTTP server.
+
+    :param app: The ASGI application.
+    :param root_path: The path the application is mounted on.
+    """
+
+    def __init__(self, app: Callable, root_path: str = ""):
+        self.app = app
+        self.root_path = root_path
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[dict[str, str]] = None,
+        content: Optional[bytes] = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> TransportResponse:
+        path = f"{self.root_path}{url}"
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": self.root_path,
+            "query_string": urlencode(params or {}).encode(),
+            "headers": [
+                (key.lower().encode(), value.encode())
+                for key, value in (headers or {}).items()
+            ],
+            "server": ("testserver", 80),
+            "client": ("testclient", 50000),
+        }
+        messages = deque([{"type": "http.request", "body": content or b""}])
+        status_code = 500
+        response_headers: dict[str, str] = {}
+        body = bytearray()
+
+        async def receive() -> dict:
+            return messages.popleft() if messages else {"type": "http.disconnect"}
+
+        async def send(message: dict) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_headers.update(
+                    (key.decode(), value.decode())
+                    for key, value in message.get("headers", [])
+                )
+            else:
+                body.extend(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return TransportResponse(status_code, bytes(body), response_headers)
+
+
+class SCIMResponseError(Exception):
+    """Raised when a SCIM server answers with an unexpected status.
+
+    :param status_code: The HTTP status of the response.
+    :param error: The :class:`~scim2_models.Error` of the response body, if any.
+    :param content: The response body.
+    """
+
+    def __init__(
+        self, status_code: int, error: Optional[Error] = None, content: bytes = b""
+    ):
+        self.status_code = status_code
+        self.error = error
+        self.content = content
+        detail = error.detail if error and error.detail else content[:200].decode()
+        super().__init__(f"SCIM server answered with status {status_code}: {detail}")
+
+
+def get_search_params(search_request: Optional[SearchRequest]) -> dict[str, str]:
+    """Convert a :class:`~scim2_models.SearchRequest` to query string parameters."""
+    if search_request is None:
+        return {}
+
+    payload = search_request.model_dump(scim_ctx=Context.SEARCH_REQUEST)
+    payload.pop("schemas", None)
+    return {
+        key: ",".join(value) if isinstance(value, list) else str(value)
+        for key, value in payload.items()
+    }
+
+
+class AsyncSCIMClient:
+    """Asynchronous SCIM client, that builds requests from models and validates responses.
+
+    Resource classes are mapped to their endpoints with
+    :class:`~scim2_models.ResourceType` objects, by default built with
+    :meth:`ResourceType.from_resource <scim2_models.ResourceType.from_resource>`
+    or retrieved from the server with :meth:`~scim2_models.AsyncSCIMClient.discover`.
+    Payloads are dumped and validated in the :class:`~scim2_models.Context`
+    matching each operation.
+
+    .. code-block:: python
+
+        async with AsyncSCIMClient(transport, [User[EnterpriseUser], Group]) as client:
+            user = await client.create(User(user_name="bjensen"))
+            async for group in client.iter_resources(Group):
+                ...
+
+    The HTTP requests are sent by a :class:`~scim2_models.Transport`, so
+    the connection pooling is handled by the HTTP library.
+
+    :param transport: The transport sending the requests.
+    :param resource_types: The resource classes handled by the client.
+    :param resource_type_definitions: The :class:`~scim2_models.ResourceType`
+        of the resource classes. Missing ones are built from the classes.
+    :param max_concurrency: The maximum number of requests sent at the same time.
+    """
+
+    def __init__(
+        self,
+        transport: Transport,
+        resource_types: list[type[Resource]],
+        resource_type_definitions: Optional[list[ResourceType]] = None,
+        max_concurrency: int = 10,
+    ):
+        self.transport = transport
+        self.resource_types = list(resource_types)
+        self.schema_index = get_schema_index(self.resource_types)
+        self.max_concurrency = max_concurrency
+        # built on the first request, as python 3.9 semaphores are bound to a loop
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.endpoints: dict[type[Resource], str] = {
+            resource_type: str(ResourceType.from_resource(resource_type).endpoint)
+            for resource_type in self.resource_types
+        }
+        self.set_resource_type_definitions(resource_type_definitions or [])
+
+    async def __aenter__(self) -> "AsyncSCIMClient":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the transport."""
+        await self.transport.aclose()
+
+    def set_resource_type_definitions(
+        self, resource_type_definitions: list[ResourceType]
+    ) -> None:
+        """Use the endpoints of :class:`~scim2_models.ResourceType` objects for the matching resource classes."""
+        for definition in resource_type_definitions:
+            resource_type = get_resource_type(self.schema_index, [definition.schema_])
+            if resource_type and definition.endpoint:
+                self.endpoints[resource_type] = str(definition.endpoint)
+
+    def get_endpoint(self, resource_type: type[Resource]) -> str:
+        """Return the endpoint of a resource class.
+
+        :raises ValueError: If the resource class is not handled by the client.
+        """
+        try:
+            return self.endpoints[resource_type]
+        except KeyError:
+            raise ValueError(
+                f"Unknown resource type '{resource_type.__name__}'"
+            ) from None
+
+    def get_list_response_type(
+        self, resource_types: Optional[list[type[Resource]]] = None
+    ) -> type[ListResponse]:
+        """Return the :class:`~scim2_models.ListResponse` model of some resource classes."""
+        return get_list_response_type(resource_types or self.resource_types)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        expected_statuses: tuple[int, ...],
+        params: Optional[dict[str, str]] = None,
+        payload: Optional[BaseModel] = None,
+        scim_ctx: Optional[Context] = Context.DEFAULT,
+        headers: Optional[dict[str, str]] = None,
+    ) -> TransportResponse:
+        """Send a request with at most :paramref:`~scim2_models.AsyncSCIMClient.max_concurrency` other ones.
+
+        :param payload: The model to send, dumped in the :paramref:`scim_ctx` context.
+        :param headers: Additional request headers.
+        :raises SCIMResponseError: If the response status is not expected.
+        """
+        headers = {"Accept": SCIM_CONTENT_TYPE, **(headers or {})}
+        content = None
+        if payload is not None:
+            content = payload.model_dump_json(scim_ctx=scim_ctx).encode()
+            headers["Content-Type"] = SCIM_CONTENT_TYPE
+
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self.semaphore:
+            response = await self.transport.request(
+                method, url, params=params, content=content, headers=headers
+            )
+
+        if response.status_code not in expected_statuses:
+            raise SCIMResponseError(
+                response.status_code, get_error(response.content), response.content
+            )
+
+        return response
+
+    async def discover(self) -> list[ResourceType]:
+        """Retrieve the :class:`~scim2_models.ResourceType` of the server, and use their endpoints."""
+        response = await self.request("GET", "/ResourceTypes", (200,))
+        list_response = ListResponse[ResourceType].model_validate_json(
+            response.content, scim_ctx=Context.RESOURCE_QUERY_RESPONSE
+        )
+        definitions = list_response.resources or []
+        self.set_resource_type_definitions(definitions)
+        return definitions
+
+    async def create(self, resource: Resource) -> Resource:
+        """Create a resource with a ``POST`` request, and return the created resource."""
+        response = await self.request(
+            "POST",
+            self.get_endpoint(type(resource)),
+            (201,),
+            payload=resource,
+            scim_ctx=Context.RESOURCE_CREATION_REQUEST,
+        )
+        return type(resource).model_validate_json(
+            response.content, scim_ctx=Context.RESOURCE_CREATION_RESPONSE
+        )
+
+    async def query(
+        self,
+        resource_type: Optional[type[Resource]] = None,
+        id: Optional[str] = None,
+        search_request: Optional[SearchRequest] = None,
+    ) -> Union[Resource, ListResponse]:
+        """Retrieve a resource by its id, or list resources with a ``GET`` request.
+
+        :param resource_type: The resource class, or :data:`None` to query
+            all the resource types from the server root.
+        :param id: The id of the resource to retrieve.
+        :param search_request: The filtering, sorting and pagination
+            parameters, sent in the query string.
+        :return: The resource if :paramref:`id` is given, else a :class:`~scim2_models.ListResponse`.
+        """
+        params = get_search_params(search_request)
+        if resource_type is None:
+            response = await self.request("GET", "/", (200,), params=params)
+            return self.get_list_response_type().model_validate_json(
+                response.content, scim_ctx=Context.SEARCH_RESPONSE
+            )
+
+        endpoint = self.get_endpoint(resource_type)
+        if id is None:
+            response = await self.request("GET", endpoint, (200,), params=params)
+            return self.get_list_response_type([resource_type]).model_validate_json(
+                response.content, scim_ctx=Context.RESOURCE_QUERY_RESPONSE
+            )
+
+        response = await self.request("GET", f"{endpoint}/{id}", (200,), params=params)
+        return resource_type.model_validate_json(
+            response.content, scim_ctx=Context.RESOURCE_QUERY_RESPONSE
+        )
+
+    async def search(
+        self,
+        search_request: Optional[SearchRequest] = None,
+        resource_type: Optional[type[Resource]] = None,
+    ) -> ListResponse:
+        """List resources with a ``POST`` request on the ``/.search`` endpoint.
+
+        :param resource_type: The resource class to search, or :data:`None`
+            to search all the resource types from the server root.
+        """
+        endpoint = self.get_endpoint(resource_type) if resource_type else ""
+        response = await self.request(
+            "POST",
+            f"{endpoint}/.search",
+            (200,),
+            payload=search_request or SearchRequest(),
+            scim_ctx=Context.SEARCH_REQUEST,
+        )
+        resource_types = [resource_type] if resource_type else None
+        return self.get_list_response_type(resource_types).model_validate_json(
+            response.content, scim_ctx=Context.SEARCH_RESPONSE
+        )
+
+    async def replace(self, resource: Resource) -> Resource:
+        """Replace a resource with a ``PUT`` request, and return the replaced resource."""
+        response = await self.request(
+            "PUT",
+            f"{self.get_endpoint(type(resource))}/{resource.id}",
+            (200,),
+            payload=resource,
+            scim_ctx=Context.RESOURCE_REPLACEMENT_REQUEST,
+        )
+        return type(resource).model_validate_json(
+            response.content, scim_ctx=Context.RESOURCE_REPLACEMENT_RESPONSE
+        )
+
+    async def modify(
+        self, resource_type: type[Resource], id: str, patch_op: PatchOp
+    ) -> Optional[Resource]:
+        """Modify a resource with a ``PATCH`` request.
+
+        :return: The modified resource, or :data:`None` if the server
+            answered with no content.
+        """
+        response = await self.request(
+            "PATCH",
+            f"{self.get_endpoint(resource_type)}/{id}",
+            (200, 204),
+            payload=patch_op,
+        )
+        if response.status_code == 204:
+            return None
+
+        return resource_type.model_validate_json(
+            response.content, scim_ctx=Context.RESOURCE_QUERY_RESPONSE
+        )
+
+    async def delete(self, resource_type: type[Resource], id: str) -> None:
+        """Delete a resource with a ``DELETE`` request."""
+        await self.request("DELETE", f"{self.get_endpoint(resource_type)}/{id}", (204,))
+
+    async def bulk(self, bulk_request: BulkRequest) -> BulkResponse:
+        """Send a :class:`~scim2_models.BulkRequest` to the ``/Bulk`` endpoint."""
+        response = await self.request("POST", "/Bulk", (200,), payload=bulk_request)
+        return BulkResponse.model_validate_json(response.content)
+
+    async def iter_pages(
+        self,
+        resource_type: Optional[type[Resource]] = None,
+        search_request: Optional[SearchRequest] = None,
+        count: int = 100,
+        prefetch: int = 2,
+    ) -> AsyncIterator[ListResponse]:
+        """Iterate over the pages of a query.
+
+        Once the first page has been received, the next :paramref:`prefetch`
+        pages are requested before each page is yielded, so the requests
+        are pipelined with the processing of the pages. The page offsets are computed
+        from the number of resources of the first page, in case the
+        server returns less resources than :paramref:`count`.
+
+        :param resource_type: The resource class, or :data:`None` to query
+            all the resource types.
+        :param search_request: The filtering and sorting parameters.
+        :param count: The number of resources to request per page.
+        :param prefetch: The number of pages to request in advance, at least 1.
+        """
+        search_request = search_request or SearchRequest()
+        start_index = search_request.start_index or 1
+
+        def fetch(index: int) -> Awaitable[ListResponse]:
+            return self.query(
+                resource_type,
+                search_request=search_request.model_copy(
+                    update={"start_index": index, "count": count}
+                ),
+            )
+
+        page = await fetch(start_index)
+        page_size = len(page.resources or [])
+        # the exclusive end of the 1-based indexes of all the query results
+        end_index = (page.total_results or 0) + 1
+        next_index = start_index + page_size
+        pending: deque[asyncio.Future] = deque()
+        try:
+            while True:
+                while (
+                    page_size
+                    and next_index < end_index
+                    and len(pending) < max(prefetch, 1)
+                ):
+                    pending.append(asyncio.ensure_future(fetch(next_index)))
+                    next_index += page_size
+
+                yield page
+
+                if not pending:
+                    return
+                page = await pending.popleft()
+
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def iter_resources(
+        self,
+        resource_type: Optional[type[Resource]] = None,
+        search_request: Optional[SearchRequest] = None,
+        count: int = 100,
+        prefetch: int = 2,
+    ) -> AsyncIterator[Resource]:
+        """Iterate over the resources of the pages of :meth:`~scim2_models.AsyncSCIMClient.iter_pages`."""
+        async for page in self.iter_pages(
+            resource_type, search_request, count, prefetch
+        ):
+            for resource in page.resources or []:
+                yield resource
+
+
+class ResourceCache:
+    """Cache the resources retrieved by id by an :class:`~scim2_models.AsyncSCIMClient`.
+
+    Concurrent calls to :meth:`~scim2_models.ResourceCache.get` for the
+    same resource share a single request. The validated resources are
+    kept for :paramref:`ttl` seconds, then revalidated with an
+    ``If-None-Match`` request header holding their
+    :attr:`Meta.version <scim2_models.Meta.version>`, so unchanged resources
+    are not downloaded and validated again.
+
+    The resources are returned as read-only :class:`~scim2_models.CompactModel`,
+    shared between the callers. Models that need to be modified can be
+    built with :meth:`CompactModel.to_model <scim2_models.CompactModel.to_model>`.
+    When the cache holds :paramref:`maxsize` resources, the least recently
+    used ones are removed.
+
+    .. code-block:: python
+
+        cache = ResourceCache(client, ttl=30)
+        users = await asyncio.gather(*(cache.get(User, id) for id in member_ids))
+
+    :param client: The client sending the requests.
+    :param ttl: The number of seconds resources are returned without any request.
+    :param maxsize: The maximum number of resources kept in the cache.
+    :param clock: The function returning the current time in seconds.
+    """
+
+    def __init__(
+        self,
+        client: AsyncSCIMClient,
+        ttl: float = 60,
+        maxsize: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.client = client
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.clock = clock
+        self.entries: OrderedDict[
+            tuple[type[Resource], str], tuple[CompactModel, float]
+        ] = OrderedDict()
+        # bumped by the invalidations, so the requests in flight do not store outdated resources
+        self.generation = 0
+        self.in_flight: dict[tuple[type[Resource], str], asyncio.Future] = {}
+        self.waiters: dict[asyncio.Future, int] = {}
+
+    async def get(self, resource_type: type[Resource], id: str) -> CompactModel:
+        """Return a resource from the cache, or retrieve it from the server.
+
+        :raises SCIMResponseError: If the server answers with an error.
+        """
+        key = (resource_type, id)
+        entry = self.entries.get(key)
+        if entry and entry[1] > self.clock():
+            self.entries.move_to_end(key)
+            return entry[0]
+
+        future = self.in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(
+                self.fetch(resource_type, id, entry[0] if entry else None)
+            )
+            self.in_flight[key] = future
+            future.add_done_callback(lambda _: self.forget(key, future))
+
+        # cancelling a caller must not cancel the request shared with the other callers
+        self.waiters[future] = self.waiters.get(future, 0) + 1
+        try:
+            return await asyncio.shield(future)
+        finally:
+            self.waiters[future] -= 1
+            if not self.waiters[future]:
+                del self.waiters[future]
+                # nobody waits for the request anymore
+                if not future.done():
+                    future.cancel()
+                    self.forget(key, future)
+
+    def forget(self, key: tuple[type[Resource], str], future: asyncio.Future) -> None:
+        """Remove a request from the requests in flight, and retrieve its error."""
+        if self.in_flight.get(key) is future:
+            del self.in_flight[key]
+
+        # the error is raised to the callers, if there are still any
+        if future.done() and not future.cancelled():
+            future.exception()
+
+    async def fetch(
+        self,
+        resource_type: type[Resource],
+        id: str,
+        cached: Optional[CompactModel] = None,
+    ) -> CompactModel:
+        """Retrieve a resource, or revalidate the cached one if it has a version."""
+        generation = self.generation
+        headers = {}
+        # the fields of compact models are not known statically
+        meta = getattr(cached, "meta", None)
+        version = meta.version if meta else None
+        if version:
+            headers["If-None-Match"] = version
+
+        response = await self.client.request(
+            "GET",
+            f"{self.client.get_endpoint(resource_type)}/{id}",
+            (200, 304) if version else (200,),
+            headers=headers,
+        )
+        # only resources with a version are revalidated
+        if response.status_code == 304 and cached is not None:
+            resource = cached
+        else:
+            resource = resource_type.model_validate_json(
+                response.content, scim_ctx=Context.RESOURCE_QUERY_RESPONSE
+            ).to_compact()
+
+        if generation == self.generation:
+            self.store((resource_type, id), resource)
+        return resource
+
+    def store(self, key: tuple[type[Resource], str], resource: CompactModel) -> None:
+        """Add a resource to the cache, and remove the least recently used resources if the cache is full."""
+        self.entries[key] = (resource, self.clock() + self.ttl)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, resource_type: type[Resource], id: str) -> None:
+        """Remove a resource from the cache, for instance after it has been modified.
+
+        The requests in flight are not shared with the next callers anymore,
+        and their results are not stored in the cache.
+        """
+        self.generation += 1
+        self.entries.pop((resource_type, id), None)
+        self.in_flight.pop((resource_type, id), None)
+
+    def clear(self) -> None:
+        """Remove all the resources from the cache."""
+        self.generation += 1
+        self.entries.clear()
+        self.in_flight.clear()
+
+
+def get_error(content: bytes) -> Optional[Error]:
+    """Return the :class:`~scim2_models.Error` of a response body, if it contains one."""
+    try:
+        payload = json_loads(content)
+        if not isinstance(payload, dict) or ERROR_SCHEMA not in payload.get(
+            "schemas", []
+        ):
+            return None
+        return Error.model_validate(payload)
+
+    except ValueError:
+        return None
@@ -0,0 +1,237 @@
+"""Compact storage encoding of resources, where attribute names are replaced by integer IDs.
+
+This is a size/CPU trade-off: only the attribute names are encoded, the
+values are kept as is. On the benchmark page of 1000 users, the encoded
+rows are about 17% smaller than the JSON dumps, but encoding is about 28%
+slower, because the dumps are walked again in Python to replace the keys.
+The encoding pays off when storage or transfer size matters more than
+CPU time, like with large collections stored in caches or databases
+billed by volume, and when the payloads mostly hold short values, so the
+attribute names are a large part of them. For payloads with large values,
+or when resources are encoded on every request, plain JSON is preferable.
+"""
+
+import re
+from collections.abc import Iterator
+from itertools import chain
+from typing import Any
+from typing import Optional
+from typing import Union
+
+from .base import Context
+from .json_backend import json_dumps
+from .json_backend import json_loads
+from .ndjson import get_resource_type
+from .ndjson import get_schema_index
+from .rfc7643.resource import Meta
+from .rfc7643.resource import Resource
+from .rfc7643.schema import Attribute
+from .rfc7643.schema import Schema
+
+PATH_SEPARATORS_PATTERN = re.compile(r"[.:]")
+
+COMMON_ATTRIBUTES = ("schemas", "id", "externalId", "meta")
+
+
+def iter_schema_paths(schema: Schema) -> Iterator[tuple[str, Optional[str]]]:
+    """Yield the paths of the attributes and sub-attributes of a schema, and the attribute names."""
+    for attribute in schema.attributes or []:
+        path = f"{schema.id}:{attribute.name}"
+        yield path, attribute.name
+        if attribute.type == Attribute.Type.complex:
+            for sub_attribute in attribute.sub_attributes or []:
+                yield f"{path}.{sub_attribute.name}", sub_attribute.name
+
+
+def iter_common_paths() -> Iterator[tuple[str, Optional[str]]]:
+    """Yield the paths of the attributes shared by all the resources."""
+    for name in COMMON_ATTRIBUTES:
+        yield name, name
+
+    for field in Meta.model_fields.values():
+        yield f"meta.{field.serialization_alias}", field.serialization_alias
+
+
+def iter_resource_paths(
+    resource_type: type[Resource],
+) -> Iterator[tuple[str, Optional[str]]]:
+    """Yield the paths of the attributes of a resource type and of its extensions.
+
+    The schemas themselves are part of the paths, so the
+    :attr:`~scim2_models.Resource.schemas` values can be encoded with IDs.
+    """
+    # the schemas of parametrized resources hold the extensions as attributes
+    origin = resource_type.__pydantic_generic_metadata__["origin"] or resource_type
+    schema = origin.to_schema()
+    yield schema.id, schema.id
+    yield from iter_schema_paths(schema)
+    for schema, extension in resource_type.get_extension_models().items():
+        yield schema, schema
+        yield from iter_schema_paths(extension.to_schema())
+
+
+def get_path_name(path: str, paths: set[str]) -> str:
+    """Guess the name of a table path that is not in the resource types anymore.
+
+    Schema URNs are their own names. They are told apart from the
+    attribute paths, that are prefixed by their schema URN, because the
+    schemas are registered in the table along with their attributes.
+    """
+    schema, _, name = path.rpartition(":")
+    if schema in paths:
+        return PATH_SEPARATORS_PATTERN.split(name)[-1]
+
+    return path if schema else PATH_SEPARATORS_PATTERN.split(path)[-1]
+
+
+class SchemaCodec:
+    """Encode resources as compact structures where attribute names are replaced by integer IDs.
+
+    Each attribute path, like ``urn:ietf:params:scim:schemas:core:2.0:User:name.givenName``,
+    gets a stable ID in a table built from the resource types :class:`~scim2_models.Schema`.
+    The table only grows: when the resource types gain attributes, a new
+    table version is added with the new paths, so rows encoded with
+    older versions can still be decoded. The table should be persisted
+    with the rows, and given back when the codec is built again.
+
+    .. code-block:: python
+
+        codec = SchemaCodec([User[EnterpriseUser], Group], table=load_table())
+        save_table(codec.table)
+        row = codec.dumps(user)
+        user = codec.loads(row)
+
+    Values are kept as is, so the IDs replace the attribute names in
+    the JSON objects of :meth:`~scim2_models.BaseModel.model_dump`, and
+    attributes missing from the table keep their names.
+
+    :param resource_types: The resource types to encode.
+    :param table: The table versions, as returned by :attr:`~scim2_models.SchemaCodec.table`.
+    :param scim_ctx: The SCIM :class:`~scim2_models.Context` of the dumps and of the validations.
+    """
+
+    def __init__(
+        self,
+        resource_types: list[type[Resource]],
+        table: Optional[list[list[str]]] = None,
+        scim_ctx: Optional[Context] = Context.DEFAULT,
+    ):
+        self.schema_index = get_schema_index(resource_types)
+        self.scim_ctx = scim_ctx
+        self.extension_schemas = {
+            schema
+            for resource_type in resource_types
+            for schema in resource_type.get_extension_models()
+        }
+
+        names = dict(
+            chain(
+                iter_common_paths(),
+                *(iter_resource_paths(model) for model in resource_types),
+            )
+        )
+        self.table = [list(version) for version in table or []]
+        known_paths = set(chain.from_iterable(self.table))
+        if new_paths := [path for path in names if path not in known_paths]:
+            self.table.append(new_paths)
+
+        self.paths = list(chain.from_iterable(self.table))
+        self.ids = {path: str(index) for index, path in enumerate(self.paths)}
+        known_paths = set(self.paths)
+        self.names = [
+            names.get(path) or get_path_name(path, known_paths) for path in self.paths
+        ]
+
+    @property
+    def version(self) -> int:
+        """The number of the current table version."""
+        return len(self.table) - 1
+
+    def pack(self, resource: Resource) -> list:
+        """Encode a resource in a ``[version, values]`` list, where the values keys are attribute IDs."""
+        schema = resource.model_fields["schemas"].default[0]
+        values = {}
+        for key, value in resource.model_dump(scim_ctx=self.scim_ctx).items():
+            if key == "schemas":
+                value = [
+                    int(self.ids[urn]) if urn in self.ids else urn for urn in value
+                ]
+
+            path = key if key in COMMON_ATTRIBUTES or ":" in key else f"{schema}:{key}"
+            values[self.get_key(path, key)] = self.pack_value(path, value)
+        return [self.version, values]
+
+    def pack_value(self, path: str, value: Any) -> Any:
+        if isinstance(value, list):
+            return [self.pack_value(path, item) for item in value]
+
+        if not isinstance(value, dict):
+            return value
+
+        separator = ":" if path in self.extension_schemas else "."
+        values = {}
+        for key, sub_value in value.items():
+            sub_path = f"{path}{separator}{key}"
+            values[self.get_key(sub_path, key)] = self.pack_value(sub_path, sub_value)
+        return values
+
+    def get_key(self, path: str, name: str) -> str:
+        """Return the ID of an attribute, or its escaped name if it is not in the table."""
+        if path in self.ids:
+            return self.ids[path]
+
+        return f"~{name}" if name.isdigit() or name.startswith("~") else name
+
+    def unpack(self, row: list) -> Resource:
+        """Decode and validate a resource encoded by :meth:`~scim2_models.SchemaCodec.pack`.
+
+        :raises ValueError: If the row was encoded with a newer table version,
+            or if no resource type matches its schemas.
+        :raises pydantic.ValidationError: If the decoded resource is not valid.
+        """
+        version, values = row
+        if version > self.version:
+            raise ValueError(
+                f"The row was encoded with the table version {version}, "
+                f"but the latest known version is {self.version}"
+            )
+
+        payload = self.unpack_value(values)
+        if schemas := payload.get("schemas"):
+            payload["schemas"] = [
+                self.paths[urn] if isinstance(urn, int) else urn for urn in schemas
+            ]
+
+        resource_type = get_resource_type(self.schema_index, payload.get("schemas"))
+        if resource_type is None:
+            raise ValueError(
+                f"No resource type matching the payload schemas '{payload.get('schemas')}'"
+            )
+
+        return resource_type.model_validate(payload, scim_ctx=self.scim_ctx)
+
+    def unpack_value(self, value: Any) -> Any:
+        if isinstance(value, list):
+            return [self.unpack_value(item) for item in value]
+
+        if not isinstance(value, dict):
+            return value
+
+        return {
+            self.get_name(key): self.unpack_value(item) for key, item in value.items()
+        }
+
+    def get_name(self, key: str) -> str:
+        """Return the name of an attribute from its ID or its escaped name."""
+        if key.isdigit():
+            return self.names[int(key)]
+
+        return key[1:] if key.startswith("~") else key
+
+    def dumps(self, resource: Resource) -> bytes:
+        """Encode a resource in compact JSON, with :func:`~scim2_models.json_dumps`."""
+        return json_dumps(self.pack(resource))
+
+    def loads(self, data: Union[str, bytes]) -> Resource:
+        """Decode and validate a resource encoded by :meth:`~scim2_models.SchemaCodec.dumps`."""
+        return self.unpack(json_loads(data))
@@ -0,0 +1,426 @@
+import operator
+from array import array
+from collections import Counter
+from collections.abc import Iterable
+from collections.abc import Iterator
+from datetime import datetime
+from functools import lru_cache
+from inspect import isclass
+from itertools import compress
+from itertools import repeat
+from typing import Any
+from typing import Callable
+from typing import Generic
+from typing import Optional
+from typing import Union
+from typing import cast
+
+from pydantic import TypeAdapter
+from pydantic import ValidationError
+
+from .base import BaseModel
+from .base import CaseExact
+from .base import Returned
+from .base import extract_schema_and_attribute_base
+from .rfc7643.resource import AnyResource
+from .utils import normalize_attribute_name
+
+TYPECODES = {bool: "b", int: "q", float: "d"}
+
+COERCED_TYPES = (bool, int, float, datetime)
+
+OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "co": operator.contains,
+    "sw": lambda value, operand: value.startswith(operand),
+    "ew": lambda value, operand: value.endswith(operand),
+    "gt": operator.gt,
+    "ge": operator.ge,
+    "lt": operator.lt,
+    "le": operator.le,
+}
+
+
+class Column:
+    """Values of a simple attribute, stored in a typed array when possible, with a null mask."""
+
+    def __init__(
+        self,
+        values: Union[array, list],
+        mask: bytearray,
+        case_exact: bool,
+        attribute_type: Any = None,
+    ):
+        self.values = values
+        self.mask = mask
+        self.case_exact = case_exact
+        self.attribute_type = attribute_type
+        self.is_boolean = isinstance(values, array) and values.typecode == "b"
+        self.folded_values: Optional[list] = None
+
+    @classmethod
+    def build(cls, attribute_type: Any, case_exact: bool, values: list) -> "Column":
+        mask = bytearray(value is not None for value in values)
+        typecode = TYPECODES.get(attribute_type)
+        if typecode:
+            return cls(
+                array(typecode, [0 if value is None else value for value in values]),
+                mask,
+                case_exact,
+                attribute_type,
+            )
+        return cls(values, mask, case_exact, attribute_type)
+
+    def get(self, index: int, include: Optional[dict] = None) -> Any:
+        # simple values have no sub-attributes to include
+        if not self.mask[index]:
+            return None
+        value = self.values[index]
+        return bool(value) if self.is_boolean else value
+
+    def coerce(self, operand: Any) -> Any:
+        """Convert a comparison operand to the type of the column values, like datetimes from strings, when possible."""
+        if (
+            self.attribute_type not in COERCED_TYPES
+            or operand is None
+            or isinstance(operand, self.attribute_type)
+        ):
+            return operand
+
+        try:
+            return get_type_adapter(self.attribute_type).validate_python(operand)
+        except ValidationError:
+            return operand
+
+    def evaluate(self, path: list[str], op: str, operand: Any) -> bytearray:
+        if op == "pr":
+            return self.mask
+
+        operand = self.coerce(operand)
+        values = self.values
+        if isinstance(operand, str) and not self.case_exact:
+            if self.folded_values is None:
+                self.folded_values = [
+                    value.casefold() if isinstance(value, str) else value
+                    for value in values
+                ]
+            values = self.folded_values
+            operand = operand.casefold()
+
+        compare = OPERATORS[op]
+        if op in ("eq", "ne"):
+            # equality comparisons with null values are safe, so they can be
+            # mapped on the whole column without Python level iterations
+            result = map(compare, values, repeat(operand))
+            return bytearray(map(operator.and_, result, self.mask))
+
+        return bytearray(
+            present and safe_compare(compare, value, operand)
+            for value, present in zip(values, self.mask)
+        )
+
+
+class ListColumn:
+    """Values of a multi-valued attribute, stored as a column of items and their offsets."""
+
+    def __init__(
+        self, offsets: array, mask: bytearray, items: Union[Column, "StructColumn"]
+    ):
+        self.offsets = offsets
+        self.mask = mask
+        self.items = items
+        self.owners: Optional[array] = None
+
+    @classmethod
+    def build(cls, attribute_type: Any, case_exact: bool, values: list) -> "ListColumn":
+        offsets = array("q", [0])
+        mask = bytearray()
+        items: list = []
+        for value in values:
+            mask.append(value is not None)
+            if value is not None:
+                items.extend(value)
+            offsets.append(len(items))
+        return cls(offsets, mask, build_item_column(attribute_type, case_exact, items))
+
+    def get(self, index: int, include: Optional[dict] = None) -> Optional[list]:
+        if not self.mask[index]:
+            return None
+        return [
+            self.items.get(item, include)
+            for item in range(self.offsets[index], self.offsets[index + 1])
+        ]
+
+    def evaluate(self, path: list[str], op: str, operand: Any) -> bytearray:
+        """Evaluate a filter on the items, and match the values having at least one matching item."""
+        if self.owners is None:
+            self.owners = array(
+                "q",
+                (
+                    index
+                    for index in range(len(self.mask))
+                    for _ in range(self.offsets[index + 1] - self.offsets[index])
+                ),
+            )
+
+        result = bytearray(len(self.mask))
+        for index in compress(self.owners, self.items.evaluate(path, op, operand)):
+            result[index] = 1
+        return result
+
+
+class StructColumn:
+    """Values of a complex attribute, stored as one column per sub-attribute."""
+
+    def __init__(self, model: type[BaseModel], mask: bytearray, fields: dict):
+        self.model = model
+        self.mask = mask
+        self.fields = fields
+
+    @classmethod
+    def build(cls, model: type[BaseModel], values: list) -> "StructColumn":
+        mask = bytearray(value is not None for value in values)
+        fields = {
+            field_name: build_column(
+                model.get_field_root_type(field_name),
+                model.get_field_multiplicity(field_name),
+                bool(model.get_field_annotation(field_name, CaseExact)),
+                [
+                    None if value is None else value.__dict__[field_name]
+                    for value in values
+                ],
+            )
+            for field_name in model.model_fields
+        }
+        return cls(model, mask, fields)
+
+    def get(self, index: int, include: Optional[dict] = None) -> Optional[BaseModel]:
+        if not self.mask[index]:
+            return None
+
+        values = {}
+        for field_name, column in self.fields.items():
+            if include is not None and field_name not in include:
+                continue
+
+            value = column.get(index, include.get(field_name) if include else None)
+            if value is not None:
+                values[field_name] = value
+        return self.model.model_construct(**values)
+
+    def evaluate(self, path: list[str], op: str, operand: Any) -> bytearray:
+        if not path:
+            if op != "pr":
+                raise ValueError(
+                    f"Complex attributes of '{self.model.__name__}' can only be tested for presence"
+                )
+            return self.mask
+
+        field_name, *sub_path = path
+        return self.fields[field_name].evaluate(sub_path, op, operand)
+
+    def resolve(self, attribute: str) -> list[str]:
+        """Convert an attribute path, as defined in :rfc:`RFC7644 §3.10 <7644#section-3.10>`, in a list of field names."""
+        schema, attribute_base = extract_schema_and_attribute_base(attribute)
+        main_schema = self.model.model_fields["schemas"].default[0]
+        names = [schema] if schema and schema.lower() != main_schema.lower() else []
+        names += attribute_base.split(".") if attribute_base else []
+
+        path = []
+        column: Any = self
+        for name in names:
+            while isinstance(column, ListColumn):
+                column = column.items
+
+            field_name = None
+            if isinstance(column, StructColumn):
+                aliases = {
+                    field.validation_alias: field_name
+                    for field_name, field in column.model.model_fields.items()
+                }
+                field_name = aliases.get(normalize_attribute_name(name))
+
+            if field_name is None:
+                raise ValueError(f"Unknown attribute '{attribute}'")
+
+            path.append(field_name)
+            column = column.fields[field_name]
+        return path
+
+
+@lru_cache
+def get_type_adapter(attribute_type: Any) -> TypeAdapter:
+    return TypeAdapter(attribute_type)
+
+
+def safe_compare(compare: Callable[[Any, Any], bool], value: Any, operand: Any) -> bool:
+    """Compare a value with an operand, values that cannot be compared with the operand do not match."""
+    try:
+        return compare(value, operand)
+    except (TypeError, AttributeError):
+        return False
+
+
+def build_column(
+    attribute_type: Any, multiple: bool, case_exact: bool, values: list
+) -> Union[Column, ListColumn, StructColumn]:
+    """Build the column storing the values of an attribute."""
+    if multiple:
+        return ListColumn.build(attribute_type, case_exact, values)
+
+    return build_item_column(attribute_type, case_exact, values)
+
+
+def build_item_column(
+    attribute_type: Any, case_exact: bool, values: list
+) -> Union[Column, StructColumn]:
+    """Build the column storing the values of a single-valued attribute, or the items of a multi-valued attribute."""
+    if isclass(attribute_type) and issubclass(attribute_type, BaseModel):
+        return StructColumn.build(attribute_type, values)
+
+    return Column.build(attribute_type, case_exact, values)
+
+
+class ResourceTable(Generic[AnyResource]):
+    """Columnar storage for a collection of resources of a same model.
+
+    Each attribute is stored in its own column, possibly as a typed
+    :class:`array.array`, along with a null mask. Complex attributes are
+    stored as one column per sub-attribute, and multi-valued attributes
+    store the values of all the items in a single column, with the
+    offsets of the items of each resource.
+    Scanning a column to filter resources is then much faster than
+    reading the attributes of each resource model.
+
+    .. code-block:: python
+
+        table = ResourceTable(users)
+        active_users = table.where("active", "eq", True)
+        departments = active_users.count_by(
+            "urn:ietf:params:scim:schemas:extension:enterprise:2.0:User:department"
+        )
+        users = active_users.where("emails.value", "ew", "@example.com").to_resources(
+            attributes=["userName"]
+        )
+
+    :param resources: The resources to store. They must all be instances of the same model.
+    """
+
+    def __init__(
+        self,
+        resources: Iterable[AnyResource],
+        model: Optional[type[AnyResource]] = None,
+    ):
+        resources = list(resources)
+        if model is None:
+            if not resources:
+                raise ValueError("An empty ResourceTable needs a model")
+            model = type(resources[0])
+
+        for resource in resources:
+            if type(resource) is not model:
+                raise TypeError(
+                    f"Cannot store a '{type(resource).__name__}' in a '{model.__name__}' table"
+                )
+
+        self.model = model
+        self.root = StructColumn.build(model, resources)
+        self.rows: list[int] = list(range(len(resources)))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[AnyResource]:
+        return iter(self.to_resources())
+
+    def view(self, rows: list[int]) -> "ResourceTable[AnyResource]":
+        """Return a table sharing the columns of this table, restricted to some rows."""
+        table = object.__new__(type(self))
+        table.model = self.model
+        table.root = self.root
+        table.rows = rows
+        return table
+
+    def evaluate(self, attribute: str, op: str, value: Any = None) -> bytearray:
+        """Evaluate a comparison on every stored resource, and return a mask of the matching resources.
+
+        :param attribute: The attribute path, e.g. ``emails.value``.
+        :param op: A comparison operator as defined in :rfc:`RFC7644 §3.4.2.2 <7644#section-3.4.2.2>`,
+            i.e. ``eq``, ``ne``, ``co``, ``sw``, ``ew``, ``gt``, ``ge``, ``lt``, ``le`` or ``pr``.
+            String comparisons are case-insensitive unless the attribute is
+            annotated with :attr:`CaseExact.true <scim2_models.CaseExact.true>`.
+            Multi-valued attributes match if one of their values match.
+        :param value: The value to compare the attribute values with.
+            It is converted to the attribute type when possible, so for
+            instance dates can be given as ISO 8601 strings. Values that
+            cannot be compared with it do not match.
+        """
+        op = op.lower()
+        if op != "pr" and op not in OPERATORS:
+            raise ValueError(f"Unknown comparison operator '{op}'")
+        return self.root.evaluate(self.root.resolve(attribute), op, value)
+
+    def where(
+        self, attribute: str, op: str, value: Any = None
+    ) -> "ResourceTable[AnyResource]":
+        """Return a table restricted to the resources matching a comparison.
+
+        See :meth:`~scim2_models.ResourceTable.evaluate` for the parameters.
+        Several calls can be chained to combine comparisons with ``and``.
+        """
+        mask = self.evaluate(attribute, op, value)
+        return self.view([row for row in self.rows if mask[row]])
+
+    def values(self, attribute: str) -> list[Any]:
+        """Return the values of an attribute for every resource of the table."""
+        column: Any = self.root
+        for field_name in self.root.resolve(attribute):
+            if isinstance(column, ListColumn):
+                raise ValueError(
+                    f"Cannot read '{attribute}' values across a multi-valued attribute"
+                )
+            column = column.fields[field_name]
+
+        return [column.get(row) for row in self.rows]
+
+    def count_by(self, attribute: str) -> Counter:
+        """Count the resources of the table by the values of an attribute.
+
+        Resources without a value for the attribute are counted under :data:`None`.
+        """
+        return Counter(
+            tuple(value) if isinstance(value, list) else value
+            for value in self.values(attribute)
+        )
+
+    def to_resources(self, attributes: Optional[list[str]] = None) -> list[AnyResource]:
+        """Build back the resources of the table.
+
+        :param attributes: If set, only those attributes are built, along
+            with the ``schemas`` and the attributes annotated with
+            :attr:`Returned.always <scim2_models.Returned.always>`.
+        """
+        include: Optional[dict[str, Any]] = None
+        if attributes is not None:
+            include = {
+                field_name: None
+                for field_name in self.model.model_fields
+                if field_name == "schemas"
+                or self.model.get_field_annotation(field_name, Returned)
+                == Returned.always
+            }
+            for attribute in attributes:
+                node = include
+                *parents, leaf = self.root.resolve(attribute)
+                for field_name in parents:
+                    if field_name in node and node[field_name] is None:
+                        break
+                    node = node.setdefault(field_name, {})
+                else:
+                    node[leaf] = None
+
+        # the rows hold resources, so their values are never null
+        return cast(
+            list[AnyResource], [self.root.get(row, include) for row in self.rows]
+        )
@@ -0,0 +1,86 @@
+from collections import namedtuple
+from typing import TYPE_CHECKING
+from typing import Any
+
+if TYPE_CHECKING:
+    from .base import BaseModel
+
+
+class CompactModel(tuple):
+    """Base class of the compact, read-only representations of models.
+
+    Compact models are tuples holding the model field values, built with
+    :meth:`BaseModel.to_compact <scim2_models.BaseModel.to_compact>`.
+    They have no per-instance dictionary, and their complex attributes
+    and multi-valued attributes are stored as compact models and tuples,
+    so they are much lighter than pydantic models.
+    Field values can be read as attributes, and the compact models can
+    be converted back with :meth:`~scim2_models.CompactModel.to_model`.
+    """
+
+    __slots__ = ()
+
+    _model: type["BaseModel"]
+    _fields: tuple[str, ...]
+
+    def __reduce__(self):
+        return build_compact_model, (self._model, tuple(self))
+
+    def to_model(self) -> "BaseModel":
+        """Build the pydantic model instance represented by this compact model.
+
+        The values are not validated again.
+        """
+        values = {
+            field_name: expand_value(value)
+            for field_name, value in zip(self._fields, self)
+            if value is not None
+        }
+        return self._model.model_construct(**values)
+
+    def model_dump(self, *args, **kwargs) -> dict[str, Any]:
+        """Dump the model with :meth:`BaseModel.model_dump <scim2_models.BaseModel.model_dump>`."""
+        return self.to_model().model_dump(*args, **kwargs)
+
+    def model_dump_json(self, *args, **kwargs) -> str:
+        """Dump the model with :meth:`BaseModel.model_dump_json <scim2_models.BaseModel.model_dump_json>`."""
+        return self.to_model().model_dump_json(*args, **kwargs)
+
+
+def make_compact_model(model: type["BaseModel"]) -> type[CompactModel]:
+    """Build the compact model class of a pydantic model class."""
+    fields = namedtuple("CompactFields", model.model_fields)  # type: ignore[misc]
+    return type(
+        f"Compact{model.__name__}",
+        (fields, CompactModel),
+        {"__slots__": (), "__module__": model.__module__, "_model": model},
+    )
+
+
+def build_compact_model(model: type["BaseModel"], values: tuple) -> CompactModel:
+    """Build a compact model from its values, used for unpickling."""
+    return tuple.__new__(model.get_compact_model(), values)
+
+
+def compact_value(value: Any) -> Any:
+    """Convert a field value for a compact model."""
+    from .base import BaseModel
+
+    if isinstance(value, list):
+        return tuple(compact_value(item) for item in value)
+
+    if isinstance(value, BaseModel):
+        return value.to_compact()
+
+    return value
+
+
+def expand_value(value: Any) -> Any:
+    """Convert a compact model field value back for a pydantic model."""
+    if isinstance(value, CompactModel):
+        return value.to_model()
+
+    if isinstance(value, tuple):
+        return [expand_value(item) for item in value]
+
+    return value
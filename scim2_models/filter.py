@@ -0,0 +1,318 @@
+import json
+import re
+from collections.abc import Iterator
+from functools import lru_cache
+from inspect import isclass
+from typing import Any
+from typing import Optional
+from typing import Union
+
+from .base import BaseModel
+from .base import CaseExact
+from .base import extract_schema_and_attribute_base
+from .rfc7643.resource import Resource
+from .utils import normalize_attribute_name
+
+COMPARISON_OPERATORS = ("eq", "ne", "co", "sw", "ew", "gt", "ge", "lt", "le")
+
+TOKEN_PATTERN = re.compile(
+    r'\s*(?:(?P<string>"(?:[^"\\]|\\.)*")|(?P<symbol>[()\[\]])|(?P<word>[^\s()\[\]"]+))'
+)
+
+Filter = tuple
+"""A parsed filter expression, as returned by :func:`parse_filter`."""
+
+
+def parse_filter(filter: str) -> Filter:
+    """Parse a filter as defined in :rfc:`RFC7644 §3.4.2.2 <7644#section-3.4.2.2>`.
+
+    The expressions are nested tuples:
+
+    - ``("and", left, right)``, ``("or", left, right)`` and ``("not", expression)``
+      for logical expressions;
+    - ``(op, attribute, value)`` for comparisons, where *op* is a
+      lowercased comparison operator, or ``"pr"`` with a :data:`None` value;
+    - ``("[]", attribute, expression)`` for value paths, like ``emails[type eq "work"]``.
+
+    :raises ValueError: If the filter syntax is invalid.
+    """
+    tokens = list(tokenize(filter))
+    expression, position = parse_or(tokens, 0)
+    if position < len(tokens):
+        raise ValueError(f"Unexpected '{tokens[position][1]}' in filter '{filter}'")
+    return expression
+
+
+def tokenize(filter: str) -> Iterator[tuple[str, Any]]:
+    """Split a filter in ``(kind, value)`` tokens."""
+    position = 0
+    filter = filter.rstrip()
+    while position < len(filter):
+        match = TOKEN_PATTERN.match(filter, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Invalid filter '{filter}'")
+
+        position = match.end()
+        if match["string"]:
+            yield "value", json.loads(match["string"])
+        elif match["symbol"]:
+            yield "symbol", match["symbol"]
+        else:
+            yield "word", match["word"]
+
+
+def is_keyword(tokens: list, position: int, keyword: str) -> bool:
+    return (
+        position < len(tokens)
+        and tokens[position][0] == "word"
+        and tokens[position][1].lower() == keyword
+    )
+
+
+def expect_symbol(tokens: list, position: int, symbol: str) -> int:
+    if position >= len(tokens) or tokens[position] != ("symbol", symbol):
+        raise ValueError(f"Expected '{symbol}' in filter")
+    return position + 1
+
+
+def parse_or(tokens: list, position: int) -> tuple[Filter, int]:
+    expression, position = parse_and(tokens, position)
+    while is_keyword(tokens, position, "or"):
+        right, position = parse_and(tokens, position + 1)
+        expression = ("or", expression, right)
+    return expression, position
+
+
+def parse_and(tokens: list, position: int) -> tuple[Filter, int]:
+    expression, position = parse_not(tokens, position)
+    while is_keyword(tokens, position, "and"):
+        right, position = parse_not(tokens, position + 1)
+        expression = ("and", expression, right)
+    return expression, position
+
+
+def parse_not(tokens: list, position: int) -> tuple[Filter, int]:
+    if not is_keyword(tokens, position, "not"):
+        return parse_atom(tokens, position)
+
+    position = expect_symbol(tokens, position + 1, "(")
+    expression, position = parse_or(tokens, position)
+    return ("not", expression), expect_symbol(tokens, position, ")")
+
+
+def parse_atom(tokens: list, position: int) -> tuple[Filter, int]:
+    if position >= len(tokens):
+        raise ValueError("Unexpected end of filter")
+
+    kind, value = tokens[position]
+    if (kind, value) == ("symbol", "("):
+        expression, position = parse_or(tokens, position + 1)
+        return expression, expect_symbol(tokens, position, ")")
+
+    if kind != "word":
+        raise ValueError(f"Expected an attribute in filter, got '{value}'")
+
+    attribute = value
+    position += 1
+    if position < len(tokens) and tokens[position] == ("symbol", "["):
+        expression, position = parse_or(tokens, position + 1)
+        return ("[]", attribute, expression), expect_symbol(tokens, position, "]")
+
+    if is_keyword(tokens, position, "pr"):
+        return ("pr", attribute, None), position + 1
+
+    if position >= len(tokens) or tokens[position][0] != "word":
+        raise ValueError(f"Expected an operator after '{attribute}' in filter")
+
+    op = tokens[position][1].lower()
+    if op not in COMPARISON_OPERATORS:
+        raise ValueError(f"Unknown comparison operator '{op}'")
+
+    if position + 1 >= len(tokens) or tokens[position + 1][0] == "symbol":
+        raise ValueError(f"Expected a value after '{attribute} {op}' in filter")
+
+    kind, value = tokens[position + 1]
+    if kind == "word":
+        try:
+            value = json.loads(value)
+        except ValueError:
+            raise ValueError(f"Invalid value '{value}' in filter") from None
+    return (op, attribute, value), position + 2
+
+
+def get_payload_values(
+    payload: dict, attribute: str, model: Optional[type[BaseModel]] = None
+) -> list[Any]:
+    """Return the values of an attribute path in a payload, with the multi-valued attributes flattened.
+
+    Attribute names are case-insensitive, and can be prefixed by a schema.
+    Paths prefixed by an extension schema have no values if the payload
+    does not hold the extension.
+
+    :param model: The model of the payload, that tells its resource
+        schema. By default, the resource schema is the first payload schema.
+    """
+    schema, attribute_base = extract_schema_and_attribute_base(attribute)
+    values: list[Any] = [payload]
+    if schema:
+        if (key := find_key(payload, schema)) is not None:
+            values = [payload[key]]
+        elif schema.lower() != get_resource_schema(payload, model).lower():
+            return []
+
+    for name in attribute_base.split("."):
+        next_values = []
+        for value in values:
+            if isinstance(value, dict) and (key := find_key(value, name)) is not None:
+                item = value[key]
+                next_values.extend(item if isinstance(item, list) else [item])
+        values = next_values
+    return [value for value in values if value is not None]
+
+
+def get_resource_schema(payload: dict, model: Optional[type[BaseModel]] = None) -> str:
+    """Return the schema of the resource of a payload."""
+    if model is not None and "schemas" in model.model_fields:
+        return model.model_fields["schemas"].default[0]
+
+    schemas = payload.get("schemas")
+    return schemas[0] if isinstance(schemas, list) and schemas else ""
+
+
+def find_key(payload: dict, name: str) -> Union[str, None]:
+    """Return the key of a payload matching a case-insensitive attribute name."""
+    if name in payload:
+        return name
+
+    lower_name = name.lower()
+    return next((key for key in payload if key.lower() == lower_name), None)
+
+
+# without pydantic, mypy does not know that models are hashable, so the calls ignore the argument types
+@lru_cache(maxsize=1024)
+def find_field(
+    model: Optional[type[BaseModel]], attribute: str
+) -> tuple[Optional[type[BaseModel]], Optional[str]]:
+    """Return the model and the field name of an attribute path, or :data:`None` if they are unknown."""
+    schema, attribute_base = extract_schema_and_attribute_base(attribute)
+    if schema and isclass(model) and issubclass(model, Resource):
+        model = next(
+            (
+                extension
+                for extension_schema, extension in model.get_extension_models().items()
+                if extension_schema.lower() == schema.lower()
+            ),
+            model,
+        )
+
+    field_name = None
+    for name in attribute_base.split("."):
+        if model is not None and field_name is not None:
+            model = model.get_field_root_type(field_name)
+        if not isclass(model) or not issubclass(model, BaseModel):
+            return None, None
+
+        alias = normalize_attribute_name(name)
+        field_name = next(
+            (
+                field_name
+                for field_name, field in model.model_fields.items()
+                if field.validation_alias == alias
+            ),
+            None,
+        )
+        if field_name is None:
+            return None, None
+
+    return model, field_name
+
+
+def is_case_exact(model: Optional[type[BaseModel]], attribute: str) -> bool:
+    """Indicate whether an attribute path is annotated with :attr:`CaseExact.true <scim2_models.CaseExact.true>`."""
+    model, field_name = find_field(model, attribute)  # type: ignore[arg-type]
+    if model is None or field_name is None:
+        return False
+
+    return bool(model.get_field_annotation(field_name, CaseExact))
+
+
+def compare(op: str, value: Any, operand: Any, case_exact: bool = False) -> bool:
+    """Compare a payload value with a filter operand.
+
+    String comparisons are case-insensitive, unless *case_exact* is
+    true. Other comparisons than equality are only made between strings,
+    or between numbers for ordering operators.
+    """
+    if isinstance(value, str) and isinstance(operand, str):
+        if not case_exact:
+            value, operand = value.casefold(), operand.casefold()
+    elif op != "eq" and (
+        op in ("co", "sw", "ew")
+        or not isinstance(value, (int, float))
+        or not isinstance(operand, (int, float))
+    ):
+        return False
+
+    if op == "eq":
+        return value == operand
+    if op == "co":
+        return operand in value
+    if op == "sw":
+        return value.startswith(operand)
+    if op == "ew":
+        return value.endswith(operand)
+    if op == "gt":
+        return value > operand
+    if op == "ge":
+        return value >= operand
+    if op == "lt":
+        return value < operand
+    return value <= operand
+
+
+def match_filter(
+    expression: Filter, payload: dict, model: Optional[type[BaseModel]] = None
+) -> bool:
+    """Indicate whether a JSON payload matches a filter parsed by :func:`parse_filter`.
+
+    :param model: The model of the payload, if it is known. Its
+        :class:`~scim2_models.CaseExact` annotations are honored.
+    """
+    kind = expression[0]
+    if kind == "and":
+        return match_filter(expression[1], payload, model) and match_filter(
+            expression[2], payload, model
+        )
+
+    if kind == "or":
+        return match_filter(expression[1], payload, model) or match_filter(
+            expression[2], payload, model
+        )
+
+    if kind == "not":
+        return not match_filter(expression[1], payload, model)
+
+    _, attribute, operand = expression
+    values = get_payload_values(payload, attribute, model)
+    if kind == "[]":
+        field_model, field_name = find_field(model, attribute)  # type: ignore[arg-type]
+        sub_model = (
+            field_model.get_field_root_type(field_name)
+            if field_model and field_name
+            else None
+        )
+        if not isclass(sub_model) or not issubclass(sub_model, BaseModel):
+            sub_model = None
+        return any(
+            isinstance(value, dict) and match_filter(operand, value, sub_model)
+            for value in values
+        )
+
+    if kind == "pr":
+        return any(value not in ("", [], {}) for value in values)
+
+    case_exact = is_case_exact(model, attribute)
+    if kind == "ne":
+        return not any(compare("eq", value, operand, case_exact) for value in values)
+
+    return any(compare(kind, value, operand, case_exact) for value in values)
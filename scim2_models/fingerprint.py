@@ -0,0 +1,198 @@
+import os
+import sqlite3
+from collections.abc import Iterable
+from collections.abc import Iterator
+from itertools import islice
+from typing import Optional
+from typing import Union
+
+from .rfc7643.resource import Resource
+
+
+class FingerprintStore:
+    """Persistent store of resources content hashes, used to detect the resources that changed between two synchronizations.
+
+    The hashes are computed with :meth:`~scim2_models.BaseModel.get_content_hash`
+    and stored in a SQLite database, keyed by resource :attr:`~scim2_models.Resource.id`.
+
+    .. code-block:: python
+
+        with FingerprintStore("fingerprints.sqlite", namespace="User") as store:
+            for resource_id, user in store.changes(users):
+                if user is None:
+                    delete(resource_id)
+                else:
+                    replace(user)
+
+    :param path: The path of the SQLite database, or ``:memory:``.
+    :param namespace: The name of the resource collection, so several
+        collections, like users and groups, can be kept in the same database.
+    :param batch_size: The number of resources looked up at once in the database.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike] = ":memory:",
+        namespace: str = "default",
+        batch_size: int = 500,
+    ):
+        self.namespace = namespace
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(path, isolation_level=None)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints ("
+            "namespace TEXT NOT NULL, "
+            "id TEXT NOT NULL, "
+            "hash BLOB NOT NULL, "
+            "last_modified TEXT, "
+            "PRIMARY KEY (namespace, id))"
+        )
+        self.connection.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS seen (id TEXT PRIMARY KEY)"
+        )
+
+    def __enter__(self) -> "FingerprintStore":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        (count,) = self.connection.execute(
+            "SELECT COUNT(*) FROM fingerprints WHERE namespace = ?", (self.namespace,)
+        ).fetchone()
+        return count
+
+    def __contains__(self, resource_id: str) -> bool:
+        return self.get_fingerprint(resource_id) is not None
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.connection.close()
+
+    def get_fingerprint(self, resource_id: str) -> Optional[bytes]:
+        """Return the stored content hash of a resource, or :data:`None` if the resource is unknown."""
+        row = self.connection.execute(
+            "SELECT hash FROM fingerprints WHERE namespace = ? AND id = ?",
+            (self.namespace, resource_id),
+        ).fetchone()
+        return row[0] if row else None
+
+    def changes(
+        self, resources: Iterable[Resource]
+    ) -> Iterator[tuple[str, Optional[Resource]]]:
+        """Yield the resources that are new or have changed since the previous call, and the resources that have been deleted.
+
+        Changed resources are yielded as ``(id, resource)`` tuples as
+        they are read from *resources*, and when all the *resources* have
+        been read, the deleted resources are yielded as ``(id, None)`` tuples.
+
+        The resources are compared with their strict
+        :meth:`~scim2_models.BaseModel.get_content_hash`, so case changes
+        and modifications of the attributes that are never returned are detected.
+        Resources with a :attr:`Meta.last_modified <scim2_models.Meta.last_modified>`
+        value equal to the stored one are considered unchanged without
+        computing their content hash.
+
+        The store is updated in a single transaction once the generator
+        is exhausted, so no transaction is held while the changes are
+        processed. If the generator is not consumed entirely, the store
+        is left untouched.
+
+        :param resources: All the resources of the collection. They must have an :attr:`~scim2_models.Resource.id`.
+        """
+        self.connection.execute("DELETE FROM seen")
+        updates: dict[str, tuple[bytes, Optional[str]]] = {}
+        iterator = iter(resources)
+        while batch := list(islice(iterator, self.batch_size)):
+            yield from self.update_batch(batch, updates)
+
+        deleted = self.get_unseen()
+        for resource_id in deleted:
+            yield resource_id, None
+
+        self.save(updates, deleted)
+
+    def update_batch(
+        self,
+        resources: list[Resource],
+        updates: dict[str, tuple[bytes, Optional[str]]],
+    ) -> Iterator[tuple[str, Resource]]:
+        """Compare a batch of resources with the stored hashes.
+
+        :param updates: The hashes and modification dates to store, by resource id.
+        """
+        ids = []
+        for resource in resources:
+            if resource.id is None:
+                raise ValueError(f"Resource {resource!r} has no id")
+            ids.append(resource.id)
+
+        placeholders = ", ".join("?" * len(ids))
+        stored = {
+            resource_id: (content_hash, last_modified)
+            for resource_id, content_hash, last_modified in self.connection.execute(
+                "SELECT id, hash, last_modified FROM fingerprints "
+                f"WHERE namespace = ? AND id IN ({placeholders})",
+                (self.namespace, *ids),
+            )
+        }
+        stored.update(
+            (resource_id, updates[resource_id])
+            for resource_id in ids
+            if resource_id in updates
+        )
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO seen VALUES (?)", ((id,) for id in ids)
+        )
+
+        for resource_id, resource in zip(ids, resources):
+            last_modified = (
+                resource.meta.last_modified.isoformat()
+                if resource.meta and resource.meta.last_modified
+                else None
+            )
+            stored_hash, stored_last_modified = stored.get(resource_id, (None, None))
+            if last_modified is not None and last_modified == stored_last_modified:
+                continue
+
+            content_hash = resource.get_content_hash(strict=True)
+            if content_hash != stored_hash:
+                yield resource_id, resource
+
+            if content_hash != stored_hash or last_modified != stored_last_modified:
+                updates[resource_id] = stored[resource_id] = (
+                    content_hash,
+                    last_modified,
+                )
+
+    def get_unseen(self) -> list[str]:
+        """Return the ids of the resources that have not been seen during the synchronization."""
+        return [
+            resource_id
+            for (resource_id,) in self.connection.execute(
+                "SELECT id FROM fingerprints WHERE namespace = ? "
+                "AND id NOT IN (SELECT id FROM seen)",
+                (self.namespace,),
+            )
+        ]
+
+    def save(
+        self,
+        updates: dict[str, tuple[bytes, Optional[str]]],
+        deleted: list[str],
+    ) -> None:
+        """Store the updated hashes and remove the deleted resources, in a single transaction."""
+        self.connection.execute("BEGIN")
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?, ?)",
+                (
+                    (self.namespace, resource_id, content_hash, last_modified)
+                    for resource_id, (content_hash, last_modified) in updates.items()
+                ),
+            )
+            self.connection.executemany(
+                "DELETE FROM fingerprints WHERE namespace = ? AND id = ?",
+                ((self.namespace, resource_id) for resource_id in deleted),
+            )
@@ -0,0 +1,165 @@
+import json
+from collections import UserString
+from collections.abc import Callable
+from datetime import date
+from datetime import datetime
+from datetime import time
+from enum import Enum
+from typing import Any
+from typing import Optional
+from typing import Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+JSON_BACKENDS = ("orjson", "msgspec", "json")
+"""The supported JSON backends, from the fastest to the slowest."""
+
+
+def encode_default(value: Any) -> Any:
+    """Convert the values that JSON backends cannot serialize natively.
+
+    The conversions follow the pydantic JSON serialization, so the
+    backends produce the same JSON than :meth:`~scim2_models.BaseModel.model_dump_json`.
+    """
+    if isinstance(value, UserString):
+        return str(value)
+
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value).decode()
+
+    if isinstance(value, datetime):
+        iso = value.isoformat()
+        return f"{iso[:-6]}Z" if iso.endswith("+00:00") else iso
+
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+
+    if isinstance(value, Enum):
+        return value.value
+
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(
+        obj, default=encode_default, ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+def orjson_dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj, default=encode_default, option=orjson.OPT_UTC_Z)
+
+
+def is_json_backend_installed(name: str) -> bool:
+    """Indicate whether the library of a JSON backend can be imported."""
+    return {"orjson": orjson, "msgspec": msgspec, "json": json}.get(name) is not None
+
+
+def get_backend_functions(
+    name: str,
+) -> tuple[Callable[[Any], bytes], Callable[[Union[str, bytes]], Any]]:
+    """Return the dumps and loads functions of a backend."""
+    if name == "orjson":
+        if orjson is None:
+            raise ImportError("The 'orjson' JSON backend is not installed")
+        return orjson_dumps, orjson.loads
+
+    if name == "msgspec":
+        if msgspec is None:
+            raise ImportError("The 'msgspec' JSON backend is not installed")
+        encoder = msgspec.json.Encoder(enc_hook=encode_default)
+        decoder = msgspec.json.Decoder()
+
+        def msgspec_loads(data: Union[str, bytes]) -> Any:
+            try:
+                return decoder.decode(data)
+            except msgspec.DecodeError as exc:
+                raise ValueError(str(exc)) from exc
+
+        return encoder.encode, msgspec_loads
+
+    if name == "json":
+        return stdlib_dumps, json.loads
+
+    raise ValueError(
+        f"Unknown JSON backend '{name}', available backends are {', '.join(JSON_BACKENDS)}"
+    )
+
+
+def lazy_dumps(obj: Any) -> bytes:
+    set_json_backend()
+    return BACKEND_DUMPS(obj)
+
+
+def lazy_loads(data: Union[str, bytes]) -> Any:
+    set_json_backend()
+    return BACKEND_LOADS(data)
+
+
+BACKEND_NAME: Optional[str] = None
+BACKEND_DUMPS: Callable[[Any], bytes] = lazy_dumps
+BACKEND_LOADS: Callable[[Union[str, bytes]], Any] = lazy_loads
+
+
+def set_json_backend(name: Optional[str] = None) -> str:
+    """Select the library used by :func:`json_dumps` and :func:`json_loads`.
+
+    Unless this function is called, the fastest installed backend is
+    selected the first time JSON is encoded or parsed.
+
+    :param name: ``"orjson"``, ``"msgspec"``, ``"json"``, or :data:`None` to select
+        the fastest installed backend, falling back to the standard
+        library :mod:`json` module.
+    :return: The name of the selected backend.
+    :raises ValueError: If the backend is unknown.
+    :raises ImportError: If the backend is not installed.
+    """
+    global BACKEND_NAME, BACKEND_DUMPS, BACKEND_LOADS
+
+    if name is None:
+        name = next(
+            backend for backend in JSON_BACKENDS if is_json_backend_installed(backend)
+        )
+
+    BACKEND_DUMPS, BACKEND_LOADS = get_backend_functions(name)
+    BACKEND_NAME = name
+    return name
+
+
+def get_json_backend() -> str:
+    """Return the name of the backend used by :func:`json_dumps` and :func:`json_loads`."""
+    return BACKEND_NAME or set_json_backend()
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Serialize an object to compact UTF-8 JSON bytes with the selected backend.
+
+    This is intended for the results of :meth:`~scim2_models.BaseModel.model_dump`,
+    or for the structures that embed them, for instance in web frameworks
+    responses. Model instances are better dumped with
+    :meth:`~scim2_models.BaseModel.model_dump_json`.
+
+    :class:`~scim2_models.Reference`, :class:`bytes`, datetimes and enums
+    are serialized as pydantic does, so the result does not depend on
+    the backend. The only exception is ``msgspec``, that encodes
+    :class:`bytes` in base64 once more. This only matters for dumps made
+    with ``mode="python"``, where :class:`~scim2_models.utils.Base64Bytes`
+    values are :class:`bytes`.
+    """
+    return BACKEND_DUMPS(obj)
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON with the selected backend.
+
+    :raises ValueError: If the data is not valid JSON.
+    """
+    return BACKEND_LOADS(data)
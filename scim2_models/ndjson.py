@@ -0,0 +1,175 @@
+from collections.abc import Iterable
+from collections.abc import Iterator
+from typing import IO
+from typing import Any
+from typing import Optional
+from typing import Union
+
+from pydantic import ValidationError
+
+from .base import Context
+from .json_backend import json_loads
+from .rfc7643.resource import Resource
+
+
+def get_schema_index(resource_types: list[type[Resource]]) -> dict[str, type[Resource]]:
+    """Map the lowercased main schema of resource types to the resource types."""
+    return {
+        resource_type.model_fields["schemas"].default[0].lower(): resource_type
+        for resource_type in resource_types
+    }
+
+
+def validate_resource_json(
+    payload: Union[str, bytes],
+    schema_index: dict[str, type[Resource]],
+    scim_ctx: Optional[Context] = Context.DEFAULT,
+) -> Resource:
+    """Validate a JSON payload with the resource type matching its first schema.
+
+    When there is a single resource type, the payload is directly
+    validated by :meth:`~scim2_models.BaseModel.model_validate_json`
+    and its schemas are checked afterwards, or when the validation fails.
+
+    :param schema_index: The resource types, as returned by :func:`get_schema_index`.
+    :raises ValueError: If no resource type matches the payload schemas.
+    :raises pydantic.ValidationError: If the payload is not a valid resource
+        of the resource type matching its schemas.
+    """
+    if len(schema_index) == 1:
+        (resource_type,) = schema_index.values()
+        try:
+            resource = resource_type.model_validate_json(payload, scim_ctx=scim_ctx)
+        except ValidationError:
+            schemas = get_json_schemas(payload)
+            if schemas is None or get_resource_type(schema_index, schemas):
+                raise
+        else:
+            schemas = resource.schemas
+            if get_resource_type(schema_index, schemas):
+                return resource
+
+    else:
+        obj = json_loads(payload)
+        schemas = obj.get("schemas") if isinstance(obj, dict) else None
+        if model := get_resource_type(schema_index, schemas):
+            return model.model_validate(obj, scim_ctx=scim_ctx)
+
+    raise ValueError(f"No resource type matching the payload schemas '{schemas}'")
+
+
+def get_json_schemas(payload: Union[str, bytes]) -> Any:
+    """Return the schemas of a JSON payload, or :data:`None` if the payload has no schemas."""
+    try:
+        obj = json_loads(payload)
+    except ValueError:
+        return None
+    return obj.get("schemas") if isinstance(obj, dict) else None
+
+
+def get_resource_type(
+    schema_index: dict[str, type[Resource]], schemas: Any
+) -> Optional[type[Resource]]:
+    """Return the resource type matching the first schema of a payload."""
+    if not isinstance(schemas, list) or not schemas or not isinstance(schemas[0], str):
+        return None
+
+    return schema_index.get(schemas[0].lower())
+
+
+class NDJSONWriter:
+    """Write resources in a newline-delimited JSON stream.
+
+    Each resource is dumped with :meth:`~scim2_models.BaseModel.model_dump_json`
+    and written on its own line as soon as it is received, so exports
+    of large collections use a constant amount of memory.
+
+    .. code-block:: python
+
+        with open("users.ndjson", "wb") as fd:
+            NDJSONWriter(fd).write_many(iter_users())
+
+    :param fd: A binary file object.
+    :param scim_ctx: The SCIM :class:`~scim2_models.Context` of the dumps.
+    :param attributes: The attributes to include in the dumps.
+    :param excluded_attributes: The attributes to exclude from the dumps.
+    """
+
+    def __init__(
+        self,
+        fd: IO[bytes],
+        scim_ctx: Optional[Context] = Context.DEFAULT,
+        attributes: Optional[list[str]] = None,
+        excluded_attributes: Optional[list[str]] = None,
+    ):
+        self.fd = fd
+        self.scim_ctx = scim_ctx
+        self.attributes = attributes
+        self.excluded_attributes = excluded_attributes
+
+    def write(self, resource: Resource) -> None:
+        """Write a resource on a new line."""
+        line = resource.model_dump_json(
+            scim_ctx=self.scim_ctx,
+            attributes=self.attributes,
+            excluded_attributes=self.excluded_attributes,
+        )
+        self.fd.write(f"{line}\n".encode())
+
+    def write_many(self, resources: Iterable[Resource]) -> int:
+        """Write resources as they are read from an iterable.
+
+        :return: The number of written resources.
+        """
+        count = 0
+        for resource in resources:
+            self.write(resource)
+            count += 1
+        return count
+
+
+class NDJSONReader:
+    """Read resources from a newline-delimited JSON stream.
+
+    Each line is validated with the resource type matching its
+    :attr:`~scim2_models.Resource.schemas`, and the resources are
+    yielded as the lines are read. Blank lines are ignored.
+
+    .. code-block:: python
+
+        with open("resources.ndjson", "rb") as fd:
+            for resource in NDJSONReader(fd, [User[EnterpriseUser], Group]):
+                ...
+
+    :param fd: A file object, or any iterable of JSON lines.
+    :param resource_types: The resource types of the stream.
+    :param scim_ctx: The SCIM :class:`~scim2_models.Context` in which the validation happens.
+    :raises ValueError: If a line does not match any resource type.
+    :raises pydantic.ValidationError: If a line is not a valid resource.
+    """
+
+    def __init__(
+        self,
+        fd: Iterable[Union[str, bytes]],
+        resource_types: list[type[Resource]],
+        scim_ctx: Optional[Context] = Context.DEFAULT,
+    ):
+        self.fd = fd
+        self.schema_index = get_schema_index(resource_types)
+        self.scim_ctx = scim_ctx
+
+    def __iter__(self) -> Iterator[Resource]:
+        for line_number, line in enumerate(self.fd, start=1):
+            if not line.strip():
+                continue
+
+            try:
+                resource = validate_resource_json(
+                    line, self.schema_index, self.scim_ctx
+                )
+            except ValidationError:
+                raise
+            except ValueError as exc:
+                raise ValueError(f"Line {line_number}: {exc}") from exc
+
+            yield resource
@@ -0,0 +1,260 @@
+import io
+import os
+import pickle
+from collections import deque
+from collections.abc import Iterable
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from inspect import isclass
+from itertools import islice
+from multiprocessing.context import BaseContext
+from typing import Any
+from typing import Optional
+from typing import Union
+
+from pydantic import ValidationError
+
+from .base import BaseModel
+from .base import Context
+from .ndjson import get_schema_index
+from .ndjson import validate_resource_json
+from .rfc7643.resource import Extension
+from .rfc7643.resource import Resource
+from .rfc7643.schema import Schema
+
+ValidationResult = Union[Resource, str, ValidationError, ValueError]
+
+
+class ModelRegistry:
+    """Picklable registry of resource models, that can be sent to worker processes.
+
+    Models that can be imported are pickled by reference. Dynamic models,
+    built with :meth:`Resource.from_schema <scim2_models.Resource.from_schema>`
+    and :meth:`Extension.from_schema <scim2_models.Extension.from_schema>`,
+    are pickled as their :class:`~scim2_models.Schema` and built again
+    on unpickling.
+
+    The registry also pickles and unpickles model instances, with their
+    classes pickled as registry keys, so instances of dynamic and
+    parametrized models can be exchanged between processes sharing
+    equivalent registries.
+
+    :param resource_types: The resource models.
+    """
+
+    def __init__(self, resource_types: list[type[Resource]]):
+        self.resource_types = list(resource_types)
+        self.definitions = [
+            get_model_definition(model) for model in self.resource_types
+        ]
+        self.schema_index = get_schema_index(self.resource_types)
+        self.classes: dict[str, type[BaseModel]] = {}
+        self.keys: dict[type[BaseModel], str] = {}
+        for index, resource_type in enumerate(self.resource_types):
+            for key, model in iter_models(resource_type, str(index)):
+                self.classes[key] = model
+                self.keys.setdefault(model, key)
+
+    def __reduce__(self):
+        return build_registry, (self.definitions,)
+
+    def dumps(self, obj: Any) -> bytes:
+        """Pickle an object, with the registry models pickled by reference."""
+        buffer = io.BytesIO()
+        RegistryPickler(buffer, self).dump(obj)
+        return buffer.getvalue()
+
+    def loads(self, data: bytes) -> Any:
+        """Unpickle an object pickled by :meth:`~scim2_models.ModelRegistry.dumps` with an equivalent registry."""
+        return RegistryUnpickler(io.BytesIO(data), self).load()
+
+    def validate(
+        self,
+        payload: Union[str, bytes],
+        scim_ctx: Optional[Context] = Context.DEFAULT,
+        dump: bool = False,
+    ) -> ValidationResult:
+        """Validate a JSON payload with the resource model matching its schemas.
+
+        :return: The validated resource, or its JSON dump with
+            :attr:`~scim2_models.Context.DEFAULT` context if :paramref:`dump`
+            is set, or the validation exception.
+        """
+        try:
+            resource = validate_resource_json(payload, self.schema_index, scim_ctx)
+        except (ValidationError, ValueError) as exc:
+            return exc
+
+        return resource.model_dump_json() if dump else resource
+
+
+class RegistryPickler(pickle.Pickler):
+    def __init__(self, file, registry: ModelRegistry):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.registry = registry
+
+    def persistent_id(self, obj: Any) -> Optional[str]:
+        return self.registry.keys.get(obj) if isclass(obj) else None
+
+
+class RegistryUnpickler(pickle.Unpickler):
+    def __init__(self, file, registry: ModelRegistry):
+        super().__init__(file)
+        self.registry = registry
+
+    def persistent_load(self, pid: str) -> type[BaseModel]:
+        return self.registry.classes[pid]
+
+
+def iter_models(
+    model: type[BaseModel], key: str, seen: Optional[set] = None
+) -> Iterator[tuple[str, type[BaseModel]]]:
+    """Yield a model and the models of its complex attributes, with keys that only depend on the model structure."""
+    seen = set() if seen is None else seen
+    if model in seen:
+        return
+
+    seen.add(model)
+    yield key, model
+    for field_name in model.model_fields:
+        attribute_type = model.get_field_root_type(field_name)
+        if isclass(attribute_type) and issubclass(attribute_type, BaseModel):
+            yield from iter_models(attribute_type, f"{key}.{field_name}", seen)
+
+
+def get_model_definition(model: type[Resource]) -> tuple[Any, list[Any]]:
+    """Return a picklable definition of a resource model, that can be built again with :func:`build_model`.
+
+    Models built from a schema are defined by their schema, and the
+    other models are pickled by reference.
+    """
+    origin = model.__pydantic_generic_metadata__["origin"] or model
+    return origin.__dict__.get("_source_schema", origin), [
+        extension.__dict__.get("_source_schema", extension)
+        for extension in model.get_extension_models().values()
+    ]
+
+
+def build_model(definition: tuple[Any, list[Any]]) -> type[Resource]:
+    """Build a resource model from a definition returned by :func:`get_model_definition`."""
+    model, extensions = definition
+    if isinstance(model, Schema):
+        model = Resource.from_schema(model)
+
+    extension_models = tuple(
+        Extension.from_schema(extension) if isinstance(extension, Schema) else extension
+        for extension in extensions
+    )
+    return model[Union[extension_models]] if extension_models else model
+
+
+def build_registry(definitions: list[Any]) -> ModelRegistry:
+    """Build a registry from its model definitions, used for unpickling."""
+    return ModelRegistry([build_model(definition) for definition in definitions])
+
+
+WORKER_REGISTRY: Optional[ModelRegistry] = None
+
+
+def init_worker(registry: ModelRegistry) -> None:
+    """Store the registry of a worker process."""
+    global WORKER_REGISTRY
+    WORKER_REGISTRY = registry
+
+
+def validate_chunk(
+    payloads: list[Union[str, bytes]], scim_ctx: Optional[Context], dump: bool
+) -> bytes:
+    """Validate payloads in a worker process, and pickle the results with the worker registry."""
+    if WORKER_REGISTRY is None:
+        raise RuntimeError(
+            "The worker registry is not initialized, payloads must be validated in ValidationPool workers"
+        )
+
+    return WORKER_REGISTRY.dumps(
+        [WORKER_REGISTRY.validate(payload, scim_ctx, dump) for payload in payloads]
+    )
+
+
+class ValidationPool:
+    """Validate JSON payloads in parallel, in a pool of worker processes.
+
+    Validation of SCIM resources is CPU-bound, so validating large
+    imports across several processes makes them scale with the number
+    of cores. Payloads are sent to the workers by chunks, and the
+    results are returned in order.
+
+    .. code-block:: python
+
+        with ValidationPool([User[EnterpriseUser], Group]) as pool:
+            with open("resources.ndjson", "rb") as fd:
+                for resource in pool.validate(fd):
+                    ...
+
+    The resource models are sent to the workers with a :class:`~scim2_models.ModelRegistry`,
+    so dynamic models built from :class:`~scim2_models.Schema` can be used.
+
+    :param resource_types: The resource models. Payloads are validated
+        with the model matching their :attr:`~scim2_models.Resource.schemas`.
+    :param max_workers: The number of worker processes, by default the number of processors.
+    :param chunk_size: The number of payloads sent at once to a worker.
+    :param mp_context: The :mod:`multiprocessing` context used to start the workers.
+    """
+
+    def __init__(
+        self,
+        resource_types: list[type[Resource]],
+        max_workers: Optional[int] = None,
+        chunk_size: int = 1000,
+        mp_context: Optional[BaseContext] = None,
+    ):
+        self.registry = ModelRegistry(resource_types)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.executor = ProcessPoolExecutor(
+            self.max_workers,
+            mp_context=mp_context,
+            initializer=init_worker,
+            initargs=(self.registry,),
+        )
+
+    def __enter__(self) -> "ValidationPool":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        self.executor.shutdown()
+
+    def validate(
+        self,
+        payloads: Iterable[Union[str, bytes]],
+        scim_ctx: Optional[Context] = Context.DEFAULT,
+        dump: bool = False,
+    ) -> Iterator[ValidationResult]:
+        """Validate JSON payloads, and yield the results in the payloads order.
+
+        The payloads are read as the results are consumed, and only a
+        few chunks per worker are processed at once, so the memory
+        usage does not depend on the number of payloads.
+
+        :param payloads: The JSON payloads, for instance the lines of a NDJSON file.
+        :param scim_ctx: The SCIM :class:`~scim2_models.Context` in which the validation happens.
+        :param dump: Whether to return the JSON dumps of the validated resources,
+            instead of the resources. Sending models back from the workers
+            is almost as expensive as validating them, so dumps are much
+            faster when the resources are stored or sent elsewhere.
+        :return: For each payload, the validated resource, or the :class:`~pydantic.ValidationError`
+            raised by its validation, or a :class:`ValueError` if no resource model matches its schemas.
+        """
+        pending: deque = deque()
+        iterator = iter(payloads)
+        while chunk := list(islice(iterator, self.chunk_size)):
+            pending.append(self.executor.submit(validate_chunk, chunk, scim_ctx, dump))
+            if len(pending) >= 2 * self.max_workers:
+                yield from self.registry.loads(pending.popleft().result())
+
+        while pending:
+            yield from self.registry.loads(pending.popleft().result())
@@ -1,4 +1,7 @@
+from collections.abc import Iterable
+from collections.abc import Mapping
 from datetime import datetime
+from types import MappingProxyType
 from typing import Annotated
 from typing import Any
 from typing import Generic
@@ -9,20 +12,29 @@ from typing import get_args
 from typing import get_origin
 
 from pydantic import Field
+from pydantic import ValidationError
+from pydantic import ValidatorFunctionWrapHandler
 from pydantic import WrapSerializer
 from pydantic import field_serializer
+from pydantic_core import SchemaValidator
+from pydantic_core import core_schema
+from typing_extensions import Self
 
 from ..base import BaseModel
 from ..base import BaseModelType
 from ..base import CaseExact
 from ..base import ComplexAttribute
+from ..base import Context
 from ..base import ExternalReference
 from ..base import Mutability
 from ..base import Required
 from ..base import Returned
 from ..base import Uniqueness
 from ..base import URIReference
+from ..base import find_unique_paths
+from ..base import get_model_config
 from ..base import is_complex_attribute
+from ..base import scim_validation_schema
 from ..utils import normalize_attribute_name
 
 
@@ -132,8 +144,20 @@ class ResourceMetaclass(BaseModelType):
                 )
 
         klass = super().__new__(cls, name, bases, attrs, **kwargs)
+        klass._extension_models = MappingProxyType(cls.build_extension_models(klass))
         return klass
 
+    def build_extension_models(klass) -> dict[str, type[Extension]]:
+        """Compute the extension models of a class, indexed by their schemas."""
+        extension_models = klass.__pydantic_generic_metadata__.get("args", [])
+        extension_models = (
+            get_args(extension_models[0])
+            if len(extension_models) == 1 and get_origin(extension_models[0]) == Union
+            else extension_models
+        )
+
+        return {ext.model_fields["schemas"].default[0]: ext for ext in extension_models}
+
 
 class Resource(BaseModel, Generic[AnyExtension], metaclass=ResourceMetaclass):
     schemas: Annotated[list[str], Required.true]
@@ -146,7 +170,11 @@ class Resource(BaseModel, Generic[AnyExtension], metaclass=ResourceMetaclass):
     # https://www.rfc-editor.org/rfc/rfc7643#section-3.1
 
     id: Annotated[
-        Optional[str], Mutability.read_only, Returned.always, Uniqueness.global_
+        Optional[str],
+        Mutability.read_only,
+        Returned.always,
+        Uniqueness.global_,
+        CaseExact.true,
     ] = None
     """A unique identifier for a SCIM resource as defined by the service
     provider.
@@ -177,19 +205,40 @@ class Resource(BaseModel, Generic[AnyExtension], metaclass=ResourceMetaclass):
         setattr(self, item.__name__, value)
 
     @classmethod
-    def get_extension_models(cls) -> dict[str, type[Extension]]:
-        """Return extension a dict associating extension models with their schemas."""
-        extension_models = cls.__pydantic_generic_metadata__.get("args", [])
-        extension_models = (
-            get_args(extension_models[0])
-            if len(extension_models) == 1 and get_origin(extension_models[0]) == Union
-            else extension_models
-        )
+    def is_field_hashed(cls, field_name: str, strict: bool = False) -> bool:
+        """Indicate whether a field is part of the content hash.
+
+        The :attr:`~scim2_models.Resource.meta` attribute describes the
+        resource but not its content, so it is not part of the content hash.
+        """
+        return field_name != "meta" and super().is_field_hashed(field_name, strict)
+
+    def get_etag(self, weak: bool = False) -> str:
+        """Build an ETag from the resource content hash.
+
+        The ETag can be used as :attr:`Meta.version <scim2_models.Meta.version>`,
+        as described in :rfc:`RFC7644 §3.14 <7644#section-3.14>`.
+        Strong ETags are built from the strict content hash, so
+        representations that only differ by case have different strong
+        ETags, and modifications of the attributes that are never
+        returned, like passwords, change them too.
+        *Weak* ETags ignore the case of case-insensitive attributes, as
+        :meth:`~scim2_models.BaseModel.get_content_hash` does, so they
+        are equal for semantically equivalent representations.
+
+        :param weak: Whether to build a weak ETag, prefixed by :code:`W/`.
+        """
+        if weak:
+            return f'W/"{self.get_content_hash().hex()}"'
+        return f'"{self.get_content_hash(strict=True).hex()}"'
 
-        by_schema = {
-            ext.model_fields["schemas"].default[0]: ext for ext in extension_models
-        }
-        return by_schema
+    @classmethod
+    def get_extension_models(cls) -> Mapping[str, type[Extension]]:
+        """Return an immutable mapping associating extension models with their schemas.
+
+        The mapping is computed once when the class is built.
+        """
+        return cls._extension_models
 
     @classmethod
     def get_extension_model(cls, name_or_schema) -> Optional[type[Extension]]:
@@ -199,6 +248,44 @@ class Resource(BaseModel, Generic[AnyExtension], metaclass=ResourceMetaclass):
                 return extension
         return None
 
+    @classmethod
+    def get_unique_attributes(cls) -> tuple[tuple[str, tuple[str, ...], bool], ...]:
+        """Return the attributes annotated with :attr:`Uniqueness.server <scim2_models.Uniqueness.server>` or :attr:`Uniqueness.global_ <scim2_models.Uniqueness.global_>`.
+
+        The attributes are ``(urn, path, case_exact)`` tuples, where *urn*
+        is the lowercased attribute URN, or the attribute name for the
+        common attributes like :attr:`~scim2_models.Resource.id`, and
+        *path* holds the field names leading to the attribute through the
+        extensions and the complex attributes. They are computed once per class.
+        """
+        attributes = cls.__dict__.get("_unique_attributes")
+        if attributes is None:
+            main_schema = cls.model_fields["schemas"].default[0]
+            attributes = [
+                (
+                    ".".join(names)
+                    if path[0] in Resource.model_fields
+                    else f"{main_schema}:{'.'.join(names)}",
+                    path,
+                    case_exact,
+                )
+                for path, names, case_exact in find_unique_paths(cls)
+            ]
+            for schema, extension in cls.get_extension_models().items():
+                attributes.extend(
+                    (
+                        f"{schema}:{'.'.join(names)}",
+                        (extension.__name__, *path),
+                        case_exact,
+                    )
+                    for path, names, case_exact in find_unique_paths(extension)
+                )
+            attributes = tuple(
+                (urn.lower(), path, case_exact) for urn, path, case_exact in attributes
+            )
+            cls._unique_attributes = attributes
+        return attributes
+
     @staticmethod
     def get_by_schema(
         resource_types: list[type[BaseModel]], schema: str, with_extensions=True
@@ -228,6 +315,65 @@ class Resource(BaseModel, Generic[AnyExtension], metaclass=ResourceMetaclass):
         schema = payload["schemas"][0]
         return Resource.get_by_schema(resource_types, schema, **kwargs)
 
+    @classmethod
+    def get_scim_list_validator(cls, scim_ctx: Optional[Context]) -> SchemaValidator:
+        """Return a validator of lists of resources, specialized for a SCIM context.
+
+        The items are validated with the schema of
+        :meth:`~scim2_models.BaseModel.get_scim_validator`, and the
+        validation errors are returned in place of the invalid items.
+        The validators are built once per class and per context.
+        """
+        validators = cls.__dict__.get("_scim_list_validators")
+        if validators is None:
+            validators = {}
+            cls._scim_list_validators = validators
+
+        if scim_ctx not in validators:
+            schema = scim_validation_schema(cls.__pydantic_core_schema__, scim_ctx)
+            validators[scim_ctx] = SchemaValidator(
+                list_validation_schema(schema), get_model_config(schema, cls)
+            )
+
+        return validators[scim_ctx]
+
+    @classmethod
+    def model_validate_many(
+        cls,
+        payloads: Union[Iterable[Any], str, bytes],
+        scim_ctx: Optional[Context] = Context.DEFAULT,
+    ) -> list[Union[Self, ValidationError]]:
+        """Validate a sequence of payloads at once.
+
+        The whole sequence is validated by pydantic-core in a single
+        call, which is faster than calling :meth:`~scim2_models.BaseModel.model_validate`
+        on each payload. The validation does not stop at the first
+        invalid payload.
+
+        .. code-block:: python
+
+            for payload, result in zip(payloads, User.model_validate_many(payloads)):
+                if isinstance(result, ValidationError):
+                    report(payload, result.errors())
+
+        :param payloads: The payloads to validate, or a JSON array of payloads.
+        :param scim_ctx: The SCIM :class:`~scim2_models.Context` in which the validation happens.
+            :attr:`~scim2_models.Context.RESOURCE_REPLACEMENT_REQUEST` is not supported,
+            as each payload must be compared with its own original value.
+        :return: For each payload, the validated resource, or the :class:`~pydantic.ValidationError`
+            raised by its validation.
+        """
+        if scim_ctx == Context.RESOURCE_REPLACEMENT_REQUEST:
+            raise ValueError(
+                "Resource queries replacement validation must compare each resource to its original resource"
+            )
+
+        validator = cls.get_scim_list_validator(scim_ctx)
+        context = {"scim": scim_ctx, "original": None}
+        if isinstance(payloads, (str, bytes)):
+            return validator.validate_json(payloads, context=context)
+        return validator.validate_python(list(payloads), context=context)
+
     @field_serializer("schemas")
     def set_extension_schemas(self, schemas: Annotated[list[str], Required.true]):
         """Add model extension ids to the 'schemas' attribute."""
@@ -253,6 +399,26 @@ class Resource(BaseModel, Generic[AnyExtension], metaclass=ResourceMetaclass):
 AnyResource = TypeVar("AnyResource", bound="Resource")
 
 
+def capture_validation_error(
+    value: Any, handler: ValidatorFunctionWrapHandler
+) -> Union[BaseModel, ValidationError]:
+    """Return the validation error of an item instead of raising it, so the validation of the other items goes on."""
+    try:
+        return handler(value)
+    except ValidationError as exc:
+        return exc
+
+
+def list_validation_schema(schema: Any) -> core_schema.CoreSchema:
+    """Build the core schema of a list whose items are validated with a model core schema."""
+    if schema.get("type") == "definitions":
+        return {**schema, "schema": list_validation_schema(schema["schema"])}
+
+    return core_schema.list_schema(
+        core_schema.no_info_wrap_validator_function(capture_validation_error, schema)
+    )
+
+
 def dedicated_attributes(model):
     """Return attributes that are not members of parent classes."""
 
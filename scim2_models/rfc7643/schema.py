@@ -71,6 +71,9 @@ def make_python_model(
 
     model_name = to_pascal(to_snake(obj.name))
     model = create_model(model_name, __base__=base, **pydantic_attributes)
+    if isinstance(obj, Schema):
+        # keep the schema so the model can be built again in other processes
+        model._source_schema = obj
 
     # Set the ComplexType class as a member of the model
     # e.g. make Member an attribute of Group
@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from typing import Annotated
 from typing import Any
 from typing import Generic
@@ -20,6 +21,7 @@ from ..base import BaseModelType
 from ..base import Context
 from ..base import Required
 from ..rfc7643.resource import AnyResource
+from ..rfc7643.resource import Resource
 from .message import Message
 
 
@@ -121,3 +123,12 @@ class ListResponse(Message, Generic[AnyResource], metaclass=ListResponseMetaclas
             )
 
         return obj
+
+
+def get_list_response_type(
+    resource_types: Sequence[type[Resource]],
+) -> type[ListResponse]:
+    """Return the :class:`~scim2_models.ListResponse` model of a union of resource classes."""
+    # Union cannot be subscripted with a dynamic tuple in type expressions
+    resource_union: Any = Union.__getitem__(tuple(resource_types))
+    return ListResponse[resource_union]
@@ -1,3 +1,6 @@
+import json
+import re
+from collections.abc import Iterator
 from enum import Enum
 from typing import Annotated
 from typing import Any
@@ -6,10 +9,22 @@ from typing import Optional
 from pydantic import Field
 from pydantic import field_validator
 
+from ..base import BaseModel
 from ..base import ComplexAttribute
+from ..base import Context
+from ..base import Mutability
 from ..base import Required
+from ..base import extract_schema_and_attribute_base
+from ..filter import find_key
+from ..filter import match_filter
+from ..filter import parse_filter
+from ..rfc7643.resource import Resource
 from .message import Message
 
+VALUE_PATH_PATTERN = re.compile(
+    r"^(?P<attribute>[^\[]+)\[(?P<filter>.*)\](?:\.(?P<sub>[^.\[\]]+))?$"
+)
+
 
 class PatchOperation(ComplexAttribute):
     class Op(str, Enum):
@@ -68,3 +83,319 @@ class PatchOp(Message):
     )
     """The body of an HTTP PATCH request MUST contain the attribute
     "Operations", whose value is an array of one or more PATCH operations."""
+
+    @classmethod
+    def diff(cls, original: Resource, updated: Resource) -> "PatchOp":
+        """Build the operations that turn the *original* resource into the *updated* one.
+
+        The resources are compared as they would be sent in a
+        :attr:`~scim2_models.Context.RESOURCE_REPLACEMENT_REQUEST`, so
+        :attr:`~scim2_models.Mutability.read_only` attributes are ignored.
+        Single-valued complex attributes and extensions are compared
+        sub-attribute by sub-attribute.
+        Multi-valued complex attributes are matched by their ``value``
+        sub-attribute, so only the added, removed or modified items are
+        sent, with paths like ``members[value eq "2819c223"]``.
+        The order of multi-valued attributes items is ignored.
+
+        :param original: The resource before the modifications.
+        :param updated: The resource after the modifications, of the same class than *original*.
+        """
+        if type(original) is not type(updated):
+            raise TypeError(
+                f"Cannot compare a '{type(original).__name__}' with a '{type(updated).__name__}'"
+            )
+
+        operations = list(
+            diff_payloads(
+                original.model_dump(scim_ctx=Context.RESOURCE_REPLACEMENT_REQUEST),
+                updated.model_dump(scim_ctx=Context.RESOURCE_REPLACEMENT_REQUEST),
+                extension_schemas=updated.get_extension_models().keys(),
+            )
+        )
+        return cls(operations=operations)
+
+    def apply(self, resource: Resource) -> Resource:
+        """Build a copy of a resource with the operations applied, as a service provider would.
+
+        The operations are applied on the resource payload as it would
+        be sent in a :attr:`~scim2_models.Context.RESOURCE_REPLACEMENT_REQUEST`,
+        and the result is validated in this context, so
+        :attr:`~scim2_models.Mutability.immutable` attributes cannot be
+        modified. :attr:`~scim2_models.Mutability.read_only` attributes
+        are kept from the original resource.
+        Paths can target attributes, sub-attributes, extension attributes,
+        and items of multi-valued attributes selected with a filter, like
+        ``emails[type eq "work"].value``.
+
+        :raises ValueError: If an operation path is invalid.
+        :raises LookupError: If an operation path filter matches no item.
+        :raises pydantic.ValidationError: If the modified resource is not valid.
+        """
+        payload = resource.model_dump(scim_ctx=Context.RESOURCE_REPLACEMENT_REQUEST)
+        extension_schemas = resource.get_extension_models().keys()
+        for operation in self.operations or []:
+            apply_operation(payload, operation, extension_schemas)
+
+        patched = type(resource).model_validate(
+            payload, scim_ctx=Context.RESOURCE_REPLACEMENT_REQUEST, original=resource
+        )
+        restore_read_only_values(resource, patched)
+        return patched
+
+
+def restore_read_only_values(original: BaseModel, patched: BaseModel) -> None:
+    """Copy the :attr:`~scim2_models.Mutability.read_only` attributes and sub-attributes of a model on its patched version.
+
+    The items of multi-valued complex attributes are paired with the
+    original items that have the same writable sub-attributes, or else the
+    same ``value``, so for instance the :attr:`GroupMember.display <scim2_models.GroupMember.display>`
+    of the members of a group are kept when other members are added.
+    """
+    for field_name in original.model_fields:
+        value = getattr(original, field_name)
+        if (
+            original.get_field_annotation(field_name, Mutability)
+            == Mutability.read_only
+        ):
+            setattr(patched, field_name, value)
+            continue
+
+        patched_value = getattr(patched, field_name)
+        if isinstance(value, BaseModel) and isinstance(patched_value, BaseModel):
+            restore_read_only_values(value, patched_value)
+
+        elif isinstance(value, list) and isinstance(patched_value, list):
+            items = [item for item in value if isinstance(item, BaseModel)]
+            for patched_item in patched_value:
+                if isinstance(patched_item, BaseModel) and (
+                    item := find_original_item(items, patched_item)
+                ):
+                    restore_read_only_values(item, patched_item)
+
+
+def find_original_item(
+    items: list[BaseModel], patched_item: BaseModel
+) -> Optional[BaseModel]:
+    """Return the original item of a patched multi-valued complex attribute item."""
+    payload = patched_item.model_dump(scim_ctx=Context.RESOURCE_REPLACEMENT_REQUEST)
+    for item in items:
+        if item.model_dump(scim_ctx=Context.RESOURCE_REPLACEMENT_REQUEST) == payload:
+            return item
+
+    value = getattr(patched_item, "value", None)
+    return next(
+        (
+            item
+            for item in items
+            if value is not None and getattr(item, "value", None) == value
+        ),
+        None,
+    )
+
+
+def apply_operation(
+    payload: dict, operation: PatchOperation, extension_schemas=()
+) -> None:
+    """Apply a Patch operation on a resource payload."""
+    op = operation.op or PatchOperation.Op.add
+    value = operation.value
+    if not operation.path:
+        if op == PatchOperation.Op.remove or not isinstance(value, dict):
+            raise ValueError(
+                f"Operations '{op.value}' without path need an object value"
+            )
+        for key, sub_value in value.items():
+            set_value(payload, key, sub_value, op, key in extension_schemas)
+        return
+
+    match = VALUE_PATH_PATTERN.match(operation.path)
+    path = match["attribute"] if match else operation.path
+    parent, names = payload, [path]
+    if path not in extension_schemas:
+        schema, attribute_base = extract_schema_and_attribute_base(path)
+        names = attribute_base.split(".")
+        if schema in extension_schemas:
+            parent = payload.setdefault(find_key(payload, schema) or schema, {})
+        elif schema and schema.lower() != payload["schemas"][0].lower():
+            raise ValueError(f"Unknown schema in path '{operation.path}'")
+
+    *names, name = names
+    for parent_name in names:
+        key = find_key(parent, parent_name)
+        if key is None:
+            if op == PatchOperation.Op.remove:
+                return
+            key = parent_name
+            parent[key] = {}
+        if not isinstance(parent[key], dict):
+            raise ValueError(f"Invalid path '{operation.path}'")
+        parent = parent[key]
+
+    if not match:
+        if op == PatchOperation.Op.remove:
+            key = find_key(parent, name)
+            if key is not None:
+                del parent[key]
+        else:
+            set_value(parent, name, value, op)
+        return
+
+    expression = parse_filter(match["filter"])
+    key = find_key(parent, name)
+    items = (parent.get(key) if key else None) or []
+    indexes = [
+        index
+        for index, item in enumerate(items)
+        if isinstance(item, dict) and match_filter(expression, item)
+    ]
+    if not indexes:
+        raise LookupError(f"No value matches the path '{operation.path}'")
+
+    sub = match["sub"]
+    if op == PatchOperation.Op.remove:
+        if sub:
+            for index in indexes:
+                sub_key = find_key(items[index], sub)
+                items[index].pop(sub_key or sub, None)
+        else:
+            parent[key] = [
+                item for index, item in enumerate(items) if index not in indexes
+            ]
+        return
+
+    for index in indexes:
+        if sub:
+            set_value(items[index], sub, value, PatchOperation.Op.replace_)
+        elif isinstance(value, dict):
+            set_value(items[index], None, value, op)
+        else:
+            raise ValueError(f"Operations on '{operation.path}' need an object value")
+
+
+def set_value(
+    parent: dict, name: Optional[str], value: Any, op: PatchOperation.Op, merge=False
+) -> None:
+    """Add or replace a value in a payload.
+
+    Values added to multi-valued attributes are appended, and objects
+    added to complex attributes are merged. When *name* is :data:`None`,
+    the value object is merged into *parent*.
+    """
+    if name is None:
+        for key, sub_value in value.items():
+            set_value(parent, key, sub_value, PatchOperation.Op.replace_)
+        return
+
+    key = find_key(parent, name) or name
+    current = parent.get(key)
+    if op == PatchOperation.Op.add and isinstance(current, list):
+        values = value if isinstance(value, list) else [value]
+        parent[key] = current + [item for item in values if item not in current]
+    elif (op == PatchOperation.Op.add or merge) and isinstance(current, dict):
+        if not isinstance(value, dict):
+            raise ValueError(f"Attribute '{name}' needs an object value")
+        for sub_key, sub_value in value.items():
+            set_value(current, sub_key, sub_value, op)
+    else:
+        parent[key] = value
+
+
+def diff_payloads(
+    original: dict, updated: dict, prefix: str = "", extension_schemas=()
+) -> Iterator[PatchOperation]:
+    """Yield the operations between two resource or extension payloads."""
+    for key in dict.fromkeys([*original, *updated]):
+        if key == "schemas":
+            continue
+
+        path = f"{prefix}{key}"
+        original_value = original.get(key)
+        updated_value = updated.get(key)
+        if isinstance(original_value, dict) and isinstance(updated_value, dict):
+            if key in extension_schemas:
+                yield from diff_payloads(original_value, updated_value, f"{key}:")
+            else:
+                for sub_key in dict.fromkeys([*original_value, *updated_value]):
+                    yield from diff_values(
+                        f"{path}.{sub_key}",
+                        original_value.get(sub_key),
+                        updated_value.get(sub_key),
+                    )
+
+        elif isinstance(original_value, list) and isinstance(updated_value, list):
+            yield from diff_multi_valued(path, original_value, updated_value)
+
+        else:
+            yield from diff_values(path, original_value, updated_value)
+
+
+def diff_values(path: str, original: Any, updated: Any) -> Iterator[PatchOperation]:
+    """Yield the operation replacing a whole attribute value, if needed."""
+    if original == updated:
+        return
+
+    if updated is None:
+        yield PatchOperation(op=PatchOperation.Op.remove, path=path)
+    elif original is None:
+        yield PatchOperation(op=PatchOperation.Op.add, path=path, value=updated)
+    else:
+        yield PatchOperation(op=PatchOperation.Op.replace_, path=path, value=updated)
+
+
+def diff_multi_valued(
+    path: str, original: list, updated: list
+) -> Iterator[PatchOperation]:
+    """Yield the operations between two multi-valued attribute values."""
+    original_items = index_items(original)
+    updated_items = index_items(updated)
+
+    if original_items is not None and updated_items is not None:
+        for value in original_items:
+            if value not in updated_items:
+                yield PatchOperation(
+                    op=PatchOperation.Op.remove,
+                    path=f"{path}[value eq {json.dumps(value)}]",
+                )
+
+        for value, item in updated_items.items():
+            if value in original_items and original_items[value] != item:
+                item_path = f"{path}[value eq {json.dumps(value)}]"
+                # replacing a value path merges the sub-attributes, so the
+                # dropped ones are removed explicitly
+                for sub_key in original_items[value]:
+                    if sub_key not in item:
+                        yield PatchOperation(
+                            op=PatchOperation.Op.remove, path=f"{item_path}.{sub_key}"
+                        )
+                yield PatchOperation(
+                    op=PatchOperation.Op.replace_, path=item_path, value=item
+                )
+
+        added = [
+            item for value, item in updated_items.items() if value not in original_items
+        ]
+
+    elif all(item in updated for item in original):
+        added = [item for item in updated if item not in original]
+
+    else:
+        yield PatchOperation(op=PatchOperation.Op.replace_, path=path, value=updated)
+        return
+
+    if added:
+        yield PatchOperation(op=PatchOperation.Op.add, path=path, value=added)
+
+
+def index_items(items: list) -> Optional[dict]:
+    """Index complex attribute items by their 'value' sub-attribute.
+
+    Return :data:`None` if some items cannot be identified by a unique value.
+    """
+    index = {}
+    for item in items:
+        value = item.get("value") if isinstance(item, dict) else None
+        if not isinstance(value, (str, int)) or value in index:
+            return None
+        index[value] = item
+    return index
@@ -0,0 +1,134 @@
+from collections import UserString
+from collections.abc import Iterator
+from typing import Any
+from typing import Optional
+
+from .base import BaseModel
+from .rfc7643.resource import Resource
+from .rfc7644.error import Error
+
+
+class UniquenessIndex:
+    """Hash index of the unique attribute values of resources.
+
+    The attributes annotated with :attr:`Uniqueness.server <scim2_models.Uniqueness.server>`
+    or :attr:`Uniqueness.global_ <scim2_models.Uniqueness.global_>` are read from the
+    resource classes with :meth:`Resource.get_unique_attributes <scim2_models.Resource.get_unique_attributes>`,
+    including the attributes of the extensions and of the dynamic models.
+    Their values are kept in a dictionary, so checking or registering
+    a resource does not depend on the number of indexed resources.
+    The strings of attributes annotated with :attr:`CaseExact.false <scim2_models.CaseExact.false>`
+    are compared case-insensitively.
+
+    An index stands for a single service provider, so both ``server`` and
+    ``global`` values are unique among all the indexed resources.
+    Resources are identified by their main schema and their
+    :attr:`~scim2_models.Resource.id`, so registering a resource again
+    replaces its previous values.
+
+    .. code-block:: python
+
+        index = UniquenessIndex()
+        for user in users:
+            if error := index.register(user):
+                return error
+    """
+
+    def __init__(self):
+        self.owners: dict[tuple[str, Any], tuple[str, Optional[str]]] = {}
+        self.resource_keys: dict[tuple[str, Optional[str]], frozenset] = {}
+
+    def __len__(self) -> int:
+        return len(self.resource_keys)
+
+    def __contains__(self, resource: Resource) -> bool:
+        return get_owner(resource) in self.resource_keys
+
+    def clear(self) -> None:
+        """Remove all the resources from the index."""
+        self.owners.clear()
+        self.resource_keys.clear()
+
+    def check(self, resource: Resource) -> Optional[Error]:
+        """Check that the unique values of a resource are not used by another resource.
+
+        :return: :meth:`Error.make_uniqueness_error <scim2_models.Error.make_uniqueness_error>`
+            if a value is already in use, else :data:`None`.
+        """
+        return self.check_keys(get_owner(resource), get_unique_keys(resource))
+
+    def check_keys(
+        self, owner: tuple[str, Optional[str]], keys: frozenset
+    ) -> Optional[Error]:
+        for key in keys:
+            if self.owners.get(key, owner) != owner:
+                return Error.make_uniqueness_error()
+        return None
+
+    def register(self, resource: Resource) -> Optional[Error]:
+        """Check the unique values of a resource, and register them if they are not used by another resource.
+
+        The values previously registered for the resource are replaced.
+
+        :return: :meth:`Error.make_uniqueness_error <scim2_models.Error.make_uniqueness_error>`
+            if a value is already in use, else :data:`None`.
+        :raises ValueError: If the resource has no :attr:`~scim2_models.Resource.id`.
+        """
+        if resource.id is None:
+            raise ValueError("Resources need an id to be registered")
+
+        owner = get_owner(resource)
+        keys = get_unique_keys(resource)
+        if error := self.check_keys(owner, keys):
+            return error
+
+        self.unregister(resource)
+        for key in keys:
+            self.owners[key] = owner
+        self.resource_keys[owner] = keys
+        return None
+
+    def unregister(self, resource: Resource) -> None:
+        """Remove the values of a resource from the index, so other resources can use them."""
+        for key in self.resource_keys.pop(get_owner(resource), ()):
+            del self.owners[key]
+
+
+def get_owner(resource: Resource) -> tuple[str, Optional[str]]:
+    """Return the key identifying a resource in a :class:`~scim2_models.UniquenessIndex`."""
+    return resource.model_fields["schemas"].default[0].lower(), resource.id
+
+
+def get_unique_keys(resource: Resource) -> frozenset:
+    """Return the ``(urn, value)`` keys of the unique values of a resource."""
+    return frozenset(
+        (urn, get_unique_value(value, case_exact))
+        for urn, path, case_exact in resource.get_unique_attributes()
+        for value in iter_path_values(resource, path)
+    )
+
+
+def iter_path_values(value: Any, path: tuple[str, ...]) -> Iterator[Any]:
+    """Yield the values at the end of a path of field names, with the multi-valued attributes flattened."""
+    if value is None:
+        return
+
+    if isinstance(value, list):
+        for item in value:
+            yield from iter_path_values(item, path)
+    elif path:
+        yield from iter_path_values(getattr(value, path[0]), path[1:])
+    else:
+        yield value
+
+
+def get_unique_value(value: Any, case_exact: bool) -> Any:
+    """Return the hashable representation of a unique value."""
+    if isinstance(value, BaseModel):
+        return value.get_content_hash()
+
+    if isinstance(value, (str, UserString)):
+        value = str(value)
+        return value if case_exact else value.casefold()
+
+    return value
@@ -1,5 +1,6 @@
 import base64
 import re
+from functools import lru_cache
 from typing import Annotated
 from typing import Literal
 from typing import Optional
@@ -74,6 +75,14 @@ class Base64Encoder(EncoderProtocol):  # pragma: no cover
 Base64Bytes = Annotated[bytes, EncodedBytes(encoder=Base64Encoder)]
 
 
+CAMEL_CASE_PATTERN = re.compile(r"_+([0-9A-Za-z]+)")
+NON_ALPHANUMERICAL_PATTERN = re.compile(r"[\W_]+")
+
+ATTRIBUTE_NAMES_CACHE_SIZE = 4096
+"""Number of distinct attribute names kept in the :func:`to_camel` and :func:`normalize_attribute_name` caches."""
+
+
+@lru_cache(maxsize=ATTRIBUTE_NAMES_CACHE_SIZE)
 def to_camel(string: str) -> str:
     """Transform strings to camelCase.
 
@@ -81,19 +90,22 @@ def to_camel(string: str) -> str:
     or less the pydantic implementation, but it does not add uppercase
     on alphanumerical characters after specials characters. For instance
     '$ref' stays '$ref'.
+    The results are cached, as the attribute names are few.
     """
     snake = to_snake(string)
-    camel = re.sub(r"_+([0-9A-Za-z]+)", lambda m: m.group(1).title(), snake)
+    camel = CAMEL_CASE_PATTERN.sub(lambda m: m.group(1).title(), snake)
     return camel
 
 
+@lru_cache(maxsize=ATTRIBUTE_NAMES_CACHE_SIZE)
 def normalize_attribute_name(attribute_name: str) -> str:
     """Remove all non-alphabetical characters and lowerise a string.
 
     This method is used for attribute name validation.
+    The results are cached, as the attribute names are few.
     """
     is_extension_attribute = ":" in attribute_name
     if not is_extension_attribute:
-        attribute_name = re.sub(r"[\W_]+", "", attribute_name)
+        attribute_name = NON_ALPHANUMERICAL_PATTERN.sub("", attribute_name)
 
     return attribute_name.lower()
@@ -0,0 +1,411 @@
+import asyncio
+from typing import Annotated
+from typing import Optional
+
+import pytest
+
+from scim2_models import AsyncSCIMClient
+from scim2_models import BackendError
+from scim2_models import BulkOperation
+from scim2_models import BulkRequest
+from scim2_models import Email
+from scim2_models import Group
+from scim2_models import GroupMember
+from scim2_models import InMemoryBackend
+from scim2_models import MockTransport
+from scim2_models import Mutability
+from scim2_models import PatchOp
+from scim2_models import PatchOperation
+from scim2_models import Required
+from scim2_models import Resource
+from scim2_models import ResourceCache
+from scim2_models import SCIMResponseError
+from scim2_models import SearchRequest
+from scim2_models import Uniqueness
+from scim2_models import User
+
+
+class Device(Resource):
+    schemas: Annotated[list[str], Required.true] = ["org:example:Device"]
+
+    serial: Annotated[Optional[str], Mutability.immutable, Uniqueness.global_] = None
+    name: Optional[str] = None
+
+
+@pytest.fixture
+def backend():
+    backend = InMemoryBackend(
+        [User, Group, Device],
+        indexed_attributes={User: ["emails.value", "displayName"]},
+        base_url="https://scim.example",
+    )
+    for index, name in enumerate(["bjensen", "jsmith", "Alice", "bob"]):
+        backend.create(
+            User(
+                user_name=name,
+                display_name=f"{name} display" if index % 2 else None,
+                emails=[Email(value=f"{name}@example.com")],
+            )
+        )
+    return backend
+
+
+def get_user_names(list_response):
+    return [resource.user_name for resource in list_response.resources]
+
+
+def test_resource_operations(backend):
+    """Resources are created, retrieved, replaced, modified and deleted."""
+    user = backend.create(User(user_name="mallory"))
+    assert user.meta.resource_type == "User"
+    assert user.meta.location == f"https://scim.example/Users/{user.id}"
+    assert user.meta.version.startswith('W/"')
+    assert user.meta.created == user.meta.last_modified
+    assert backend.get(User, user.id) is user
+
+    replacement = User(id=user.id, user_name="mallory", title="Intruder")
+    replaced = backend.replace(replacement)
+    assert replaced.title == "Intruder"
+    assert replaced.meta.created == user.meta.created
+    assert replaced.meta.version != user.meta.version
+
+    patch_op = PatchOp(
+        operations=[PatchOperation(op="replace", path="userName", value="eve")]
+    )
+    modified = backend.modify(User, user.id, patch_op)
+    assert modified.user_name == "eve"
+    assert modified.title == "Intruder"
+
+    group = backend.create(
+        Group(
+            display_name="Tour Guides",
+            members=[GroupMember(value=user.id, display="eve")],
+        )
+    )
+    patch_op = PatchOp(
+        operations=[PatchOperation(op="add", path="members", value=[{"value": "2"}])]
+    )
+    modified = backend.modify(Group, group.id, patch_op)
+    assert [member.display for member in modified.members] == ["eve", None]
+
+    backend.delete(User, user.id)
+    with pytest.raises(BackendError, match="not found") as excinfo:
+        backend.get(User, user.id)
+    assert excinfo.value.error.status == 404
+
+    with pytest.raises(ValueError, match="Unknown resource type"):
+        InMemoryBackend([Group]).create(User(user_name="mallory"))
+
+    with pytest.raises(BackendError, match="'None' not found"):
+        backend.replace(User(user_name="mallory"))
+
+    with pytest.raises(ValueError, match="has no id"):
+        backend.unindex(User(user_name="mallory"))
+
+
+def test_uniqueness(backend):
+    """Unique values cannot be used by several resources."""
+    with pytest.raises(BackendError) as excinfo:
+        backend.create(User(user_name="bjensen"))
+    assert excinfo.value.error.scim_type == "uniqueness"
+
+    user = backend.create(User(user_name="mallory"))
+    with pytest.raises(BackendError, match="already in use"):
+        backend.replace(User(user_name="jsmith"), user.id)
+
+    # the value of the replaced resource can be used again
+    backend.replace(User(user_name="eve"), user.id)
+    backend.create(User(user_name="mallory"))
+    backend.delete(User, user.id)
+    backend.create(User(user_name="eve"))
+
+    # values of extensions and custom resources are unique too
+    device = backend.create(Device(serial="1"))
+    with pytest.raises(BackendError):
+        backend.create(Device(serial="1"))
+
+    with pytest.raises(BackendError) as excinfo:
+        backend.replace(Device(serial="2"), device.id)
+    assert excinfo.value.error.scim_type == "mutability"
+
+
+def test_search(backend):
+    """Resources are filtered, sorted and paginated."""
+    assert get_user_names(backend.search(resource_types=[User])) == [
+        "bjensen",
+        "jsmith",
+        "Alice",
+        "bob",
+    ]
+
+    search_request = SearchRequest(filter='emails.value eq "ALICE@example.com"')
+    assert get_user_names(backend.search(search_request)) == ["Alice"]
+    assert backend.evaluate_ids(User, ("eq", "emails.value", "x")) == set()
+
+    search_request = SearchRequest(
+        filter='userName sw "b" and not (displayName pr)', sort_by="userName"
+    )
+    assert get_user_names(backend.search(search_request, [User])) == [
+        "bjensen",
+    ]
+
+    search_request = SearchRequest(sort_by="displayName", sort_order="descending")
+    assert get_user_names(backend.search(search_request, [User])) == [
+        "bjensen",
+        "Alice",
+        "jsmith",
+        "bob",
+    ]
+
+    search_request = SearchRequest(sort_by="userName", start_index=2, count=2)
+    list_response = backend.search(search_request, [User])
+    assert get_user_names(list_response) == ["bjensen", "bob"]
+    assert list_response.total_results == 4
+    assert list_response.start_index == 2
+    assert list_response.items_per_page == 2
+
+    for start_index in (0, -3):
+        search_request = SearchRequest(
+            sort_by="userName", start_index=start_index, count=2
+        )
+        list_response = backend.search(search_request, [User])
+        assert get_user_names(list_response) == ["Alice", "bjensen"]
+        assert list_response.start_index == 1
+
+    search_request = SearchRequest.model_construct(start_index=-3, count=2)
+    assert backend.search(search_request, [User]).start_index == 1
+
+    with pytest.raises(BackendError) as excinfo:
+        backend.search(SearchRequest(filter="userName eq"))
+    assert excinfo.value.error.scim_type == "invalidFilter"
+
+    backend.create(Device(serial="1"))
+    search_request = SearchRequest(sort_by="id", count=10)
+    assert backend.search(search_request).total_results == 5
+
+
+def test_indexed_filters(backend):
+    """Equality comparisons on indexed attributes restrict the evaluated resources."""
+    assert backend.evaluate_ids(User, ("eq", "userName", "bjensen")) is None
+    assert backend.evaluate_ids(User, ("eq", "urn:unknown:attr", "bjensen")) is None
+
+    filters = {
+        'emails.value eq "bob@example.com" or displayName eq "jsmith display"': [
+            "jsmith",
+            "bob",
+        ],
+        'emails.value eq "bob@example.com" or userName eq "jsmith"': [
+            "jsmith",
+            "bob",
+        ],
+        'emails.value eq "bob@example.com" and displayName eq "bob display"': ["bob"],
+        'emails.value eq "bob@example.com" and userName eq "alice"': [],
+        'userName eq "bob" and emails.value eq "bob@example.com"': ["bob"],
+        'userName eq "bob" and userName pr': ["bob"],
+        'emails[value eq "bob@example.com"]': ["bob"],
+    }
+    for filter, user_names in filters.items():
+        list_response = backend.search(SearchRequest(filter=filter), [User])
+        assert get_user_names(list_response) == user_names, filter
+
+    user = backend.search(SearchRequest(filter='userName eq "bob"')).resources[0]
+    for email in ("jsmith@example.com", "b@b.b"):
+        patch_op = PatchOp(
+            operations=[
+                PatchOperation(op="replace", path="emails", value=[{"value": email}])
+            ]
+        )
+        backend.modify(User, user.id, patch_op)
+        list_response = backend.search(
+            SearchRequest(filter='emails.value eq "jsmith@example.com"')
+        )
+        assert get_user_names(list_response) == (
+            ["jsmith", "bob"] if email == "jsmith@example.com" else ["jsmith"]
+        )
+
+    assert (
+        backend.indexes[User][
+            "urn:ietf:params:scim:schemas:core:2.0:user:emails.value"
+        ].lookup("bob@example.com")
+        == set()
+    )
+    assert get_user_names(
+        backend.search(SearchRequest(filter='emails.value eq "B@B.B"'))
+    ) == ["bob"]
+
+
+def test_modify_errors(backend):
+    """Invalid Patch operations raise errors."""
+    user = backend.search(SearchRequest(filter='userName eq "bob"')).resources[0]
+    errors = {
+        "noTarget": PatchOperation(op="remove", path='emails[value eq "x"]'),
+        "invalidPath": PatchOperation(op="add", path="userName.value", value="x"),
+        "invalidValue": PatchOperation(op="replace", path="active", value="maybe"),
+    }
+    for scim_type, operation in errors.items():
+        with pytest.raises(BackendError) as excinfo:
+            backend.modify(User, user.id, PatchOp(operations=[operation]))
+        assert excinfo.value.error.scim_type == scim_type
+
+
+def test_bulk(backend):
+    """Bulk operations can reference the resources created by previous operations."""
+    bulk_request = BulkRequest(
+        operations=[
+            BulkOperation(
+                method="POST",
+                path="/Users",
+                bulk_id="user",
+                data={
+                    "userName": "mallory",
+                    "schemas": [User.model_fields["schemas"].default[0]],
+                },
+            ),
+            BulkOperation(
+                method="POST",
+                path="/Groups",
+                bulk_id="group",
+                data={
+                    "schemas": [Group.model_fields["schemas"].default[0]],
+                    "displayName": "Intruders",
+                    "members": [{"value": "bulkId:user"}, {"value": "bulkId:unknown"}],
+                },
+            ),
+            BulkOperation(method="DELETE", path="/Users/bulkId:user"),
+            BulkOperation(method="DELETE", path="/Users/bulkId:user"),
+            BulkOperation(method="DELETE", path="/Users/bulkId:user"),
+        ],
+        fail_on_errors=1,
+    )
+    bulk_response = backend.bulk(bulk_request)
+    user_id = bulk_response.operations[0].location.rsplit("/", 1)[-1]
+    assert [operation.status for operation in bulk_response.operations] == [
+        201,
+        201,
+        204,
+        404,
+    ]
+    assert bulk_response.operations[0].bulk_id == "user"
+    assert bulk_response.operations[0].version.startswith('W/"')
+    assert bulk_response.operations[3].response["status"] == "404"
+
+    group = backend.search(
+        SearchRequest(filter='displayName eq "Intruders"')
+    ).resources[0]
+    assert group.members == [
+        GroupMember(value=user_id),
+        GroupMember(value="bulkId:unknown"),
+    ]
+    assert backend.bulk(BulkRequest()).operations == []
+
+
+def test_http_requests(backend):
+    """HTTP requests are answered by the backend, so it can be used with the client."""
+    client = AsyncSCIMClient(MockTransport(backend.handle), [User, Group, Device])
+    cache = ResourceCache(client, ttl=0)
+
+    async def run():
+        await client.discover()
+        user = await client.create(User(user_name="mallory", password="secret"))
+        assert user.password is None
+        assert (await client.query(User, user.id)).user_name == "mallory"
+        assert (await cache.get(User, user.id)).user_name == "mallory"
+        assert (await cache.get(User, user.id)).user_name == "mallory"
+
+        user.title = "Intruder"
+        user = await client.replace(user)
+        assert user.title == "Intruder"
+
+        patch_op = PatchOp(
+            operations=[PatchOperation(op="add", path="nickName", value="Mal")]
+        )
+        user = await client.modify(User, user.id, patch_op)
+        assert user.nick_name == "Mal"
+
+        users = await client.query(
+            User,
+            search_request=SearchRequest(
+                filter='userName sw "b"', attributes=["userName"], sort_by="userName"
+            ),
+        )
+        assert get_user_names(users) == ["bjensen", "bob"]
+        assert users.resources[0].emails is None
+
+        user = await client.query(
+            User, user.id, SearchRequest(excluded_attributes=["nickName"])
+        )
+        assert user.nick_name is None
+        user = await client.query(User, user.id, SearchRequest(attributes=["title"]))
+        assert user.user_name is None
+
+        resources = await client.search(SearchRequest(count=2))
+        assert resources.total_results == 5
+        assert len(resources.resources) == 2
+        assert (await client.query()).total_results == 5
+        assert (
+            await client.search(SearchRequest(filter="title pr"), User)
+        ).total_results == 1
+
+        bulk_response = await client.bulk(
+            BulkRequest(
+                operations=[BulkOperation(method="DELETE", path=f"/Users/{user.id}")]
+            )
+        )
+        assert bulk_response.operations[0].status == 204
+
+        with pytest.raises(SCIMResponseError) as excinfo:
+            await client.delete(User, user.id)
+        assert excinfo.value.error.status == 404
+
+        with pytest.raises(SCIMResponseError) as excinfo:
+            await client.create(User(user_name="bjensen"))
+        assert excinfo.value.error.scim_type == "uniqueness"
+
+        with pytest.raises(SCIMResponseError) as excinfo:
+            await client.create(User())
+        assert excinfo.value.error.scim_type == "invalidValue"
+
+        with pytest.raises(SCIMResponseError) as excinfo:
+            await client.search(SearchRequest(filter="userName eq"))
+        assert excinfo.value.error.scim_type == "invalidFilter"
+
+    asyncio.run(run())
+
+
+def test_invalid_http_requests(backend):
+    """Invalid HTTP requests are answered with errors."""
+    response = backend.handle("POST", "/Users", content=b"{")
+    assert response.status_code == 400
+    assert b"invalidSyntax" in response.content
+
+    assert backend.handle("GET", "/Foobar").status_code == 404
+    assert backend.handle("GET", "/Users/1/foobar").status_code == 404
+    assert backend.handle("POST", "/Users/1").status_code == 405
+    assert backend.handle("GET", "/Users/.search").status_code == 405
+    assert backend.handle("POST", "/").status_code == 405
+
+    user_id = next(iter(backend.resources[User]))
+    for path in ("/Users", f"/Users/{user_id}"):
+        for parameter in ("attributes", "excludedAttributes"):
+            response = backend.handle("GET", path, params={parameter: "foobar"})
+            assert response.status_code == 400
+            assert b"invalidValue" in response.content
+
+    response = backend.handle("DELETE", "/Users/1")
+    assert response.status_code == 404
+    assert response.headers["content-type"] == "application/scim+json"
+
+
+def test_case_exact_filters():
+    """Case exact attributes are filtered case-exactly, with or without index."""
+    for indexed_attributes in ({}, {User: ["externalId"]}):
+        backend = InMemoryBackend([User], indexed_attributes=indexed_attributes)
+        user = backend.create(User(user_name="bjensen", external_id="BJensen"))
+        for filter, expected in (
+            ('externalId eq "BJensen"', 1),
+            ('externalId eq "bjensen"', 0),
+            (f'id eq "{user.id.upper()}"', 0),
+            ('userName eq "BJENSEN" and externalId eq "BJensen"', 1),
+        ):
+            search_request = SearchRequest(filter=filter)
+            assert backend.search(search_request).total_results == expected, filter
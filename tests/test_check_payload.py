@@ -0,0 +1,132 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from scim2_models import Context
+from scim2_models import EnterpriseUser
+from scim2_models import Group
+from scim2_models import ListResponse
+from scim2_models import SearchRequest
+from scim2_models import User
+
+PAYLOAD = {
+    "schemas": [
+        "urn:ietf:params:scim:schemas:core:2.0:User",
+        "urn:ietf:params:scim:schemas:extension:enterprise:2.0:User",
+    ],
+    "id": "2819c223-7f76-453a-919d-413861904646",
+    "userName": "bjensen",
+    "name": {"givenName": "Barbara", "familyName": "Jensen"},
+    "emails": [{"value": "bjensen@example.com", "type": "work", "primary": True}],
+    "urn:ietf:params:scim:schemas:extension:enterprise:2.0:User": {
+        "employeeNumber": "701984",
+        "manager": {
+            "value": "26118915-6090-4610-87e4-49d8ca9f808d",
+            "$ref": "https://example.com/v2/Users/26118915-6090-4610-87e4-49d8ca9f808d",
+        },
+    },
+    "meta": {
+        "resourceType": "User",
+        "created": "2010-01-23T04:56:22Z",
+        "lastModified": "2011-05-13T04:42:34Z",
+        "location": "https://example.com/v2/Users/2819c223-7f76-453a-919d-413861904646",
+    },
+}
+
+INVALID_PAYLOADS = [
+    {"schemas": PAYLOAD["schemas"], "password": "foo"},
+    {"userName": "bjensen", "password": "foo"},
+    {"userName": "bjensen", "invalid": "foo", "name": {"invalid": "bar"}},
+    {"userName": 1, "emails": [{"value": 2}], "active": "maybe"},
+    {"USERNAME": "bjensen", "Name": {"GivenName": "Barbara"}, "id": "foo"},
+    {
+        "userName": "bjensen",
+        "urn:ietf:params:scim:schemas:extension:enterprise:2.0:User": {
+            "manager": {"value": "boss"}
+        },
+    },
+]
+
+
+def model_validation_errors(model, payload, scim_ctx):
+    original = model() if scim_ctx == Context.RESOURCE_REPLACEMENT_REQUEST else None
+    try:
+        model.model_validate(payload, scim_ctx=scim_ctx, original=original)
+    except ValidationError as exc:
+        return exc.errors()
+    return []
+
+
+def strip(errors):
+    return [
+        {key: value for key, value in error.items() if key not in ("input", "url")}
+        for error in errors
+    ]
+
+
+@pytest.mark.parametrize("scim_ctx", Context)
+@pytest.mark.parametrize("payload", [PAYLOAD, *INVALID_PAYLOADS])
+def test_same_errors_as_model_validation(payload, scim_ctx):
+    """Payloads checks return the same errors than model validation, for dicts and JSON."""
+    model = User[EnterpriseUser]
+    expected = strip(model_validation_errors(model, payload, scim_ctx))
+    assert strip(model.check_payload(payload, scim_ctx)) == expected
+    assert strip(model.check_payload(json.dumps(payload), scim_ctx)) == expected
+    assert (
+        strip(model.check_payload(json.dumps(payload).encode(), scim_ctx)) == expected
+    )
+
+
+def test_check_payload():
+    """Payloads are checked according to the SCIM context, without building models."""
+    assert User[EnterpriseUser].check_payload(PAYLOAD) == []
+    assert (
+        User[EnterpriseUser].check_payload(PAYLOAD, Context.RESOURCE_CREATION_REQUEST)
+        == []
+    )
+
+    errors = User.check_payload(
+        {"displayName": "Babs"}, Context.RESOURCE_CREATION_REQUEST
+    )
+    assert [error["type"] for error in errors] == ["required_error"]
+    assert errors[0]["ctx"] == {"field_name": "user_name"}
+
+    errors = Group.check_payload(
+        {"displayName": "Admins"}, Context.RESOURCE_QUERY_RESPONSE
+    )
+    assert [error["type"] for error in errors] == ["returned_error"]
+
+
+def test_payload_validator():
+    """Payload validators produce dictionaries instead of model instances."""
+    validator = User.get_scim_payload_validator(Context.RESOURCE_CREATION_REQUEST)
+    assert validator is User.get_scim_payload_validator(
+        Context.RESOURCE_CREATION_REQUEST
+    )
+
+    values = validator.validate_python(
+        {"userName": "bjensen", "id": "foo", "name": {"givenName": "Barbara"}},
+        context={"scim": Context.RESOURCE_CREATION_REQUEST},
+    )
+    assert values["user_name"] == "bjensen"
+    assert values["id"] is None
+    assert values["name"]["given_name"] == "Barbara"
+
+
+def test_unsupported_model_validators():
+    """Models with other model-level validators are checked with the model validators."""
+    assert SearchRequest.get_scim_payload_validator(Context.SEARCH_REQUEST) is None
+    errors = SearchRequest.check_payload(
+        {"attributes": ["userName"], "excludedAttributes": ["displayName"]},
+        Context.SEARCH_REQUEST,
+    )
+    assert [error["type"] for error in errors] == ["value_error"]
+
+    assert ListResponse[User].get_scim_payload_validator(Context.DEFAULT) is None
+    assert (
+        ListResponse[User].check_payload(
+            {"totalResults": 1}, Context.RESOURCE_QUERY_RESPONSE
+        )[0]["type"]
+        == "no_resource_error"
+    )
@@ -0,0 +1,617 @@
+import asyncio
+import gc
+import json
+import subprocess
+import sys
+
+import pytest
+
+import scim2_models
+from scim2_models import ASGITransport
+from scim2_models import AsyncSCIMClient
+from scim2_models import BulkOperation
+from scim2_models import BulkRequest
+from scim2_models import EnterpriseUser
+from scim2_models import Error
+from scim2_models import Group
+from scim2_models import HTTPXTransport
+from scim2_models import InMemoryBackend
+from scim2_models import ListResponse
+from scim2_models import MockTransport
+from scim2_models import PatchOp
+from scim2_models import PatchOperation
+from scim2_models import ResourceCache
+from scim2_models import ResourceType
+from scim2_models import SCIMResponseError
+from scim2_models import SearchRequest
+from scim2_models import Transport
+from scim2_models import TransportResponse
+from scim2_models import User
+
+USER_SCHEMA = "urn:ietf:params:scim:schemas:core:2.0:User"
+LIST_RESPONSE_SCHEMA = "urn:ietf:params:scim:api:messages:2.0:ListResponse"
+
+
+def make_response(status_code, payload=None):
+    content = json.dumps(payload).encode() if payload is not None else b""
+    return TransportResponse(
+        status_code, content, {"Content-Type": "application/scim+json"}
+    )
+
+
+def make_user(index):
+    return {
+        "schemas": [USER_SCHEMA],
+        "id": str(index),
+        "userName": f"user{index}",
+        "meta": {"resourceType": "User"},
+    }
+
+
+class FakeServer:
+    """Answer requests with a list of users, and at most 'max_count' users per page."""
+
+    def __init__(self, users=(), max_count=None):
+        self.users = list(users)
+        self.max_count = max_count
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, method, url, params, content, headers):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+
+        start_index = int(params.get("startIndex", 1))
+        count = int(params.get("count", len(self.users)))
+        if self.max_count:
+            count = min(count, self.max_count)
+        resources = self.users[start_index - 1 : start_index - 1 + count]
+        return make_response(
+            200,
+            {
+                "schemas": [LIST_RESPONSE_SCHEMA],
+                "totalResults": len(self.users),
+                "startIndex": start_index,
+                "itemsPerPage": len(resources),
+                "Resources": resources,
+            },
+        )
+
+
+def test_resource_operations():
+    """Resources are sent and validated in the contexts of each operation."""
+
+    def handler(method, url, params, content, headers):
+        assert headers["Accept"] == "application/scim+json"
+        payload = json.loads(content) if content else None
+        if method == "POST":
+            assert headers["Content-Type"] == "application/scim+json"
+            assert "id" not in payload
+            return make_response(201, {**payload, "id": "1"})
+        if method == "GET":
+            return make_response(200, make_user(1))
+        if method == "PUT":
+            assert "id" not in payload
+            return make_response(200, {**payload, "id": "1"})
+        if method == "PATCH" and payload["Operations"][0]["op"] == "add":
+            return make_response(200, make_user(1))
+        return make_response(204)
+
+    async def run():
+        transport = MockTransport(handler)
+        async with AsyncSCIMClient(transport, [User[EnterpriseUser], Group]) as client:
+            user = await client.create(User[EnterpriseUser](user_name="bjensen"))
+            assert user.id == "1"
+            assert isinstance(user, User[EnterpriseUser])
+
+            user = await client.query(User[EnterpriseUser], "1")
+            assert user.user_name == "user1"
+
+            user.display_name = "Babs"
+            user = await client.replace(user)
+            assert user.display_name == "Babs"
+
+            patch_op = PatchOp(
+                operations=[PatchOperation(op="add", path="nickName", value="Babs")]
+            )
+            user = await client.modify(User[EnterpriseUser], "1", patch_op)
+            assert user.user_name == "user1"
+
+            patch_op = PatchOp(operations=[PatchOperation(op="remove", path="title")])
+            assert await client.modify(User[EnterpriseUser], "1", patch_op) is None
+            assert await client.delete(Group, "2") is None
+
+        return transport.requests
+
+    requests = asyncio.run(run())
+    assert [(method, url) for method, url, _, _ in requests] == [
+        ("POST", "/Users"),
+        ("GET", "/Users/1"),
+        ("PUT", "/Users/1"),
+        ("PATCH", "/Users/1"),
+        ("PATCH", "/Users/1"),
+        ("DELETE", "/Groups/2"),
+    ]
+
+
+def test_list_operations():
+    """Queries and searches return list responses of the client resource types."""
+    server = FakeServer([make_user(1)])
+    transport = MockTransport(server)
+    client = AsyncSCIMClient(transport, [User, Group])
+    search_request = SearchRequest(
+        attributes=["userName", "emails"], filter='userName sw "user"', count=10
+    )
+
+    async def run():
+        users = await client.query(User, search_request=search_request)
+        assert type(users) is ListResponse[User]
+        assert users.resources[0].user_name == "user1"
+
+        resources = await client.query()
+        assert isinstance(resources.resources[0], User)
+
+        resources = await client.search(search_request)
+        assert resources.resources[0].user_name == "user1"
+        assert (await client.search(resource_type=User)).total_results == 1
+
+    asyncio.run(run())
+    assert transport.requests[0][:3] == (
+        "GET",
+        "/Users",
+        {
+            "attributes": "userName,emails",
+            "filter": 'userName sw "user"',
+            "count": "10",
+        },
+    )
+    assert transport.requests[1][:3] == ("GET", "/", {})
+    assert transport.requests[2][1] == "/.search"
+    assert json.loads(transport.requests[2][3])["filter"] == 'userName sw "user"'
+    assert transport.requests[3][1:3] == ("/Users/.search", {})
+
+
+def test_iter_pages():
+    """Pages are prefetched, and the server page size is honored."""
+    server = FakeServer([make_user(index) for index in range(1, 24)], max_count=5)
+    client = AsyncSCIMClient(MockTransport(server), [User], max_concurrency=2)
+
+    async def run():
+        pages = [
+            page
+            async for page in client.iter_pages(
+                User, SearchRequest(filter="active eq true"), count=10, prefetch=4
+            )
+        ]
+        resources = [resource async for resource in client.iter_resources(User)]
+        return pages, resources
+
+    pages, resources = asyncio.run(run())
+    assert [page.start_index for page in pages] == [1, 6, 11, 16, 21]
+    assert [resource.id for resource in resources] == [
+        str(index) for index in range(1, 24)
+    ]
+    assert server.max_in_flight == 2
+
+    transport = MockTransport(server)
+    client = AsyncSCIMClient(transport, [User])
+
+    async def run_from_index():
+        return [
+            page
+            async for page in client.iter_pages(
+                User, SearchRequest(start_index=16), count=5
+            )
+        ]
+
+    pages = asyncio.run(run_from_index())
+    assert [page.start_index for page in pages] == [16, 21]
+    assert len(transport.requests) == 2
+
+
+def test_iter_pages_interrupted():
+    """Prefetched pages are cancelled when the iteration stops."""
+    server = FakeServer([make_user(index) for index in range(1, 11)], max_count=2)
+    transport = MockTransport(server)
+    client = AsyncSCIMClient(transport, [User])
+
+    async def run():
+        pages = client.iter_pages(User, prefetch=3)
+        assert (await pages.__anext__()).start_index == 1
+        await pages.aclose()
+        await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+    assert len(transport.requests) <= 4
+
+    server = FakeServer()
+    client = AsyncSCIMClient(MockTransport(server), [User])
+
+    async def run_empty():
+        return [page async for page in client.iter_pages()]
+
+    (page,) = asyncio.run(run_empty())
+    assert page.total_results == 0
+
+
+def test_errors():
+    """Unexpected statuses raise errors with the server Error."""
+
+    def handler(method, url, params, content, headers):
+        if url == "/Users/1":
+            return make_response(
+                404, Error(status=404, detail="Not found").model_dump()
+            )
+        if url == "/Users/2":
+            return TransportResponse(502, b"Bad gateway")
+        return make_response(500, ["unexpected"])
+
+    client = AsyncSCIMClient(MockTransport(handler), [User])
+
+    with pytest.raises(SCIMResponseError, match="404: Not found") as excinfo:
+        asyncio.run(client.query(User, "1"))
+    assert excinfo.value.error.status == 404
+
+    with pytest.raises(SCIMResponseError, match="502: Bad gateway") as excinfo:
+        asyncio.run(client.query(User, "2"))
+    assert excinfo.value.error is None
+
+    with pytest.raises(SCIMResponseError) as excinfo:
+        asyncio.run(client.query(User))
+    assert excinfo.value.error is None
+
+    with pytest.raises(ValueError, match="Unknown resource type 'Group'"):
+        asyncio.run(client.delete(Group, "1"))
+
+
+def test_resource_types():
+    """Endpoints are read from the resource types."""
+
+    def handler(method, url, params, content, headers):
+        resource_type = ResourceType.from_resource(User)
+        resource_type.endpoint = "/Accounts"
+        return make_response(
+            200,
+            {
+                "schemas": [LIST_RESPONSE_SCHEMA],
+                "totalResults": 2,
+                "Resources": [
+                    resource_type.model_dump(),
+                    {
+                        "schemas": [ResourceType.model_fields["schemas"].default[0]],
+                        "id": "Device",
+                        "name": "Device",
+                        "endpoint": "/Devices",
+                        "schema": "urn:example:Device",
+                    },
+                ],
+            },
+        )
+
+    group_type = ResourceType.from_resource(Group)
+    group_type.endpoint = "/Teams"
+    client = AsyncSCIMClient(
+        MockTransport(handler), [User, Group], resource_type_definitions=[group_type]
+    )
+    assert client.get_endpoint(User) == "/Users"
+    assert client.get_endpoint(Group) == "/Teams"
+
+    resource_type, _ = asyncio.run(client.discover())
+    assert resource_type.endpoint == "/Accounts"
+    assert client.get_endpoint(User) == "/Accounts"
+
+
+def test_bulk():
+    """Bulk requests are sent to the Bulk endpoint."""
+
+    def handler(method, url, params, content, headers):
+        assert (method, url) == ("POST", "/Bulk")
+        operation = json.loads(content)["Operations"][0]
+        return make_response(
+            200,
+            {
+                "schemas": ["urn:ietf:params:scim:api:messages:2.0:BulkResponse"],
+                "Operations": [{**operation, "location": "/Users/1", "status": "201"}],
+            },
+        )
+
+    client = AsyncSCIMClient(MockTransport(handler), [User])
+    bulk_request = BulkRequest(
+        operations=[
+            BulkOperation(
+                method=BulkOperation.Method.post,
+                path="/Users",
+                bulk_id="1",
+                data={"schemas": [USER_SCHEMA], "userName": "bjensen"},
+            )
+        ]
+    )
+    response = asyncio.run(client.bulk(bulk_request))
+    assert response.operations[0].status == 201
+    assert response.operations[0].location == "/Users/1"
+
+
+def test_asgi_transport():
+    """Requests are sent to ASGI applications in the same process."""
+
+    async def app(scope, receive, send):
+        assert scope["path"] == "/scim/v2/Users/1"
+        assert scope["query_string"] == b"attributes=userName"
+        assert (b"accept", b"application/scim+json") in scope["headers"]
+        assert (await receive())["body"] == b""
+        assert (await receive())["type"] == "http.disconnect"
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"etag", b'W/"1"')],
+            }
+        )
+        await send({"type": "http.response.body", "body": b'{"schemas": ["'})
+        await send(
+            {
+                "type": "http.response.body",
+                "body": f'{USER_SCHEMA}"], "id": "1"}}'.encode(),
+            }
+        )
+
+    async def run():
+        transport = ASGITransport(app, root_path="/scim/v2")
+        response = await transport.request(
+            "GET",
+            "/Users/1",
+            params={"attributes": "userName"},
+            headers={"Accept": "application/scim+json"},
+        )
+        assert response.headers == {"etag": 'W/"1"'}
+        client = AsyncSCIMClient(transport, [User])
+        return await client.query(User, "1", SearchRequest(attributes=["userName"]))
+
+    assert asyncio.run(run()).id == "1"
+
+
+def test_httpx_transport():
+    """Requests are sent with httpx clients."""
+    httpx = pytest.importorskip("httpx")
+
+    def handler(request):
+        assert str(request.url) == "https://scim.example/v2/Users/1"
+        return httpx.Response(200, json=make_user(1))
+
+    async def run():
+        transport = HTTPXTransport(
+            httpx.AsyncClient(
+                base_url="https://scim.example/v2",
+                transport=httpx.MockTransport(handler),
+            )
+        )
+        async with AsyncSCIMClient(transport, [User]) as client:
+            user = await client.query(User, "1")
+        assert transport.client.is_closed
+        return user
+
+    assert asyncio.run(run()).user_name == "user1"
+    assert HTTPXTransport(base_url="https://scim.example").client.base_url == (
+        "https://scim.example"
+    )
+
+
+def test_missing_httpx(monkeypatch):
+    """The httpx transport needs httpx to be installed."""
+    monkeypatch.setitem(sys.modules, "httpx", None)
+    with pytest.raises(ImportError, match="httpx"):
+        HTTPXTransport()
+
+
+def test_lazy_imports():
+    """The client, the backend, the pool and the fingerprints are imported on first use."""
+    code = (
+        "import sys, scim2_models; "
+        "modules = ['client', 'backend', 'pool', 'fingerprint']; "
+        "print([m for m in modules if f'scim2_models.{m}' in sys.modules], "
+        "'httpx' in sys.modules); "
+        "scim2_models.AsyncSCIMClient; "
+        "print('scim2_models.client' in sys.modules, 'httpx' in sys.modules)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.split("\n")[:2] == ["[] False", "True False"]
+
+    assert scim2_models.InMemoryBackend is InMemoryBackend
+    with pytest.raises(AttributeError, match="has no attribute 'Missing'"):
+        scim2_models.__getattr__("Missing")
+
+
+class VersionedServer:
+    """Answer with a user, or with a 304 status if its version matches 'If-None-Match'."""
+
+    def __init__(self):
+        self.version = 'W/"1"'
+        self.headers = []
+
+    async def __call__(self, method, url, params, content, headers):
+        self.headers.append(headers)
+        await asyncio.sleep(0.001)
+        if url == "/Users/404":
+            return make_response(404, Error(status=404).model_dump())
+        if headers.get("If-None-Match") == self.version:
+            return make_response(304)
+        user = make_user(1)
+        user["meta"]["version"] = self.version
+        return make_response(200, user)
+
+
+def test_cache_coalescing():
+    """Concurrent requests of a resource share a single request and the same model."""
+    server = VersionedServer()
+    transport = MockTransport(server)
+    cache = ResourceCache(AsyncSCIMClient(transport, [User]))
+
+    async def run():
+        return await asyncio.gather(*(cache.get(User, "1") for _ in range(10)))
+
+    users = asyncio.run(run())
+    assert len(transport.requests) == 1
+    assert all(user is users[0] for user in users)
+    assert users[0].user_name == "user1"
+    assert users[0].to_model().meta.version == 'W/"1"'
+    assert cache.in_flight == {}
+
+    async def run_errors():
+        return await asyncio.gather(
+            cache.get(User, "404"), cache.get(User, "404"), return_exceptions=True
+        )
+
+    errors = asyncio.run(run_errors())
+    assert errors[0] is errors[1]
+    assert isinstance(errors[0], SCIMResponseError)
+    assert len(transport.requests) == 2
+    assert cache.in_flight == {}
+
+
+def test_cache_cancellation():
+    """Cancelling a caller does not cancel the request shared with the other callers."""
+    cache = ResourceCache(AsyncSCIMClient(MockTransport(VersionedServer()), [User]))
+
+    async def run():
+        first = asyncio.ensure_future(cache.get(User, "1"))
+        second = asyncio.ensure_future(cache.get(User, "1"))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()).id == "1"
+    assert cache.in_flight == {}
+    assert cache.waiters == {}
+
+    async def run_all_cancelled():
+        callers = [asyncio.ensure_future(cache.get(User, "404")) for _ in range(2)]
+        await asyncio.sleep(0)
+        future = cache.in_flight[(User, "404")]
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        assert cache.in_flight == {}
+        await asyncio.sleep(0.01)
+        return future
+
+    # the shared request is cancelled when all its callers are cancelled
+    loop = asyncio.new_event_loop()
+    errors = []
+    loop.set_exception_handler(lambda loop, context: errors.append(context))
+    try:
+        future = loop.run_until_complete(run_all_cancelled())
+    finally:
+        loop.close()
+    assert future.cancelled()
+    assert cache.waiters == {}
+    del future
+    gc.collect()
+    assert errors == []
+
+
+def test_cache_revalidation():
+    """Expired resources are revalidated with their version."""
+    now = [0]
+    server = VersionedServer()
+    cache = ResourceCache(
+        AsyncSCIMClient(MockTransport(server), [User]), ttl=10, clock=lambda: now[0]
+    )
+
+    user = asyncio.run(cache.get(User, "1"))
+    now[0] = 5
+    assert asyncio.run(cache.get(User, "1")) is user
+    assert len(server.headers) == 1
+
+    now[0] = 10
+    assert asyncio.run(cache.get(User, "1")) is user
+    assert server.headers[1]["If-None-Match"] == 'W/"1"'
+
+    now[0] = 25
+    server.version = 'W/"2"'
+    updated_user = asyncio.run(cache.get(User, "1"))
+    assert updated_user.meta.version == 'W/"2"'
+    assert len(server.headers) == 3
+
+    cache.invalidate(User, "1")
+    cache.invalidate(User, "2")
+    asyncio.run(cache.get(User, "1"))
+    assert "If-None-Match" not in server.headers[3]
+
+    cache.clear()
+    assert cache.entries == {}
+
+
+def test_cache_without_version():
+    """Expired resources without version are retrieved again."""
+    now = [0]
+    transport = MockTransport(lambda *args: make_response(200, make_user(1)))
+    cache = ResourceCache(
+        AsyncSCIMClient(transport, [User]), ttl=10, clock=lambda: now[0]
+    )
+    user = asyncio.run(cache.get(User, "1"))
+    now[0] = 10
+    assert asyncio.run(cache.get(User, "1")) is not user
+    assert len(transport.requests) == 2
+
+
+def test_cache_maxsize():
+    """The least recently used resources are removed when the cache is full."""
+    transport = MockTransport(VersionedServer())
+    cache = ResourceCache(AsyncSCIMClient(transport, [User]), maxsize=2)
+
+    async def run(*ids):
+        for id in ids:
+            await cache.get(User, id)
+
+    asyncio.run(run("1", "2", "1", "3"))
+    assert list(cache.entries) == [(User, "1"), (User, "3")]
+    assert len(transport.requests) == 3
+
+    asyncio.run(run("1", "2"))
+    assert list(cache.entries) == [(User, "1"), (User, "2")]
+    assert len(transport.requests) == 4
+
+
+def test_cache_invalidation_in_flight():
+    """Resources retrieved by requests in flight during an invalidation are not stored."""
+    transport = MockTransport(VersionedServer())
+    cache = ResourceCache(AsyncSCIMClient(transport, [User]))
+
+    async def run(invalidate):
+        requests = len(transport.requests)
+        first = asyncio.ensure_future(cache.get(User, "1"))
+        while len(transport.requests) == requests:
+            await asyncio.sleep(0)
+        invalidate()
+        second = asyncio.ensure_future(cache.get(User, "1"))
+        return await asyncio.gather(first, second)
+
+    first, second = asyncio.run(run(lambda: cache.invalidate(User, "1")))
+    assert first is not second
+    assert len(transport.requests) == 2
+    assert cache.entries[(User, "1")][0] is second
+
+    cache.clear()
+    first, second = asyncio.run(run(cache.clear))
+    assert first is not second
+    assert len(transport.requests) == 4
+    assert cache.entries[(User, "1")][0] is second
+    assert cache.in_flight == {}
+
+
+def test_abstract_transport():
+    """Transports must implement the request method."""
+    with pytest.raises(TypeError, match="abstract"):
+        Transport()
+
+    class CustomTransport(Transport):
+        async def request(self, method, url, params=None, content=None, headers=None):
+            return TransportResponse(204)
+
+    transport = CustomTransport()
+    assert asyncio.run(transport.request("DELETE", "/Users/1")).status_code == 204
+    asyncio.run(transport.aclose())
@@ -0,0 +1,117 @@
+from typing import Annotated
+from typing import Any
+from typing import Optional
+
+import pytest
+from pydantic import ValidationError
+
+from scim2_models import Context
+from scim2_models import EnterpriseUser
+from scim2_models import Group
+from scim2_models import GroupMember
+from scim2_models import Required
+from scim2_models import Resource
+from scim2_models import SchemaCodec
+from scim2_models import User
+
+USER_SCHEMA = "urn:ietf:params:scim:schemas:core:2.0:User"
+ENTERPRISE_SCHEMA = "urn:ietf:params:scim:schemas:extension:enterprise:2.0:User"
+
+
+class Device(Resource):
+    schemas: Annotated[list[str], Required.true] = ["org:example:Device"]
+
+    serial: Optional[str] = None
+    settings: Optional[Any] = None
+
+
+@pytest.fixture
+def user(load_sample):
+    return User[EnterpriseUser].model_validate(
+        load_sample("rfc7643-8.3-enterprise_user.json")
+    )
+
+
+def test_round_trip(user):
+    """Resources are encoded with attribute IDs, and decoded back."""
+    codec = SchemaCodec([User[EnterpriseUser], Group])
+    assert codec.version == 0
+
+    data = codec.dumps(user)
+    assert b"userName" not in data
+    assert ENTERPRISE_SCHEMA.encode() not in data
+    assert len(data) < len(user.model_dump_json())
+    assert codec.loads(data).model_dump() == user.model_dump()
+
+    group = Group(display_name="Admins", members=[GroupMember(value="1")])
+    version, values = codec.pack(group)
+    assert version == 0
+    assert values == {
+        codec.ids["schemas"]: [codec.paths.index(group.schemas[0])],
+        codec.ids["urn:ietf:params:scim:schemas:core:2.0:Group:displayName"]: "Admins",
+        codec.ids["urn:ietf:params:scim:schemas:core:2.0:Group:members"]: [
+            {
+                codec.ids[
+                    "urn:ietf:params:scim:schemas:core:2.0:Group:members.value"
+                ]: "1"
+            }
+        ],
+    }
+    assert codec.unpack([version, values]) == group
+
+
+def test_table_versions(user):
+    """Tables only grow, so older rows can still be decoded."""
+    codec = SchemaCodec([Group])
+    assert codec.version == 0
+    row = codec.dumps(Group(display_name="Admins"))
+
+    new_codec = SchemaCodec([User[EnterpriseUser], Group], table=codec.table)
+    assert new_codec.version == 1
+    assert new_codec.table[0] == codec.table[0]
+    assert new_codec.loads(row).display_name == "Admins"
+    assert SchemaCodec([Group], table=new_codec.table).version == 1
+
+    with pytest.raises(ValueError, match="latest known version is 0"):
+        codec.loads(new_codec.dumps(user))
+
+    # attributes removed from the models are decoded with their last name
+    old_table = [[*new_codec.table[0], f"{USER_SCHEMA}:legacy.value"]]
+    old_codec = SchemaCodec([User], table=old_table)
+    assert old_codec.names[-1] == "value"
+
+    # schemas removed from the models are decoded with their URN
+    user_codec = SchemaCodec([User], table=new_codec.table)
+    assert user_codec.get_name(user_codec.ids[ENTERPRISE_SCHEMA]) == ENTERPRISE_SCHEMA
+    assert (
+        user_codec.get_name(user_codec.ids[f"{ENTERPRISE_SCHEMA}:manager.value"])
+        == "value"
+    )
+    assert user_codec.get_name(user_codec.ids[f"{ENTERPRISE_SCHEMA}:division"]) == (
+        "division"
+    )
+
+
+def test_unknown_attributes():
+    """Attributes that are not in the schemas keep their names."""
+    codec = SchemaCodec([Device])
+    device = Device(serial="123", settings={"1": "one", "color": ["red"]})
+    version, values = codec.pack(device)
+    assert values[codec.ids["org:example:Device:settings"]] == {
+        "~1": "one",
+        "color": ["red"],
+    }
+    assert codec.unpack([version, values]) == device
+
+
+def test_errors(user):
+    """Rows that do not match a resource type or are invalid raise errors."""
+    codec = SchemaCodec([Group], scim_ctx=Context.RESOURCE_QUERY_RESPONSE)
+    with pytest.raises(ValueError, match="No resource type matching"):
+        codec.unpack([0, {}])
+
+    with pytest.raises(ValueError, match="No resource type matching"):
+        codec.unpack([0, {codec.ids["schemas"]: ["urn:unknown"]}])
+
+    with pytest.raises(ValidationError):
+        codec.loads(SchemaCodec([Group]).dumps(Group(display_name="Admins")))
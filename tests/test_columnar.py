@@ -0,0 +1,209 @@
+from collections import Counter
+from typing import Annotated
+from typing import Optional
+
+import pytest
+
+from scim2_models import CaseExact
+from scim2_models import Email
+from scim2_models import EnterpriseUser
+from scim2_models import Group
+from scim2_models import Manager
+from scim2_models import Meta
+from scim2_models import Name
+from scim2_models import Required
+from scim2_models import Resource
+from scim2_models import ResourceTable
+from scim2_models import User
+
+DEPARTMENT = "urn:ietf:params:scim:schemas:extension:enterprise:2.0:User:department"
+
+
+class Measure(Resource):
+    schemas: Annotated[list[str], Required.true] = ["org:example:Measure"]
+
+    code: Annotated[Optional[str], CaseExact.true] = None
+    count: Optional[int] = None
+    ratio: Optional[float] = None
+    tags: Optional[list[str]] = None
+
+
+def make_user(index, department, active=True):
+    user = User[EnterpriseUser](
+        id=str(index),
+        user_name=f"User{index}",
+        name=Name(given_name=f"Given{index}") if index % 2 else None,
+        emails=[
+            Email(value=f"user{index}@example.com", type="work"),
+            Email(value=f"user{index}@home.example", type="home"),
+        ]
+        if index
+        else None,
+        active=active,
+    )
+    user[EnterpriseUser] = EnterpriseUser(
+        department=department, manager=Manager(value="boss")
+    )
+    return user
+
+
+@pytest.fixture
+def users():
+    return [
+        make_user(0, "Tour Operations"),
+        make_user(1, "Tour Operations", active=False),
+        make_user(2, "Theme Park"),
+        make_user(3, "Theme Park"),
+        make_user(4, None),
+    ]
+
+
+def test_round_trip(users):
+    """Resources can be built back from the table."""
+    table = ResourceTable(users)
+    assert len(table) == 5
+    assert table.to_resources() == users
+    assert list(table) == users
+    assert type(table.to_resources()[0]) is User[EnterpriseUser]
+
+
+def test_where(users):
+    """Resources can be filtered on simple, complex, multi-valued and extension attributes."""
+    table = ResourceTable(users)
+    assert table.where("active", "eq", True).values("id") == ["0", "2", "3", "4"]
+    assert table.where("userName", "eq", "user2").values("id") == ["2"]
+    assert table.where("userName", "ne", "user2").values("id") == ["0", "1", "3", "4"]
+    assert table.where("name.givenName", "sw", "given").values("id") == ["1", "3"]
+    assert table.where("name", "pr").values("id") == ["1", "3"]
+    assert len(table.where("userName", "pr")) == 5
+    assert table.where("emails.value", "eq", "USER2@home.example").values("id") == ["2"]
+    assert table.where("emails.type", "eq", "work").values("id") == [
+        "1",
+        "2",
+        "3",
+        "4",
+    ]
+    assert table.where("emails", "pr").values("id") == ["1", "2", "3", "4"]
+    assert table.where(DEPARTMENT, "co", "park").values("id") == ["2", "3"]
+    assert table.where(
+        "urn:ietf:params:scim:schemas:extension:enterprise:2.0:User:manager.value",
+        "EQ",
+        "boss",
+    ).values("id") == ["0", "1", "2", "3", "4"]
+    assert table.where(
+        "urn:ietf:params:scim:schemas:core:2.0:User:userName", "ew", "3"
+    ).values("id") == ["3"]
+
+    active_theme_park = table.where("active", "eq", True).where(
+        DEPARTMENT, "eq", "Theme Park"
+    )
+    assert active_theme_park.values("userName") == ["User2", "User3"]
+    assert active_theme_park.to_resources() == users[2:4]
+
+
+def test_typed_columns():
+    """Numbers are stored in typed arrays, and strings can be case exact."""
+    table = ResourceTable(
+        [
+            Measure(code="a", count=1, ratio=0.5, tags=["x", "y"]),
+            Measure(code="A", count=2, tags=[]),
+            Measure(ratio=2.5, tags=["Y"]),
+        ]
+    )
+    assert table.root.fields["count"].values.typecode == "q"
+    assert table.where("count", "gt", 1).values("code") == ["A"]
+    assert table.where("count", "le", 2).values("code") == ["a", "A"]
+    assert table.where("ratio", "ge", 0.5).values("ratio") == [0.5, 2.5]
+    assert table.where("ratio", "lt", 1).values("ratio") == [0.5]
+    assert table.where("code", "eq", "a").values("count") == [1]
+    assert table.where("tags", "eq", "y").values("code") == ["a", None]
+    assert table.values("tags") == [["x", "y"], [], ["Y"]]
+
+
+def test_where_coerced_operands():
+    """Operands are converted to the column type, and incomparable values do not match."""
+    users = [
+        User(
+            id=str(index),
+            user_name=f"user{index}",
+            meta=Meta(last_modified=f"2011-05-1{index}T04:42:34Z"),
+        )
+        for index in range(3)
+    ]
+    table = ResourceTable(users)
+    assert table.where("meta.lastModified", "gt", "2011-05-11T04:42:34Z").values(
+        "id"
+    ) == ["2"]
+    assert table.where("meta.lastModified", "eq", "2011-05-10T04:42:34Z").values(
+        "id"
+    ) == ["0"]
+    assert len(table.where("meta.lastModified", "gt", "yesterday")) == 0
+    assert len(table.where("userName", "gt", 1)) == 0
+    assert len(table.where("userName", "co", 1)) == 0
+
+    measures = ResourceTable([Measure(count=1), Measure(count=2)])
+    assert measures.where("count", "ge", "2").values("count") == [2]
+    assert len(measures.where("count", "sw", 2)) == 0
+
+
+def test_count_by(users):
+    """Resources can be counted by attribute values."""
+    table = ResourceTable(users)
+    assert table.where("active", "eq", True).count_by(DEPARTMENT) == Counter(
+        {"Theme Park": 2, "Tour Operations": 1, None: 1}
+    )
+
+    table = ResourceTable(
+        [Measure(tags=["x", "y"]), Measure(tags=["x", "y"]), Measure()]
+    )
+    assert table.count_by("tags") == Counter({("x", "y"): 2, None: 1})
+
+
+def test_to_resources_attributes(users):
+    """Resources can be built back with a subset of their attributes."""
+    table = ResourceTable(users).where("userName", "eq", "user1")
+    assert table.to_resources(
+        attributes=["userName", "name", "name.givenName", "emails.value", DEPARTMENT]
+    )[0].model_dump() == {
+        "schemas": [
+            "urn:ietf:params:scim:schemas:core:2.0:User",
+            "urn:ietf:params:scim:schemas:extension:enterprise:2.0:User",
+        ],
+        "id": "1",
+        "userName": "User1",
+        "name": {"givenName": "Given1"},
+        "emails": [
+            {"value": "user1@example.com"},
+            {"value": "user1@home.example"},
+        ],
+        "urn:ietf:params:scim:schemas:extension:enterprise:2.0:User": {
+            "department": "Tour Operations"
+        },
+    }
+
+
+def test_errors(users):
+    """Invalid tables, attributes and operators raise errors."""
+    with pytest.raises(ValueError, match="needs a model"):
+        ResourceTable([])
+
+    assert len(ResourceTable([], model=Group)) == 0
+
+    with pytest.raises(TypeError, match="Cannot store a 'Group'"):
+        ResourceTable([*users, Group(display_name="foo")])
+
+    table = ResourceTable(users)
+    with pytest.raises(ValueError, match="Unknown attribute"):
+        table.where("invalid", "eq", "foo")
+
+    with pytest.raises(ValueError, match="Unknown attribute"):
+        table.where("userName.invalid", "eq", "foo")
+
+    with pytest.raises(ValueError, match="Unknown comparison operator"):
+        table.where("userName", "invalid", "foo")
+
+    with pytest.raises(ValueError, match="multi-valued"):
+        table.values("emails.value")
+
+    with pytest.raises(ValueError, match="can only be tested for presence"):
+        table.where("name", "eq", "foo")
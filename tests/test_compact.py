@@ -0,0 +1,73 @@
+import pickle
+
+import pytest
+
+from scim2_models import CompactModel
+from scim2_models import Email
+from scim2_models import EnterpriseUser
+from scim2_models import Group
+from scim2_models import GroupMember
+from scim2_models import Manager
+from scim2_models import Name
+from scim2_models import User
+
+
+@pytest.fixture
+def user():
+    user = User[EnterpriseUser](
+        id="2819c223-7f76-453a-919d-413861904646",
+        user_name="bjensen",
+        name=Name(given_name="Barbara", family_name="Jensen"),
+        emails=[
+            Email(value="bjensen@example.com", primary=True),
+            Email(value="babs@example.com"),
+        ],
+    )
+    user[EnterpriseUser] = EnterpriseUser(
+        employee_number="701984", manager=Manager(value="26118915")
+    )
+    return user
+
+
+def test_compact_model_class(user):
+    """Compact model classes are built once per model class."""
+    compact_model = User[EnterpriseUser].get_compact_model()
+    assert compact_model is User[EnterpriseUser].get_compact_model()
+    assert compact_model is not User.get_compact_model()
+    assert issubclass(compact_model, CompactModel)
+    assert compact_model.__name__ == "CompactUser[EnterpriseUser]"
+    assert compact_model._fields == tuple(User[EnterpriseUser].model_fields)
+
+
+def test_compact_attributes(user):
+    """Compact models values can be read as attributes, but not modified."""
+    compact = user.to_compact()
+    assert compact.user_name == "bjensen"
+    assert compact.display_name is None
+    assert compact.name.given_name == "Barbara"
+    assert compact.emails[1].value == "babs@example.com"
+    assert isinstance(compact.emails, tuple)
+    assert compact.EnterpriseUser.manager.value == "26118915"
+    assert not hasattr(compact, "__dict__")
+
+    with pytest.raises(AttributeError):
+        compact.user_name = "jsmith"
+
+
+def test_compact_round_trip(user):
+    """Compact models can be converted back to models, and serialized."""
+    compact = user.to_compact()
+    assert compact.to_model() == user
+    assert type(compact.to_model()) is User[EnterpriseUser]
+    assert compact.model_dump() == user.model_dump()
+    assert compact.model_dump_json() == user.model_dump_json()
+
+    group = Group(display_name="Tour Guides", members=[GroupMember(value="bjensen")])
+    assert group.to_compact().to_model() == group
+
+
+def test_compact_pickle():
+    """Compact models can be pickled, for instance to be stored in external caches."""
+    compact = User(user_name="bjensen", name=Name(given_name="Barbara")).to_compact()
+    assert pickle.loads(pickle.dumps(compact)) == compact
+    assert type(pickle.loads(pickle.dumps(compact))) is User.get_compact_model()
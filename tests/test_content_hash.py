@@ -0,0 +1,153 @@
+import datetime
+from typing import Annotated
+from typing import Optional
+
+from scim2_models import CaseExact
+from scim2_models import Email
+from scim2_models import EnterpriseUser
+from scim2_models import Group
+from scim2_models import GroupMember
+from scim2_models import Meta
+from scim2_models import Name
+from scim2_models import PatchOperation
+from scim2_models import Required
+from scim2_models import Resource
+from scim2_models import User
+from scim2_models import X509Certificate
+
+
+class CaseResource(Resource):
+    schemas: Annotated[list[str], Required.true] = ["org:example:CaseResource"]
+
+    case_exact: Annotated[Optional[str], CaseExact.true] = None
+    case_insensitive: Annotated[Optional[str], CaseExact.false] = None
+    count: Optional[int] = None
+    date: Optional[datetime.datetime] = None
+
+
+def test_etag():
+    """ETags are quoted hexadecimal hashes, optionally prefixed for weak ETags."""
+    user = User(user_name="bjensen")
+    etag = user.get_etag()
+    assert etag == f'"{user.get_content_hash(strict=True).hex()}"'
+    assert user.get_etag(weak=True) == f'W/"{user.get_content_hash().hex()}"'
+    assert User(user_name="bjensen").get_etag() == etag
+    assert User(user_name="jsmith").get_etag() != etag
+
+
+def test_etag_case():
+    """Strong ETags differ for representations that only differ by case, weak ETags do not."""
+    user = User(user_name="bjensen", name=Name(given_name="Barbara"))
+    other = User(user_name="BJensen", name=Name(given_name="BARBARA"))
+    assert user.get_etag(weak=True) == other.get_etag(weak=True)
+    assert user.get_etag() != other.get_etag()
+
+    other.user_name = "bjensen"
+    assert user.get_etag() != other.get_etag()
+    other.name.given_name = "Barbara"
+    assert user.get_etag() == other.get_etag()
+
+    # cached hashes of both modes are kept apart
+    assert user.get_content_hash(strict=True) != user.get_content_hash()
+    user.emails = [Email(value="bjensen@example.com")]
+    other.emails = [Email(value="BJensen@example.com")]
+    assert user.get_etag() != other.get_etag()
+    assert user.get_etag(weak=True) == other.get_etag(weak=True)
+
+
+def test_content_hash_ignored_fields():
+    """The meta attribute and the attributes never returned are not hashed."""
+    user = User(user_name="bjensen", password="foo")
+    other = User(
+        user_name="bjensen",
+        password="bar",
+        meta=Meta(resource_type="User", version='W/"3694e05e9dff590"'),
+    )
+    assert user.get_content_hash() == other.get_content_hash()
+    assert [field_name for field_name, _ in User.get_hashed_fields()] == sorted(
+        set(User.model_fields) - {"meta", "password"}
+    )
+
+
+def test_content_hash_case_exact():
+    """Strings are compared case-insensitively, unless annotated with CaseExact.true."""
+    resource = CaseResource(case_exact="foo", case_insensitive="foo")
+    assert (
+        resource.get_content_hash()
+        == CaseResource(case_exact="foo", case_insensitive="FOO").get_content_hash()
+    )
+    assert (
+        resource.get_content_hash()
+        != CaseResource(case_exact="FOO", case_insensitive="foo").get_content_hash()
+    )
+
+
+def test_content_hash_values():
+    """Values of different types or in different fields have different hashes."""
+    date = datetime.datetime(2010, 1, 23, 4, 56, 22, tzinfo=datetime.timezone.utc)
+    hashes = {
+        CaseResource().get_content_hash(),
+        CaseResource(count=1).get_content_hash(),
+        CaseResource(case_exact="1").get_content_hash(),
+        CaseResource(case_insensitive="1").get_content_hash(),
+        CaseResource(date=date).get_content_hash(),
+        CaseResource(date=date.replace(year=2011)).get_content_hash(),
+    }
+    assert len(hashes) == 6
+
+
+def test_content_hash_bytes_and_enums():
+    """Binary and enumeration values are hashed."""
+    user = User(user_name="bjensen", x509_certificates=[X509Certificate(value="Zm9v")])
+    other = User(user_name="bjensen", x509_certificates=[X509Certificate(value="YmFy")])
+    assert user.get_content_hash() != other.get_content_hash()
+
+    operation = PatchOperation(op=PatchOperation.Op.add, path="userName")
+    other_operation = PatchOperation(op=PatchOperation.Op.remove, path="userName")
+    assert operation.get_content_hash() != other_operation.get_content_hash()
+
+
+def test_content_hash_complex_attributes():
+    """Complex attributes, multi-valued attributes and extensions are hashed."""
+    user = User[EnterpriseUser](
+        user_name="bjensen",
+        name=Name(given_name="Barbara"),
+        emails=[Email(value="bjensen@example.com"), Email(value="babs@example.com")],
+    )
+    user[EnterpriseUser] = EnterpriseUser(employee_number="701984")
+    content_hash = user.get_content_hash()
+
+    other = user.model_copy(deep=True)
+    other.emails.reverse()
+    assert other.get_content_hash() == content_hash
+
+    other.name.given_name = "Barb"
+    assert other.get_content_hash() != content_hash
+    other.name.given_name = "Barbara"
+    assert other.get_content_hash() == content_hash
+
+    other.emails.append(Email(value="barbara@example.com"))
+    assert other.get_content_hash() != content_hash
+    other.emails.pop()
+
+    other[EnterpriseUser].employee_number = "701985"
+    assert other.get_content_hash() != content_hash
+
+
+def test_content_hash_modifications():
+    """Field hashes follow the assignments and the in place modifications."""
+    group = Group(display_name="Tour Guides", members=[GroupMember(value="bjensen")])
+    content_hash = group.get_content_hash()
+    assert group.get_field_hash("external_id", case_exact=True) is None
+
+    group.display_name = "Tour Operators"
+    assert group.get_content_hash() != content_hash
+    copy = group.model_copy(update={"display_name": "Tour Guides"})
+    assert copy.get_content_hash() == content_hash
+
+    group.display_name = "Tour Guides"
+    assert group.get_content_hash() == content_hash
+    group.members[0].value = "jsmith"
+    assert group.get_content_hash() != content_hash
+    group.members.append(GroupMember(value="bjensen"))
+    assert group.get_content_hash() != content_hash
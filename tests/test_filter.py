@@ -0,0 +1,155 @@
+import pytest
+
+from scim2_models import EnterpriseUser
+from scim2_models import User
+from scim2_models.filter import get_payload_values
+from scim2_models.filter import match_filter
+from scim2_models.filter import parse_filter
+
+
+def test_parse_filter():
+    """Filters are parsed with the logical operators precedence."""
+    assert parse_filter(
+        'userName Eq "bjensen" and (title pr or not (emails[type eq "work"])) or x gt 1'
+    ) == (
+        "or",
+        (
+            "and",
+            ("eq", "userName", "bjensen"),
+            (
+                "or",
+                ("pr", "title", None),
+                ("not", ("[]", "emails", ("eq", "type", "work"))),
+            ),
+        ),
+        ("gt", "x", 1),
+    )
+    assert parse_filter("active eq true ") == ("eq", "active", True)
+    assert parse_filter('name.familyName co "O\\"Malley"') == (
+        "co",
+        "name.familyName",
+        'O"Malley',
+    )
+
+
+@pytest.mark.parametrize(
+    "filter",
+    [
+        "",
+        "userName",
+        'userName foo "bjensen"',
+        "userName eq",
+        "userName eq (",
+        "userName eq bjensen",
+        '"bjensen" eq userName',
+        'userName eq "bjensen" )',
+        '(userName eq "bjensen"',
+        'not userName eq "bjensen"',
+        'userName eq "bjensen',
+    ],
+)
+def test_invalid_filters(filter):
+    """Invalid filters raise a ValueError."""
+    with pytest.raises(ValueError):
+        parse_filter(filter)
+
+
+def test_match_filter():
+    """Payloads are matched case-insensitively, with multi-valued attributes matching any value."""
+    payload = {
+        "schemas": ["urn:ietf:params:scim:schemas:core:2.0:User"],
+        "userName": "BJensen",
+        "active": True,
+        "emails": [
+            {"value": "bjensen@example.com", "type": "work"},
+            {"value": "babs@example.com", "type": "home"},
+        ],
+        "meta": {"lastModified": "2011-05-13T04:42:34Z"},
+        "title": "",
+        "urn:ietf:params:scim:schemas:extension:enterprise:2.0:User": {
+            "employeeNumber": "701984",
+            "costCenter": 4130,
+        },
+    }
+    matching_filters = [
+        'username eq "bjensen"',
+        "active eq true",
+        'emails.value ew "@EXAMPLE.COM"',
+        'emails[type eq "home" and value sw "babs"]',
+        'meta.lastModified gt "2011-05-13T00:00:00Z"',
+        'urn:ietf:params:scim:schemas:core:2.0:User:userName co "jens"',
+        'urn:ietf:params:scim:schemas:extension:enterprise:2.0:User:employeeNumber eq "701984"',
+        "urn:ietf:params:scim:schemas:extension:enterprise:2.0:User:costCenter ge 4130",
+        "urn:ietf:params:scim:schemas:extension:enterprise:2.0:User:costCenter lt 5000.5",
+        "urn:ietf:params:scim:schemas:extension:enterprise:2.0:User:costCenter le 4130",
+        'nickName ne "Babs"',
+        "not (title pr)",
+        "title pr or userName pr",
+    ]
+    for filter in matching_filters:
+        assert match_filter(parse_filter(filter), payload), filter
+
+    failing_filters = [
+        'userName ne "bjensen"',
+        'emails[type eq "home" and value sw "bjensen"]',
+        'userName[type eq "home"]',
+        "userName gt 1",
+        "urn:ietf:params:scim:schemas:extension:enterprise:2.0:User:costCenter co 4",
+        "urn:ietf:params:scim:schemas:extension:enterprise:2.0:User:costCenter gt 4130",
+        "title pr and userName pr",
+        "nickName pr",
+    ]
+    for filter in failing_filters:
+        assert not match_filter(parse_filter(filter), payload), filter
+
+
+def test_missing_extension():
+    """Paths of extensions that are missing from the payloads have no values."""
+    payload = {
+        "schemas": ["urn:ietf:params:scim:schemas:core:2.0:User"],
+        "userName": "bjensen",
+    }
+    attribute = "urn:ietf:params:scim:schemas:extension:enterprise:2.0:User:userName"
+    assert get_payload_values(payload, attribute) == []
+    assert not match_filter(parse_filter(f"{attribute} pr"), payload)
+
+    # the resource schema is read from the model, when it is known
+    attribute = "urn:ietf:params:scim:schemas:core:2.0:User:userName"
+    assert get_payload_values(payload, attribute) == ["bjensen"]
+    assert get_payload_values({"userName": "bjensen"}, attribute) == []
+    assert get_payload_values({"userName": "bjensen"}, attribute, User) == ["bjensen"]
+
+
+def test_case_exact_attributes():
+    """Attributes annotated with CaseExact.true are compared case-exactly when the model is known."""
+    payload = {
+        "schemas": [
+            "urn:ietf:params:scim:schemas:core:2.0:User",
+            "urn:ietf:params:scim:schemas:extension:enterprise:2.0:User",
+        ],
+        "id": "2819c223",
+        "externalId": "BJensen",
+        "userName": "BJensen",
+        "emails": [{"value": "bjensen@example.com", "type": "work"}],
+        "urn:ietf:params:scim:schemas:extension:enterprise:2.0:User": {
+            "manager": {"value": "26118915"},
+        },
+    }
+    for filter in (
+        'externalId eq "bjensen"',
+        'id sw "2819C"',
+        'externalId ne "bjensen"',
+    ):
+        assert match_filter(parse_filter(filter), payload) != (
+            match_filter(parse_filter(filter), payload, User[EnterpriseUser])
+        ), filter
+
+    matching_filters = [
+        'externalId eq "BJensen"',
+        'userName eq "bjensen"',
+        'emails[type eq "WORK"]',
+        'urn:ietf:params:scim:schemas:extension:enterprise:2.0:User:manager.value eq "26118915"',
+        'unknown.value eq "foo" or userName pr',
+    ]
+    for filter in matching_filters:
+        assert match_filter(parse_filter(filter), payload, User[EnterpriseUser]), filter
@@ -0,0 +1,125 @@
+import datetime
+
+import pytest
+
+from scim2_models import FingerprintStore
+from scim2_models import Group
+from scim2_models import Meta
+from scim2_models import User
+
+
+def make_users(*names):
+    return [User(id=name, user_name=name) for name in names]
+
+
+def test_changes(tmp_path):
+    """New and modified resources are yielded, then deleted resources."""
+    path = tmp_path / "fingerprints.sqlite"
+    with FingerprintStore(path, batch_size=2) as store:
+        users = make_users("bjensen", "jsmith", "jdoe")
+        assert list(store.changes(users)) == [(user.id, user) for user in users]
+        assert len(store) == 3
+        assert "bjensen" in store
+        assert store.get_fingerprint("bjensen") == users[0].get_content_hash(
+            strict=True
+        )
+
+    with FingerprintStore(path, batch_size=2) as store:
+        users = make_users("bjensen", "jsmith", "jdoe")
+        assert list(store.changes(users)) == []
+
+        users = make_users("bjensen", "jsmith", "alice")
+        users[1].display_name = "John Smith"
+        assert list(store.changes(users)) == [
+            ("jsmith", users[1]),
+            ("alice", users[2]),
+            ("jdoe", None),
+        ]
+        assert len(store) == 3
+        assert "jdoe" not in store
+        assert store.get_fingerprint("jdoe") is None
+
+
+def test_changes_namespaces(tmp_path):
+    """Resources of different namespaces are independent."""
+    path = tmp_path / "fingerprints.sqlite"
+    users = FingerprintStore(path, namespace="User")
+    groups = FingerprintStore(path, namespace="Group")
+
+    assert list(users.changes(make_users("bjensen"))) == [
+        ("bjensen", make_users("bjensen")[0])
+    ]
+    group = Group(id="bjensen", display_name="bjensen")
+    assert list(groups.changes([group])) == [("bjensen", group)]
+    assert list(users.changes([])) == [("bjensen", None)]
+    assert len(users) == 0
+    assert len(groups) == 1
+    users.close()
+    groups.close()
+
+
+def test_changes_last_modified():
+    """Resources with an unchanged last modification date are not hashed."""
+    meta = Meta(
+        last_modified=datetime.datetime(
+            2011, 5, 13, 4, 42, 34, tzinfo=datetime.timezone.utc
+        )
+    )
+    user = User(id="bjensen", user_name="bjensen", meta=meta)
+    store = FingerprintStore()
+    assert list(store.changes([user])) == [("bjensen", user)]
+
+    user.display_name = "Barbara Jensen"
+    assert list(store.changes([user])) == []
+
+    user.meta = meta.model_copy(
+        update={"last_modified": meta.last_modified + datetime.timedelta(days=1)}
+    )
+    assert list(store.changes([user])) == [("bjensen", user)]
+
+    user.meta = meta.model_copy(update={"last_modified": None, "version": "foo"})
+    assert list(store.changes([user])) == []
+
+
+def test_changes_interrupted():
+    """The store is not updated when the changes are not entirely consumed."""
+    store = FingerprintStore()
+    changes = store.changes(make_users("bjensen", "jsmith"))
+    assert next(changes)[0] == "bjensen"
+    changes.close()
+    assert not store.connection.in_transaction
+    assert len(store) == 0
+
+    with pytest.raises(ValueError, match="has no id"):
+        list(store.changes([User(user_name="bjensen")]))
+    assert len(store) == 0
+
+
+def test_changes_case():
+    """Modifications that only change the case of a value are detected."""
+    user = User(id="bjensen", user_name="bob")
+    store = FingerprintStore()
+    assert list(store.changes([user])) == [("bjensen", user)]
+
+    user.user_name = "Bob"
+    assert list(store.changes([user])) == [("bjensen", user)]
+    assert list(store.changes([user])) == []
+
+
+def test_changes_never_returned():
+    """Modifications of attributes that are never returned are detected."""
+    user = User(id="bjensen", user_name="bjensen", password="foo")
+    store = FingerprintStore()
+    assert list(store.changes([user])) == [("bjensen", user)]
+
+    user.password = "bar"
+    assert list(store.changes([user])) == [("bjensen", user)]
+    assert list(store.changes([user])) == []
+
+
+def test_changes_duplicates():
+    """Resources read several times are only stored once."""
+    store = FingerprintStore(batch_size=1)
+    users = make_users("bjensen", "bjensen")
+    assert list(store.changes(users)) == [("bjensen", users[0])]
+    assert len(store) == 1
@@ -0,0 +1,156 @@
+import datetime
+import json
+from collections import UserString
+
+import pytest
+
+from scim2_models import Context
+from scim2_models import EnterpriseUser
+from scim2_models import Group
+from scim2_models import Mutability
+from scim2_models import NDJSONReader
+from scim2_models import User
+from scim2_models import X509Certificate
+from scim2_models import get_json_backend
+from scim2_models import json_backend
+from scim2_models import json_dumps
+from scim2_models import json_loads
+from scim2_models import set_json_backend
+from scim2_models.json_backend import JSON_BACKENDS
+from scim2_models.json_backend import is_json_backend_installed
+
+INSTALLED_BACKENDS = [
+    pytest.param(
+        backend,
+        marks=pytest.mark.skipif(
+            not is_json_backend_installed(backend),
+            reason=f"{backend} is not installed",
+        ),
+    )
+    for backend in JSON_BACKENDS
+]
+
+
+@pytest.fixture
+def backend(request):
+    previous = get_json_backend()
+    set_json_backend(request.param)
+    yield request.param
+    set_json_backend(previous)
+
+
+@pytest.fixture
+def user(load_sample):
+    user = User[EnterpriseUser].model_validate(
+        load_sample("rfc7643-8.2-user-full.json")
+    )
+    user.x509_certificates = [X509Certificate(value="AAFoZWxsbw==")]
+    user[EnterpriseUser] = EnterpriseUser(employee_number="701984")
+    return user
+
+
+@pytest.mark.parametrize("backend", INSTALLED_BACKENDS, indirect=True)
+def test_dumps_like_pydantic(backend, user):
+    """Backends dump SCIM payloads as pydantic does."""
+    assert get_json_backend() == backend
+    for scim_ctx in (Context.DEFAULT, Context.RESOURCE_QUERY_RESPONSE):
+        expected = user.model_dump_json(scim_ctx=scim_ctx).encode()
+        assert json_dumps(user.model_dump(scim_ctx=scim_ctx)) == expected
+        assert json_loads(expected) == json_loads(expected.decode())
+
+    payload = user.model_dump(mode="python")
+    if backend != "msgspec":
+        assert json_dumps(payload) == user.model_dump_json().encode()
+
+
+@pytest.mark.parametrize("backend", INSTALLED_BACKENDS, indirect=True)
+def test_dumps_python_values(backend):
+    """Values that have no JSON representation are converted."""
+    payload = {
+        "ref": UserString("https://example.com/Users/1"),
+        "utc": datetime.datetime(2010, 1, 23, 4, 56, 22, tzinfo=datetime.timezone.utc),
+        "local": datetime.datetime(2010, 1, 23, 4, 56, 22),
+        "date": datetime.date(2010, 1, 23),
+        "time": datetime.time(4, 56),
+        "enum": Mutability.read_only,
+        "context": Context.DEFAULT,
+        "unicode": "Bärbel",
+    }
+    assert json.loads(json_dumps(payload)) == {
+        "ref": "https://example.com/Users/1",
+        "utc": "2010-01-23T04:56:22Z",
+        "local": "2010-01-23T04:56:22",
+        "date": "2010-01-23",
+        "time": "04:56:00",
+        "enum": "readOnly",
+        "context": Context.DEFAULT.value,
+        "unicode": "Bärbel",
+    }
+
+    with pytest.raises(TypeError):
+        json_dumps({"foo": object()})
+
+    with pytest.raises(ValueError):
+        json_loads(b'{"foo": ')
+
+
+@pytest.mark.parametrize("backend", INSTALLED_BACKENDS, indirect=True)
+def test_ndjson_reader(backend):
+    """NDJSON streams are parsed with the selected backend."""
+    lines = [
+        b'{"schemas": ["urn:ietf:params:scim:schemas:core:2.0:User"], "userName": "bjensen"}',
+        b'{"schemas": ["urn:ietf:params:scim:schemas:core:2.0:User"], "userName": ',
+    ]
+    resources = iter(NDJSONReader(lines, [User, Group]))
+    assert next(resources).user_name == "bjensen"
+    with pytest.raises(ValueError, match="Line 2"):
+        next(resources)
+
+
+def test_set_json_backend():
+    """The fastest installed backend is selected by default."""
+    previous = get_json_backend()
+    try:
+        assert set_json_backend() == next(
+            backend for backend in JSON_BACKENDS if is_json_backend_installed(backend)
+        )
+        assert set_json_backend("json") == "json"
+
+        with pytest.raises(ValueError, match="Unknown JSON backend"):
+            set_json_backend("invalid")
+        assert get_json_backend() == "json"
+
+    finally:
+        set_json_backend(previous)
+
+
+def test_missing_backend(monkeypatch):
+    """Selecting a backend that is not installed raises an ImportError."""
+    monkeypatch.setattr("scim2_models.json_backend.orjson", None)
+    monkeypatch.setattr("scim2_models.json_backend.msgspec", None)
+    assert not is_json_backend_installed("orjson")
+    for backend in ("orjson", "msgspec"):
+        with pytest.raises(ImportError, match="not installed"):
+            set_json_backend(backend)
+
+
+@pytest.mark.parametrize("function", [json_dumps, json_loads])
+def test_lazy_backend(monkeypatch, function):
+    """The backend is selected the first time JSON is encoded or parsed."""
+    monkeypatch.setattr("scim2_models.json_backend.BACKEND_NAME", None)
+    monkeypatch.setattr(
+        "scim2_models.json_backend.BACKEND_DUMPS", json_backend.lazy_dumps
+    )
+    monkeypatch.setattr(
+        "scim2_models.json_backend.BACKEND_LOADS", json_backend.lazy_loads
+    )
+    monkeypatch.setattr("scim2_models.json_backend.orjson", None)
+    assert function(b"{}" if function is json_loads else {}) in ({}, b"{}")
+    assert get_json_backend() == ("msgspec" if json_backend.msgspec else "json")
+
+
+@pytest.mark.skipif(not is_json_backend_installed("msgspec"), reason="no msgspec")
+def test_msgspec_dumps():
+    """The msgspec backend returns the bytes of its encoder."""
+    dumps, _ = json_backend.get_backend_functions("msgspec")
+    assert dumps.__self__.__class__ is json_backend.msgspec.json.Encoder
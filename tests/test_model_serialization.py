@@ -2,6 +2,7 @@ from typing import Annotated
 from typing import Optional
 
 import pytest
+from pydantic import BaseModel as PydanticBaseModel
 
 from scim2_models.base import ComplexAttribute
 from scim2_models.base import Context
@@ -347,3 +348,40 @@ def test_dump_response(context, ret_resource):
             "defaultReturned": "x",
         },
     }
+
+
+@pytest.mark.parametrize("context", list(Context))
+def test_specialized_serializer(context, mut_resource, ret_resource):
+    """The context specialized serializers produce the same payloads than the regular serializers."""
+    for resource in (mut_resource, ret_resource):
+        assert resource.get_scim_serializer(context) is resource.get_scim_serializer(
+            context
+        )
+
+        dump_kwargs = resource._prepare_model_dump(context)
+        expected_json = PydanticBaseModel.model_dump_json(resource, **dump_kwargs)
+        expected = PydanticBaseModel.model_dump(resource, mode="json", **dump_kwargs)
+        assert resource.model_dump_json(scim_ctx=context) == expected_json
+        assert resource.model_dump(scim_ctx=context) == expected
+
+
+def test_specialized_serializer_exclude_none(mut_resource):
+    """The regular serializer is used when the specialized one cannot be equivalent."""
+    mut_resource.read_write = None
+    assert mut_resource.model_dump(
+        scim_ctx=Context.RESOURCE_CREATION_REQUEST, exclude_none=False
+    ) == {
+        "schemas": ["org:example:MutResource"],
+        "immutable": "x",
+        "writeOnly": "x",
+    }
+
+
+def test_specialized_serializer_attributes(ret_resource):
+    """The regular serializer is used when attributes are included or excluded in responses."""
+    assert (
+        ret_resource.model_dump_json(
+            scim_ctx=Context.RESOURCE_QUERY_RESPONSE, attributes=["alwaysReturned"]
+        )
+        == '{"schemas":["org:example:SupRetResource"],"id":"id","alwaysReturned":"x"}'
+    )
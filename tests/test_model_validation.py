@@ -1,7 +1,9 @@
+import json
 from typing import Annotated
 from typing import Optional
 
 import pytest
+from pydantic import ConfigDict
 from pydantic import ValidationError
 
 from scim2_models.base import ComplexAttribute
@@ -9,7 +11,10 @@ from scim2_models.base import Context
 from scim2_models.base import Mutability
 from scim2_models.base import Required
 from scim2_models.base import Returned
+from scim2_models.base import specialize_validation_schema
 from scim2_models.rfc7643.resource import Resource
+from scim2_models.rfc7643.user import User
+from scim2_models.rfc7644.patch_op import PatchOp
 
 
 class RetResource(Resource):
@@ -255,6 +260,74 @@ def test_validate_replacement_request_mutability_sub_attributes():
         )
 
 
+def test_get_immutable_paths():
+    """The immutable paths go through single-valued complex attributes only."""
+
+    class Sub(ComplexAttribute):
+        immutable: Annotated[Optional[str], Mutability.immutable] = None
+        read_write: Optional[str] = None
+
+    class Recursive(ComplexAttribute):
+        immutable: Annotated[Optional[str], Mutability.immutable] = None
+        child: Optional["Recursive"] = None
+
+    class Super(Resource):
+        schemas: Annotated[list[str], Required.true] = ["org:example:Super"]
+        immutable: Annotated[Optional[str], Mutability.immutable] = None
+        sub: Annotated[Optional[Sub], Mutability.immutable] = None
+        subs: Optional[list[Sub]] = None
+        recursive: Optional[Recursive] = None
+
+    assert Super.get_immutable_paths() == (
+        ("immutable",),
+        ("sub",),
+        ("sub", "immutable"),
+        ("recursive", "immutable"),
+    )
+    assert Super.get_immutable_paths() is Super.get_immutable_paths()
+    assert MutResource.get_immutable_paths() == (("immutable",),)
+
+    original = Super(sub=Sub(immutable="y"))
+    Super.model_validate(
+        {"sub": {"immutable": "y"}, "subs": [{"immutable": "x"}]},
+        scim_ctx=Context.RESOURCE_REPLACEMENT_REQUEST,
+        original=original,
+    )
+
+
+def test_validate_replacement_request_mutability_recursive_attributes():
+    """Immutable fields of recursive complex attributes are checked at any depth."""
+
+    class Recursive(ComplexAttribute):
+        immutable: Annotated[Optional[str], Mutability.immutable] = None
+        child: Optional["Recursive"] = None
+
+    class Tree(Resource):
+        schemas: Annotated[list[str], Required.true] = ["org:example:Tree"]
+        root: Optional[Recursive] = None
+
+    original = Tree(
+        root=Recursive(immutable="a", child=Recursive(child=Recursive(immutable="c")))
+    )
+    Tree.model_validate(
+        {"root": {"immutable": "a", "child": {"child": {"immutable": "c"}}}},
+        scim_ctx=Context.RESOURCE_REPLACEMENT_REQUEST,
+        original=original,
+    )
+    Tree.model_validate(
+        {"root": {"immutable": "a"}},
+        scim_ctx=Context.RESOURCE_REPLACEMENT_REQUEST,
+        original=original,
+    )
+
+    with pytest.raises(ValidationError, match="immutable"):
+        Tree.model_validate(
+            {"root": {"immutable": "a", "child": {"child": {"immutable": "x"}}}},
+            scim_ctx=Context.RESOURCE_REPLACEMENT_REQUEST,
+            original=original,
+        )
+
+
 def test_validate_search_request_mutability():
     """Test query validation for resource query request.
 
@@ -549,3 +622,208 @@ def test_validate_query_and_search_request_necessity(context):
         id="x",
         optional="x",
     )
+
+
+def test_specialized_validator():
+    """Validators are built once per context, and only hold the checks relevant to the context."""
+    validator = MutResource.get_scim_validator(Context.DEFAULT)
+    assert validator is MutResource.get_scim_validator(Context.DEFAULT)
+    assert validator is not MutResource.get_scim_validator(
+        Context.RESOURCE_CREATION_REQUEST
+    )
+
+    schema = repr(
+        specialize_validation_schema(
+            MutResource.__pydantic_core_schema__, Context.DEFAULT
+        )
+    )
+    assert "check_request_attributes_mutability" not in schema
+    assert "check_response_attributes_returnability" not in schema
+    assert "check_response_attributes_necessity" not in schema
+    assert "check_replacement_request_mutability" not in schema
+    assert "normalize_attribute_names" in schema
+
+    schema = repr(
+        specialize_validation_schema(
+            MutResource.__pydantic_core_schema__, Context.RESOURCE_CREATION_REQUEST
+        )
+    )
+    # 'id', 'meta' and 'read_only' are read-only
+    assert schema.count("check_request_attributes_mutability") == 3
+    assert "check_response_attributes_necessity" in schema
+
+    schema = repr(
+        specialize_validation_schema(
+            MutResource.__pydantic_core_schema__, Context.RESOURCE_QUERY_RESPONSE
+        )
+    )
+    assert "check_request_attributes_mutability" not in schema
+    assert "check_response_attributes_returnability" in schema
+    assert "check_response_attributes_necessity" not in schema
+
+
+def test_specialized_validator_context_parameter():
+    """The SCIM context can be passed in the pydantic validation context."""
+    assert MutResource.model_validate(
+        {"readOnly": "x", "readWrite": "y"},
+        context={"scim": Context.RESOURCE_CREATION_REQUEST},
+    ) == MutResource(schemas=["org:example:MutResource"], read_write="y")
+
+
+def test_validate_without_specialized_validator():
+    """Pydantic validation is used when unexpected parameters are passed."""
+    assert MutResource.model_validate(
+        obj={"readOnly": "x", "readWrite": "y"},
+        scim_ctx=Context.RESOURCE_CREATION_REQUEST,
+    ) == MutResource(schemas=["org:example:MutResource"], read_write="y")
+
+
+def test_validate_json():
+    """JSON payloads are validated in a SCIM context, whatever the case of the attribute names."""
+    payload = {
+        "schemas": ["org:example:MutResource"],
+        "readOnly": "x",
+        "readwrite": "y",
+        "IMMUTABLE": "z",
+    }
+    expected = MutResource.model_validate(
+        payload, scim_ctx=Context.RESOURCE_CREATION_REQUEST
+    )
+    assert expected.read_only is None
+    assert expected.immutable == "z"
+    assert (
+        MutResource.model_validate_json(
+            json.dumps(payload), scim_ctx=Context.RESOURCE_CREATION_REQUEST
+        )
+        == expected
+    )
+    assert (
+        MutResource.model_validate_json(
+            json.dumps(payload).encode(),
+            context={"scim": Context.RESOURCE_CREATION_REQUEST},
+        )
+        == expected
+    )
+
+    with pytest.raises(ValidationError, match="write_only"):
+        MutResource.model_validate_json(
+            '{"writeOnly": "x"}', scim_ctx=Context.RESOURCE_QUERY_REQUEST
+        )
+
+    with pytest.raises(ValueError, match="must compare to an original resource"):
+        MutResource.model_validate_json(
+            "{}", scim_ctx=Context.RESOURCE_REPLACEMENT_REQUEST
+        )
+
+    assert MutResource.model_validate_json(
+        json_data='{"readOnly": "x", "readWrite": "y"}',
+        scim_ctx=Context.RESOURCE_CREATION_REQUEST,
+    ) == MutResource(read_write="y")
+
+
+def test_json_validator():
+    """JSON validators look up camelCase and lowercase attribute names without normalizing payloads."""
+    validator = MutResource.get_scim_json_validator(Context.DEFAULT)
+    assert validator is MutResource.get_scim_json_validator(Context.DEFAULT)
+    context = {"scim": Context.DEFAULT, "original": None}
+    assert validator.validate_json(
+        '{"readWrite": "x", "immutable": "y"}', context=context
+    ) == MutResource(read_write="x", immutable="y")
+
+    with pytest.raises(ValidationError, match="extra_forbidden"):
+        validator.validate_json('{"READWRITE": "x"}', context=context)
+
+    class ExtraResource(Resource):
+        model_config = ConfigDict(extra="ignore")
+        schemas: Annotated[list[str], Required.true] = ["org:example:ExtraResource"]
+
+    assert ExtraResource.get_scim_json_validator(Context.DEFAULT) is None
+    assert ExtraResource.model_validate_json('{"ID": "x"}').id == "x"
+
+
+def test_validate_json_errors(monkeypatch):
+    """Invalid JSON payloads are validated once, and report the same errors than model_validate."""
+    calls = []
+    get_scim_validator = User.get_scim_validator
+
+    def spy(scim_ctx):
+        calls.append(scim_ctx)
+        return get_scim_validator(scim_ctx)
+
+    monkeypatch.setattr(User, "get_scim_validator", spy)
+    payloads = [
+        {"userName": 1, "name": {"givenName": 2}, "emails": [{"value": 3}]},
+        {"username": 1, "name": {"givenname": 2}},
+        {"schemas": ["urn:ietf:params:scim:schemas:core:2.0:User"]},
+        {"UserName": 1},
+    ]
+    for payload in payloads:
+        with pytest.raises(ValidationError) as expected:
+            User.model_validate(payload, scim_ctx=Context.RESOURCE_CREATION_REQUEST)
+
+        calls.clear()
+        with pytest.raises(ValidationError) as exc:
+            User.model_validate_json(
+                json.dumps(payload), scim_ctx=Context.RESOURCE_CREATION_REQUEST
+            )
+        assert exc.value.errors() == expected.value.errors()
+
+    assert exc.value.errors()[0]["loc"] == ("username",)
+    assert calls == [Context.RESOURCE_CREATION_REQUEST]
+
+    calls.clear()
+    with pytest.raises(ValidationError):
+        User.model_validate_json('{"userName": 1}')
+    assert calls == []
+
+
+def test_validate_json_any_values():
+    """Keys of values of fields of any type are normalized."""
+    payload = {
+        "schemas": ["urn:ietf:params:scim:api:messages:2.0:PatchOp"],
+        "Operations": [{"op": "replace", "value": {"userName": "bjensen"}}],
+    }
+    patch_op = PatchOp.model_validate_json(json.dumps(payload))
+    assert patch_op == PatchOp.model_validate(payload)
+    assert patch_op.operations[0].value == {"username": "bjensen"}
+
+
+def test_validate_strings():
+    """String payloads are validated in a SCIM context."""
+    assert MutResource.model_validate_strings(
+        {"readOnly": "x", "readWrite": "y"}, scim_ctx=Context.RESOURCE_CREATION_REQUEST
+    ) == MutResource(read_write="y")
+    assert MutResource.model_validate_strings(
+        obj={"readOnly": "x", "readWrite": "y"},
+        scim_ctx=Context.RESOURCE_CREATION_REQUEST,
+    ) == MutResource(read_write="y")
+
+
+def test_duplicate_attribute_names():
+    """When several keys name the same attribute, the last one wins."""
+    payload = {"userName": "a", "username": "b"}
+    assert User.model_validate(payload).user_name == "b"
+    assert User.model_validate_json(json.dumps(payload)).user_name == "b"
+    assert User.model_validate({"USERNAME": "a", "userName": "b"}).user_name == "b"
+
+
+def test_resolve_attribute_names():
+    """Payloads with exact attribute names are left untouched, others are resolved case-insensitively."""
+    payload = {"readOnly": "x", "read_write": "y", "immutable": "z"}
+    assert MutResource.resolve_attribute_names(payload) is payload
+    assert MutResource.resolve_attribute_names(
+        {"READONLY": "x", "Read_Write": "y", "$immutable": "z", "invalid": "foo"}
+    ) == {"readonly": "x", "readwrite": "y", "immutable": "z", "invalid": "foo"}
+    assert MutResource.resolve_attribute_names(None) is None
+    assert MutResource.resolve_attribute_names(
+        {"readWrite": "x", "read_write": "y"}
+    ) == {"readwrite": "y"}
+
+    exact_names, folded_names = MutResource.get_attribute_names()
+    assert {"readOnly", "readonly", "read_only"} <= exact_names
+    assert folded_names["readonly"] == "readonly"
+    assert folded_names["read_only"] == "readonly"
+
+    assert MutResource.model_validate(
+        {"READONLY": "x", "Read_Write": "y"}, scim_ctx=Context.RESOURCE_CREATION_REQUEST
+    ) == MutResource(read_write="y")
@@ -0,0 +1,73 @@
+import pytest
+from pydantic import ValidationError
+
+from scim2_models import Context
+from scim2_models import EnterpriseUser
+from scim2_models import Group
+from scim2_models import User
+
+msgspec = pytest.importorskip("msgspec")
+
+
+@pytest.fixture
+def user(load_sample):
+    return User[EnterpriseUser].model_validate(
+        load_sample("rfc7643-8.3-enterprise_user.json")
+    )
+
+
+def test_round_trip(user):
+    """Models dumped in MessagePack can be validated back."""
+    data = user.model_dump_msgpack()
+    assert len(data) < len(user.model_dump_json().encode())
+    assert msgspec.msgpack.decode(data) == user.model_dump()
+    assert (
+        User[EnterpriseUser].model_validate_msgpack(data).model_dump()
+        == user.model_dump()
+    )
+
+    data = user.model_dump_msgpack(scim_ctx=None)
+    assert (
+        User[EnterpriseUser].model_validate_msgpack(data, scim_ctx=None).model_dump()
+        == user.model_dump()
+    )
+
+
+def test_context(user):
+    """Dumps and validations happen in SCIM contexts."""
+    data = user.model_dump_msgpack(
+        Context.RESOURCE_QUERY_RESPONSE, excluded_attributes=["emails"]
+    )
+    payload = msgspec.msgpack.decode(data)
+    assert "emails" not in payload
+    assert "password" not in payload
+    assert (
+        payload["urn:ietf:params:scim:schemas:extension:enterprise:2.0:User"][
+            "employeeNumber"
+        ]
+        == "701984"
+    )
+
+    with pytest.raises(ValidationError):
+        Group.model_validate_msgpack(
+            Group(display_name="Admins").model_dump_msgpack(),
+            Context.RESOURCE_QUERY_RESPONSE,
+        )
+
+    with pytest.raises(ValueError, match="original"):
+        Group.model_validate_msgpack(
+            Group(id="1").model_dump_msgpack(), Context.RESOURCE_REPLACEMENT_REQUEST
+        )
+
+    with pytest.raises(ValueError):
+        Group.model_validate_msgpack(b"\xc1")
+
+
+def test_missing_msgspec(monkeypatch):
+    """MessagePack needs msgspec to be installed."""
+    monkeypatch.setattr("scim2_models.base.msgspec", None)
+    with pytest.raises(ImportError, match="msgspec"):
+        Group().model_dump_msgpack()
+
+    with pytest.raises(ImportError, match="msgspec"):
+        Group.model_validate_msgpack(b"\x80")
@@ -0,0 +1,110 @@
+import io
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from scim2_models import Context
+from scim2_models import EnterpriseUser
+from scim2_models import Group
+from scim2_models import NDJSONReader
+from scim2_models import NDJSONWriter
+from scim2_models import User
+
+
+def make_resources():
+    user = User[EnterpriseUser](id="1", user_name="bjensen", display_name="Babs")
+    user[EnterpriseUser] = EnterpriseUser(employee_number="701984")
+    return [user, Group(id="2", display_name="Admins"), User[EnterpriseUser](id="3")]
+
+
+def test_round_trip():
+    """Resources written in a stream can be read back."""
+    fd = io.BytesIO()
+    assert NDJSONWriter(fd).write_many(iter(make_resources())) == 3
+
+    lines = fd.getvalue().splitlines()
+    assert len(lines) == 3
+    assert json.loads(lines[1]) == {
+        "schemas": ["urn:ietf:params:scim:schemas:core:2.0:Group"],
+        "id": "2",
+        "displayName": "Admins",
+    }
+
+    fd.seek(0)
+    reader = NDJSONReader(fd, [User[EnterpriseUser], Group])
+    resources = list(reader)
+    assert [type(resource) for resource in resources] == [
+        User[EnterpriseUser],
+        Group,
+        User[EnterpriseUser],
+    ]
+    assert [resource.model_dump() for resource in resources] == [
+        resource.model_dump() for resource in make_resources()
+    ]
+
+
+def test_write_context():
+    """Resources are dumped in the writer SCIM context."""
+    fd = io.BytesIO()
+    writer = NDJSONWriter(
+        fd, Context.RESOURCE_QUERY_RESPONSE, excluded_attributes=["displayName"]
+    )
+    writer.write(User(user_name="bjensen", password="secret", display_name="Babs"))
+    payload = json.loads(fd.getvalue())
+    assert "password" not in payload
+    assert "displayName" not in payload
+    assert payload["userName"] == "bjensen"
+
+
+def test_read_lines():
+    """Text lines are read lazily, and blank lines are ignored."""
+    lines = [
+        '{"schemas": ["urn:ietf:params:scim:schemas:core:2.0:Group"], "displayName": "Admins"}\n',
+        "\n",
+        '{"schemas": ["urn:ietf:params:scim:schemas:core:2.0:User"], "userName": "bjensen"}\n',
+        "invalid",
+    ]
+    resources = iter(NDJSONReader(lines, [User, Group]))
+    assert next(resources).display_name == "Admins"
+    assert next(resources).user_name == "bjensen"
+    with pytest.raises(ValueError, match="Line 4"):
+        next(resources)
+
+    resources = NDJSONReader([b'{"userName": "bjensen"}'], [User])
+    assert [user.user_name for user in resources] == ["bjensen"]
+
+
+def test_read_errors():
+    """Invalid lines and lines matching no resource type raise errors."""
+    with pytest.raises(ValidationError):
+        list(
+            NDJSONReader(
+                ['{"displayName": "Babs"}'], [User], Context.RESOURCE_CREATION_REQUEST
+            )
+        )
+
+    with pytest.raises(ValidationError):
+        list(NDJSONReader([b'{"userName": "bjensen"'], [User]))
+
+    group = '{"schemas": ["urn:ietf:params:scim:schemas:core:2.0:Group"]}'
+    with pytest.raises(ValueError, match="Line 1: No resource type matching"):
+        list(NDJSONReader([group], [User]))
+
+    # lines of other resource types are not reported as invalid resources
+    group = '{"schemas": ["urn:ietf:params:scim:schemas:core:2.0:Group"], "members": [{"value": "bjensen"}]}'
+    with pytest.raises(ValueError, match="Line 1: No resource type matching"):
+        list(NDJSONReader([group], [User]))
+
+    user = (
+        '{"schemas": ["urn:ietf:params:scim:schemas:core:2.0:User"], "active": "foo"}'
+    )
+    with pytest.raises(ValidationError):
+        list(NDJSONReader([user], [User]))
+
+    with pytest.raises(ValidationError):
+        list(NDJSONReader(["[]"], [User]))
+
+    for line in ('{"schemas": ["urn:unknown"]}', '{"schemas": "foo"}', "[]"):
+        with pytest.raises(ValueError, match="No resource type matching"):
+            list(NDJSONReader([line], [User, Group]))
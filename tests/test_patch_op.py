@@ -1,8 +1,15 @@
 import pytest
 from pydantic import ValidationError
 
+from scim2_models import Email
+from scim2_models import EnterpriseUser
+from scim2_models import Group
+from scim2_models import GroupMember
+from scim2_models import Manager
+from scim2_models import Name
 from scim2_models import PatchOp
 from scim2_models import PatchOperation
+from scim2_models import User
 
 
 def test_validate_patchop_case_insensitivith():
@@ -35,3 +42,336 @@ def test_validate_patchop_case_insensitivith():
                 "operations": [{"op": 42, "path": "userName", "value": "Rivard"}],
             },
         )
+
+
+def test_diff_identical_resources():
+    """No operation is produced for identical resources."""
+    user = User(user_name="bjensen", emails=[Email(value="bjensen@example.com")])
+    assert PatchOp.diff(user, user.model_copy(deep=True)) == PatchOp(operations=[])
+
+
+def test_diff_different_models():
+    """Only resources of the same model can be compared."""
+    with pytest.raises(TypeError):
+        PatchOp.diff(User(user_name="bjensen"), Group(display_name="bjensen"))
+
+
+def test_diff_simple_attributes():
+    """Added, modified and removed attributes produce add, replace and remove operations."""
+    original = User(id="1", user_name="bjensen", nick_name="Babs")
+    updated = User(id="2", user_name="barbara", display_name="Barbara")
+    assert PatchOp.diff(original, updated).operations == [
+        PatchOperation(op=PatchOperation.Op.replace_, path="userName", value="barbara"),
+        PatchOperation(op=PatchOperation.Op.remove, path="nickName"),
+        PatchOperation(op=PatchOperation.Op.add, path="displayName", value="Barbara"),
+    ]
+
+
+def test_diff_complex_attributes():
+    """Single-valued complex attributes are compared sub-attribute by sub-attribute."""
+    original = User(user_name="bjensen", name=Name(given_name="Barbara"))
+    updated = User(
+        user_name="bjensen", name=Name(given_name="Barb", family_name="Jensen")
+    )
+    assert PatchOp.diff(original, updated).operations == [
+        PatchOperation(
+            op=PatchOperation.Op.replace_, path="name.givenName", value="Barb"
+        ),
+        PatchOperation(
+            op=PatchOperation.Op.add, path="name.familyName", value="Jensen"
+        ),
+    ]
+
+    assert PatchOp.diff(updated, User(user_name="bjensen")).operations == [
+        PatchOperation(op=PatchOperation.Op.remove, path="name"),
+    ]
+
+
+def test_diff_extensions():
+    """Extension attributes paths are prefixed by the extension schema."""
+    original = User[EnterpriseUser](user_name="bjensen")
+    original[EnterpriseUser] = EnterpriseUser(
+        employee_number="701984", manager=Manager(value="boss")
+    )
+    updated = original.model_copy(deep=True)
+    updated[EnterpriseUser].employee_number = None
+    updated[EnterpriseUser].manager.value = "new-boss"
+    updated[EnterpriseUser].division = "Theme Park"
+
+    schema = "urn:ietf:params:scim:schemas:extension:enterprise:2.0:User"
+    assert PatchOp.diff(original, updated).operations == [
+        PatchOperation(op=PatchOperation.Op.remove, path=f"{schema}:employeeNumber"),
+        PatchOperation(
+            op=PatchOperation.Op.replace_,
+            path=f"{schema}:manager.value",
+            value="new-boss",
+        ),
+        PatchOperation(
+            op=PatchOperation.Op.add, path=f"{schema}:division", value="Theme Park"
+        ),
+    ]
+
+    assert PatchOp.diff(
+        User[EnterpriseUser](user_name="bjensen"), updated
+    ).operations == [
+        PatchOperation(
+            op=PatchOperation.Op.add,
+            path=schema,
+            value={"division": "Theme Park", "manager": {"value": "new-boss"}},
+        ),
+    ]
+
+
+def test_diff_multi_valued_complex_attributes():
+    """Multi-valued complex attributes items are matched by value."""
+    original = Group(
+        display_name="Tour Guides",
+        members=[GroupMember(value=str(i), type="User") for i in range(4)],
+    )
+    updated = Group(
+        display_name="Tour Guides",
+        members=[
+            GroupMember(value="3", type="User"),
+            GroupMember(value="2", type="Group"),
+            GroupMember(value="1", type="User"),
+            GroupMember(value='"quoted"', type="User"),
+        ],
+    )
+    assert PatchOp.diff(original, updated).operations == [
+        PatchOperation(op=PatchOperation.Op.remove, path='members[value eq "0"]'),
+        PatchOperation(
+            op=PatchOperation.Op.replace_,
+            path='members[value eq "2"]',
+            value={"value": "2", "type": "Group"},
+        ),
+        PatchOperation(
+            op=PatchOperation.Op.add,
+            path="members",
+            value=[{"value": '"quoted"', "type": "User"}],
+        ),
+    ]
+    assert PatchOp.diff(original, updated).model_dump()["Operations"][0] == {
+        "op": "remove",
+        "path": 'members[value eq "0"]',
+    }
+
+    assert PatchOp.diff(original, Group(display_name="Tour Guides")).operations == [
+        PatchOperation(op=PatchOperation.Op.remove, path="members"),
+    ]
+
+
+def test_diff_multi_valued_dropped_sub_attributes():
+    """Sub-attributes dropped from value matched items are removed."""
+    original = User(
+        user_name="bjensen",
+        emails=[Email(value="bjensen@example.com", type="work", primary=True)],
+    )
+    updated = User(
+        user_name="bjensen", emails=[Email(value="bjensen@example.com", type="home")]
+    )
+    patch_op = PatchOp.diff(original, updated)
+    assert patch_op.operations == [
+        PatchOperation(
+            op=PatchOperation.Op.remove,
+            path='emails[value eq "bjensen@example.com"].primary',
+        ),
+        PatchOperation(
+            op=PatchOperation.Op.replace_,
+            path='emails[value eq "bjensen@example.com"]',
+            value={"value": "bjensen@example.com", "type": "home"},
+        ),
+    ]
+    assert patch_op.apply(original) == updated
+
+
+def test_diff_multi_valued_attributes_without_values():
+    """Multi-valued attributes items that cannot be matched by value are added or replaced as a whole."""
+    original = User(user_name="bjensen", emails=[Email(type="work")])
+    updated = User(user_name="bjensen", emails=[Email(type="work"), Email(type="home")])
+    assert PatchOp.diff(original, updated).operations == [
+        PatchOperation(
+            op=PatchOperation.Op.add, path="emails", value=[{"type": "home"}]
+        ),
+    ]
+
+    assert PatchOp.diff(updated, original).operations == [
+        PatchOperation(
+            op=PatchOperation.Op.replace_, path="emails", value=[{"type": "work"}]
+        ),
+    ]
+
+
+def test_apply_diff():
+    """Applying the operations of a diff builds the updated resource."""
+    original = User[EnterpriseUser](
+        id="1",
+        user_name="bjensen",
+        password="secret",
+        emails=[Email(value="bjensen@example.com"), Email(value="babs@example.com")],
+    )
+    original[EnterpriseUser] = EnterpriseUser(employee_number="701984")
+    updated = original.model_copy(deep=True)
+    updated.display_name = "Babs"
+    updated.emails = [
+        Email(value="bjensen@example.com", primary=True),
+        Email(value="barbara@example.com"),
+    ]
+    updated[EnterpriseUser] = EnterpriseUser(division="Theme Park")
+
+    patched = PatchOp.diff(original, updated).apply(original)
+    assert patched.model_dump() == updated.model_dump()
+    assert patched.id == "1"
+    assert patched.password == "secret"
+    assert original.display_name is None
+
+    group = Group(
+        display_name="Tour Guides",
+        members=[GroupMember(value=str(i), type="User") for i in range(4)],
+    )
+    updated_group = Group(
+        display_name="Guides", members=[GroupMember(value="2", type="Group")]
+    )
+    patched = PatchOp.diff(group, updated_group).apply(group)
+    assert patched.model_dump() == updated_group.model_dump()
+
+
+def test_apply_paths():
+    """Operations can target sub-attributes, extensions and filtered items."""
+    schema = "urn:ietf:params:scim:schemas:extension:enterprise:2.0:User"
+    user = User[EnterpriseUser](
+        user_name="bjensen",
+        emails=[
+            Email(value="bjensen@example.com", type="work"),
+            Email(value="babs@example.com", type="home", display="Babs"),
+        ],
+    )
+    patch_op = PatchOp(
+        operations=[
+            PatchOperation(
+                op="replace", path='emails[type eq "work"].value', value="b@example.com"
+            ),
+            PatchOperation(op="remove", path='emails[type eq "home"].display'),
+            PatchOperation(
+                op="add", path='emails[type eq "home"]', value={"primary": True}
+            ),
+            PatchOperation(op="add", path="emails", value={"value": "c@example.com"}),
+            PatchOperation(op="add", path=f"{schema}:division", value="Theme Park"),
+            PatchOperation(op="add", path="name.familyName", value="Jensen"),
+            PatchOperation(
+                op="add", value={"nickName": "Babs", "NAME": {"givenName": "Barbara"}}
+            ),
+            PatchOperation(
+                op="replace",
+                path="urn:ietf:params:scim:schemas:core:2.0:User:title",
+                value="Tour Guide",
+            ),
+            PatchOperation(op="remove", path="addresses.locality"),
+            PatchOperation(op="remove", path="userType"),
+        ]
+    )
+    patched = patch_op.apply(user)
+    assert [email.model_dump() for email in patched.emails] == [
+        {"value": "b@example.com", "type": "work"},
+        {"value": "babs@example.com", "type": "home", "primary": True},
+        {"value": "c@example.com"},
+    ]
+    assert patched[EnterpriseUser].division == "Theme Park"
+    assert patched.name.model_dump() == {"familyName": "Jensen", "givenName": "Barbara"}
+    assert patched.nick_name == "Babs"
+    assert patched.title == "Tour Guide"
+
+    patch_op = PatchOp(
+        operations=[
+            PatchOperation(op="remove", path='emails[type eq "home"]'),
+            PatchOperation(op="remove", path=schema),
+            PatchOperation(op="replace", path="name", value={"formatted": "Babs"}),
+            PatchOperation(
+                op="replace", path='emails[type eq "work"]', value={"type": "other"}
+            ),
+        ]
+    )
+    patched = patch_op.apply(patched)
+    assert [email.type for email in patched.emails] == ["other", None]
+    assert patched[EnterpriseUser] is None
+    assert patched.name.model_dump() == {"formatted": "Babs"}
+
+
+def test_apply_read_only_sub_attributes():
+    """Read-only sub-attributes of complex values are kept from the original resource."""
+    group = Group(
+        display_name="Tour Guides",
+        members=[
+            GroupMember(value="1", display="Babs Jensen"),
+            GroupMember(value="2", display="Mandy Pepperidge", type="User"),
+        ],
+    )
+    patch_op = PatchOp(
+        operations=[
+            PatchOperation(op="add", path="members", value=[{"value": "3"}]),
+            PatchOperation(
+                op="replace", path='members[value eq "2"].type', value="Group"
+            ),
+        ]
+    )
+    patched = patch_op.apply(group)
+    assert [
+        (member.value, member.display, member.type) for member in patched.members
+    ] == [
+        ("1", "Babs Jensen", None),
+        ("2", "Mandy Pepperidge", "Group"),
+        ("3", None, None),
+    ]
+
+    user = User[EnterpriseUser](user_name="bjensen")
+    user[EnterpriseUser] = EnterpriseUser(
+        manager=Manager(
+            value="26118915-6090-4610-87e4-49d8ca9f808d",
+            ref="https://example.com/v2/Users/26118915-6090-4610-87e4-49d8ca9f808d",
+            display_name="John Smith",
+        )
+    )
+    patch_op = PatchOp(
+        operations=[PatchOperation(op="replace", path="displayName", value="Babs")]
+    )
+    patched = patch_op.apply(user)
+    assert patched[EnterpriseUser].manager.display_name == "John Smith"
+    assert patched.display_name == "Babs"
+
+
+def test_apply_errors():
+    """Invalid operations raise errors."""
+    user = User(
+        user_name="bjensen",
+        name=Name(family_name="Jensen"),
+        emails=[Email(value="b@example.com")],
+    )
+    invalid_operations = [
+        PatchOperation(op="remove"),
+        PatchOperation(op="add", value="Babs"),
+        PatchOperation(op="add", path="userName.value", value="Babs"),
+        PatchOperation(op="add", path="urn:example:Foo:bar", value="Babs"),
+        PatchOperation(op="add", path="name", value="Babs"),
+        PatchOperation(op="add", path='emails[value eq "b@example.com"]', value="x"),
+        PatchOperation(op="add", path="emails[value eq]", value={}),
+    ]
+    for operation in invalid_operations:
+        with pytest.raises(ValueError):
+            PatchOp(operations=[operation]).apply(user)
+
+    with pytest.raises(LookupError, match="No value matches"):
+        PatchOp(
+            operations=[PatchOperation(op="remove", path='emails[type eq "work"]')]
+        ).apply(user)
+
+    with pytest.raises(ValidationError):
+        PatchOp(
+            operations=[PatchOperation(op="replace", path="active", value="maybe")]
+        ).apply(user)
+
+    group = Group(id="1", display_name="Guides", members=[GroupMember(value="1")])
+    assert (
+        PatchOp(operations=[PatchOperation(op="replace", path="id", value="2")])
+        .apply(group)
+        .id
+        == "1"
+    )
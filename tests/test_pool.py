@@ -0,0 +1,172 @@
+import json
+import multiprocessing
+import pickle
+
+import pytest
+from pydantic import ValidationError
+
+from scim2_models import Attribute
+from scim2_models import Context
+from scim2_models import EnterpriseUser
+from scim2_models import Extension
+from scim2_models import Group
+from scim2_models import ModelRegistry
+from scim2_models import Resource
+from scim2_models import Schema
+from scim2_models import User
+from scim2_models import ValidationPool
+from scim2_models.pool import init_worker
+from scim2_models.pool import validate_chunk
+
+USER_SCHEMA = "urn:ietf:params:scim:schemas:core:2.0:User"
+GROUP_SCHEMA = "urn:ietf:params:scim:schemas:core:2.0:Group"
+ENTERPRISE_SCHEMA = "urn:ietf:params:scim:schemas:extension:enterprise:2.0:User"
+
+
+@pytest.fixture
+def dynamic_user(load_sample):
+    DynamicUser = Resource.from_schema(
+        Schema.model_validate(load_sample("rfc7643-8.7.1-schema-user.json"))
+    )
+    DynamicEnterpriseUser = Extension.from_schema(
+        Schema.model_validate(load_sample("rfc7643-8.7.1-schema-enterprise_user.json"))
+    )
+    return DynamicUser[DynamicEnterpriseUser]
+
+
+def make_payloads(count):
+    payloads = []
+    for index in range(count):
+        if index % 3 == 0:
+            payloads.append(
+                json.dumps({"schemas": [GROUP_SCHEMA], "displayName": f"group{index}"})
+            )
+        else:
+            payloads.append(
+                json.dumps(
+                    {
+                        "schemas": [USER_SCHEMA, ENTERPRISE_SCHEMA],
+                        "userName": f"user{index}",
+                        ENTERPRISE_SCHEMA: {"employeeNumber": str(index)},
+                    }
+                )
+            )
+    return payloads
+
+
+def test_registry_pickling():
+    """Registries of importable models are pickled by reference."""
+    registry = ModelRegistry([User[EnterpriseUser], Group])
+    other = pickle.loads(pickle.dumps(registry))
+    assert other.resource_types == [User[EnterpriseUser], Group]
+
+    user = User[EnterpriseUser](user_name="bjensen")
+    assert other.loads(registry.dumps(user)) == user
+
+    registry = ModelRegistry([Schema])
+    assert registry.keys[Attribute] == "0.attributes"
+
+
+def test_dynamic_registry_pickling(dynamic_user):
+    """Registries of dynamic models build the models again from their schemas."""
+    registry = ModelRegistry([dynamic_user, Group])
+    other = pickle.loads(pickle.dumps(registry))
+    model = other.resource_types[0]
+    assert model is not dynamic_user
+    assert model.model_json_schema() == dynamic_user.model_json_schema()
+    assert other.resource_types[1] is Group
+
+    user = dynamic_user.model_validate(
+        {
+            "schemas": [USER_SCHEMA, ENTERPRISE_SCHEMA],
+            "userName": "bjensen",
+            "name": {"givenName": "Barbara"},
+            ENTERPRISE_SCHEMA: {"employeeNumber": "701984"},
+        }
+    )
+    result = other.loads(registry.dumps([user]))[0]
+    assert type(result) is model
+    assert type(result.name) is other.classes["0.name"]
+    assert result.model_dump() == user.model_dump()
+
+
+def test_registry_validate():
+    """Payloads are validated with the resource type matching their schemas."""
+    registry = ModelRegistry([User[EnterpriseUser], Group])
+    user, group = (registry.validate(payload) for payload in make_payloads(2)[::-1])
+    assert isinstance(user, User[EnterpriseUser])
+    assert user[EnterpriseUser].employee_number == "1"
+    assert isinstance(group, Group)
+
+    assert json.loads(registry.validate(make_payloads(1)[0], dump=True)) == {
+        "schemas": [GROUP_SCHEMA],
+        "displayName": "group0",
+    }
+
+    exc = registry.validate(
+        json.dumps({"schemas": [USER_SCHEMA], "displayName": "Babs"}),
+        Context.RESOURCE_CREATION_REQUEST,
+    )
+    assert isinstance(exc, ValidationError)
+
+    exc = registry.validate(json.dumps({"schemas": ["urn:unknown"]}))
+    assert isinstance(exc, ValueError)
+    assert "No resource type matching" in str(exc)
+
+    registry = ModelRegistry([User])
+    assert registry.validate('{"userName": "bjensen"}').user_name == "bjensen"
+    assert isinstance(registry.validate('{"userName": 1}'), ValidationError)
+
+
+def test_validate_chunk(dynamic_user):
+    """Workers send back the results pickled with their registry."""
+    registry = ModelRegistry([dynamic_user, Group])
+    init_worker(pickle.loads(pickle.dumps(registry)))
+    try:
+        data = validate_chunk(make_payloads(3), Context.DEFAULT, False)
+    finally:
+        init_worker(None)
+
+    group, user, other_user = registry.loads(data)
+    assert isinstance(group, Group)
+    assert type(user) is dynamic_user
+    assert other_user.user_name == "user2"
+
+    with pytest.raises(RuntimeError, match="not initialized"):
+        validate_chunk(make_payloads(1), Context.DEFAULT, False)
+
+
+def test_validation_pool():
+    """Payloads are validated in worker processes and returned in order."""
+    payloads = make_payloads(20)
+    payloads[4] = json.dumps({"schemas": [USER_SCHEMA], "userName": 1})
+    payloads[7] = json.dumps({"schemas": ["urn:unknown"]})
+
+    with ValidationPool(
+        [User[EnterpriseUser], Group], max_workers=2, chunk_size=3
+    ) as pool:
+        results = list(pool.validate(payloads))
+        dumps = list(pool.validate(iter(payloads), dump=True))
+
+    assert len(results) == len(dumps) == 20
+    assert isinstance(results[4], ValidationError)
+    assert isinstance(results[7], ValueError)
+    assert isinstance(dumps[4], ValidationError)
+    assert all(isinstance(result, Group) for result in results[::3])
+    assert results[0].display_name == "group0"
+    assert results[10].user_name == "user10"
+    assert json.loads(dumps[10])["userName"] == "user10"
+
+
+def test_validation_pool_dynamic_models(dynamic_user):
+    """Dynamic models can be used in workers started from scratch."""
+    with ValidationPool(
+        [dynamic_user, Group],
+        max_workers=1,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as pool:
+        results = list(pool.validate(make_payloads(3)))
+
+    assert isinstance(results[0], Group)
+    assert type(results[1]) is dynamic_user
+    assert results[1].model_dump()[ENTERPRISE_SCHEMA] == {"employeeNumber": "1"}
@@ -307,3 +307,22 @@ def test_get_extension_model():
         )
         is None
     )
+
+
+def test_get_extension_models_is_cached():
+    """The extension mapping is computed once per class and cannot be modified."""
+    user_model = User[Union[EnterpriseUser, SuperHero]]
+    extension_models = user_model.get_extension_models()
+    assert extension_models is user_model.get_extension_models()
+    assert dict(extension_models) == {
+        "urn:ietf:params:scim:schemas:extension:enterprise:2.0:User": EnterpriseUser,
+        "example:extensions:SuperHero": SuperHero,
+    }
+
+    with pytest.raises(TypeError):
+        extension_models["foo"] = SuperHero
+
+    assert User.get_extension_models() == {}
+    assert User[SuperHero].get_extension_models() == {
+        "example:extensions:SuperHero": SuperHero
+    }
@@ -0,0 +1,123 @@
+from typing import Annotated
+from typing import Optional
+
+import pytest
+
+from scim2_models import CaseExact
+from scim2_models import ComplexAttribute
+from scim2_models import EnterpriseUser
+from scim2_models import Extension
+from scim2_models import Group
+from scim2_models import MultiValuedComplexAttribute
+from scim2_models import Required
+from scim2_models import Resource
+from scim2_models import Schema
+from scim2_models import Uniqueness
+from scim2_models import UniquenessIndex
+from scim2_models import User
+
+
+class Badge(ComplexAttribute):
+    number: Optional[int] = None
+    site: Optional[str] = None
+
+
+class Token(MultiValuedComplexAttribute):
+    value: Annotated[Optional[str], Uniqueness.server, CaseExact.true] = None
+
+
+class Corporate(Extension):
+    schemas: Annotated[list[str], Required.true] = ["urn:example:Corporate"]
+
+    badge: Annotated[Optional[Badge], Uniqueness.global_] = None
+    desk: Annotated[Optional[int], Uniqueness.server] = None
+    tokens: Optional[list[Token]] = None
+
+
+def test_unique_attributes():
+    """Unique attributes are read from the resources, the extensions and the complex attributes."""
+    assert User[Corporate].get_unique_attributes() == (
+        ("id", ("id",), True),
+        ("urn:ietf:params:scim:schemas:core:2.0:user:username", ("user_name",), False),
+        ("urn:example:corporate:badge", ("Corporate", "badge"), False),
+        ("urn:example:corporate:desk", ("Corporate", "desk"), False),
+        ("urn:example:corporate:tokens.value", ("Corporate", "tokens", "value"), True),
+    )
+    assert Group.get_unique_attributes() == (("id", ("id",), True),)
+
+
+def test_dynamic_model_unique_attributes(load_sample):
+    """Dynamic models read the uniqueness of their schema attributes."""
+    schema = Schema.model_validate(load_sample("rfc7643-8.7.1-schema-user.json"))
+    DynamicUser = Resource.from_schema(schema)
+    assert DynamicUser.get_unique_attributes() == User.get_unique_attributes()
+
+    index = UniquenessIndex()
+    assert index.register(User(id="1", user_name="bjensen")) is None
+    error = index.register(DynamicUser(id="2", user_name="BJensen"))
+    assert error.scim_type == "uniqueness"
+
+
+def test_register():
+    """Unique values can only be registered by a single resource."""
+    index = UniquenessIndex()
+    assert index.register(User(id="1", user_name="bjensen")) is None
+    assert len(index) == 1
+    assert User(id="1") in index
+
+    # user names are not case exact
+    error = index.register(User(id="2", user_name="BJENSEN"))
+    assert error.status == 409
+    assert error.scim_type == "uniqueness"
+    assert index.check(User(user_name="bjensen")).scim_type == "uniqueness"
+    assert index.check(User(user_name="jsmith")) is None
+    assert User(id="2") not in index
+
+    # ids are unique across resource types
+    assert index.register(Group(id="1")).scim_type == "uniqueness"
+    assert index.register(Group(id="2")) is None
+
+    # registering a resource again replaces its values
+    assert index.register(User(id="1", user_name="jsmith")) is None
+    assert index.register(User(id="3", user_name="bjensen")) is None
+    assert index.check(User(id="1", user_name="jsmith")) is None
+
+    index.unregister(User(id="1"))
+    assert index.register(User(id="4", user_name="jsmith")) is None
+    assert len(index) == 3
+
+    index.clear()
+    assert len(index) == 0
+    assert index.register(User(id="3", user_name="jsmith")) is None
+
+    with pytest.raises(ValueError, match="need an id"):
+        index.register(User(user_name="bjensen"))
+
+
+def test_register_extensions():
+    """Values of the extensions and the complex attributes are unique."""
+    index = UniquenessIndex()
+    user = User[Corporate](id="1", user_name="bjensen")
+    user[Corporate] = Corporate(
+        badge=Badge(number=1, site="Paris"),
+        desk=12,
+        tokens=[Token(value="abc"), Token(value="def")],
+    )
+    assert index.register(user) is None
+
+    other = User[Corporate](id="2", user_name="jsmith")
+    other[Corporate] = Corporate(badge=Badge(number=1, site="PARIS"))
+    assert index.check(other).scim_type == "uniqueness"
+
+    other[Corporate] = Corporate(desk=12)
+    assert index.check(other).scim_type == "uniqueness"
+
+    other[Corporate] = Corporate(desk=13, tokens=[Token(value="DEF")])
+    assert index.check(other) is None
+    other[Corporate] = Corporate(tokens=[Token(value="def")])
+    assert index.check(other).scim_type == "uniqueness"
+
+    # extensions without unique attributes are ignored
+    enterprise_user = User[EnterpriseUser](id="3", user_name="alice")
+    enterprise_user[EnterpriseUser] = EnterpriseUser(employee_number="1")
+    assert index.register(enterprise_user) is None
@@ -1,3 +1,4 @@
+from scim2_models.utils import normalize_attribute_name
 from scim2_models.utils import to_camel
 
 
@@ -13,3 +14,27 @@ def test_to_camel():
     assert to_camel("Foo_Bar") == "fooBar"
 
     assert to_camel("$foo$") == "$foo$"
+
+
+def test_normalize_attribute_name():
+    """Test attribute name normalization utility."""
+    assert normalize_attribute_name("userName") == "username"
+    assert normalize_attribute_name("user_name") == "username"
+    assert normalize_attribute_name("$ref") == "ref"
+    assert (
+        normalize_attribute_name(
+            "urn:ietf:params:scim:schemas:extension:enterprise:2.0:User"
+        )
+        == "urn:ietf:params:scim:schemas:extension:enterprise:2.0:user"
+    )
+
+
+def test_attribute_names_cache():
+    """Attribute names transformations are cached."""
+    normalize_attribute_name.cache_clear()
+    to_camel.cache_clear()
+    for _ in range(3):
+        normalize_attribute_name("displayName")
+        to_camel("display_name")
+    assert normalize_attribute_name.cache_info().hits == 2
+    assert to_camel.cache_info().hits == 2
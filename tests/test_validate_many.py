@@ -0,0 +1,54 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from scim2_models import Context
+from scim2_models import EnterpriseUser
+from scim2_models import Schema
+from scim2_models import User
+
+
+def test_validate_many():
+    """Payloads are validated at once, and the invalid payloads do not stop the validation."""
+    payloads = [
+        {"userName": "bjensen", "id": "foo"},
+        {"userName": 1},
+        {"displayName": "Babs"},
+        {"USERNAME": "jsmith"},
+    ]
+    results = User.model_validate_many(payloads, Context.RESOURCE_CREATION_REQUEST)
+    assert results[0] == User(user_name="bjensen")
+    assert results[3] == User(user_name="jsmith")
+
+    assert isinstance(results[1], ValidationError)
+    assert [error["loc"] for error in results[1].errors()] == [("userName",)]
+    assert isinstance(results[2], ValidationError)
+    assert [error["type"] for error in results[2].errors()] == ["required_error"]
+
+    assert User.model_validate_many(iter(payloads[:1])) == [
+        User(user_name="bjensen", id="foo")
+    ]
+    assert User.get_scim_list_validator(
+        Context.DEFAULT
+    ) is User.get_scim_list_validator(Context.DEFAULT)
+
+
+def test_validate_many_json(load_sample):
+    """JSON arrays of payloads can be validated."""
+    payload = load_sample("rfc7643-8.3-enterprise_user.json")
+    results = User[EnterpriseUser].model_validate_many(
+        json.dumps([payload, payload]).encode()
+    )
+    assert results == [User[EnterpriseUser].model_validate(payload)] * 2
+
+    payload = load_sample("rfc7643-8.7.1-schema-user.json")
+    assert Schema.model_validate_many(json.dumps([payload])) == [
+        Schema.model_validate(payload)
+    ]
+
+
+def test_validate_many_replacement():
+    """Replacement requests need an original value for each payload."""
+    with pytest.raises(ValueError, match="original resource"):
+        User.model_validate_many([], Context.RESOURCE_REPLACEMENT_REQUEST)